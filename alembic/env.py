@@ -10,7 +10,8 @@ from alembic import context
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import all models for autodiscovery
-from app.shared.database.connection import Base  # noqa: E402
+from app.core import models  # noqa: E402,F401
+from app.shared.database.connection import Base, psycopg_url  # noqa: E402
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -19,7 +20,8 @@ config = context.config
 # Override sqlalchemy.url with environment variable if set
 database_url = os.getenv("DATABASE_URL")
 if database_url:
-    config.set_main_option("sqlalchemy.url", database_url)
+    url = psycopg_url(database_url).render_as_string(hide_password=False)
+    config.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
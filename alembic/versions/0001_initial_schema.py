@@ -0,0 +1,121 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases bootstrapped by the old Base.metadata.create_all() already have
+    # these tables; adopt them as-is so `alembic upgrade head` works everywhere.
+    if not context.is_offline_mode() and sa.inspect(op.get_bind()).has_table("wallet_auth"):
+        return
+
+    op.create_table(
+        "wallet_auth",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("wallet_address", sa.String(length=50), nullable=False),
+        sa.Column("user_type", sa.Enum("USER", "GALLERY", name="usertype"), nullable=False),
+        sa.Column("last_login", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_wallet_auth_id", "wallet_auth", ["id"])
+    op.create_index("ix_wallet_auth_wallet_address", "wallet_auth", ["wallet_address"], unique=True)
+
+    op.create_table(
+        "galleries",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("wallet_address", sa.String(length=50), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("website", sa.String(length=500), nullable=True),
+        sa.Column("profile_image_url", sa.String(length=500), nullable=True),
+        sa.Column("file_urls", sa.Text(), nullable=True),
+        sa.Column("domain_id", sa.String(length=100), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.ForeignKeyConstraint(["wallet_address"], ["wallet_auth.wallet_address"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_galleries_id", "galleries", ["id"])
+    op.create_index("ix_galleries_wallet_address", "galleries", ["wallet_address"], unique=True)
+    op.create_index("ix_galleries_name", "galleries", ["name"])
+    op.create_index("ix_galleries_domain_id", "galleries", ["domain_id"], unique=True)
+
+    op.create_table(
+        "artists",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("wallet_address", sa.String(length=50), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=True),
+        sa.Column("profile_image_url", sa.String(length=500), nullable=True),
+        sa.Column("gallery_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.ForeignKeyConstraint(["gallery_id"], ["galleries.id"]),
+        sa.ForeignKeyConstraint(["wallet_address"], ["wallet_auth.wallet_address"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_artists_id", "artists", ["id"])
+    op.create_index("ix_artists_wallet_address", "artists", ["wallet_address"], unique=True)
+
+    op.create_table(
+        "artworks",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("size", sa.String(length=50), nullable=False),
+        sa.Column("price_usd", sa.Integer(), nullable=False),
+        sa.Column("grid_n", sa.Integer(), nullable=False),
+        sa.Column("image_url", sa.String(length=500), nullable=False),
+        sa.Column("metadata_uri_base", sa.String(length=500), nullable=False),
+        sa.Column("artist_address", sa.String(length=128), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_artworks_id", "artworks", ["id"])
+
+    op.create_table(
+        "nfts",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("artwork_id", sa.Integer(), nullable=False),
+        sa.Column("uri_hex", sa.String(length=512), nullable=False),
+        sa.Column("nftoken_id", sa.String(length=128), nullable=True),
+        sa.Column("tx_hash", sa.String(length=128), nullable=True),
+        sa.Column("offer_tx_hash", sa.String(length=128), nullable=True),
+        sa.Column("owner_address", sa.String(length=128), nullable=False),
+        sa.Column("status", sa.String(length=50), nullable=True),
+        sa.Column("price", sa.Integer(), nullable=False),
+        sa.Column("extra", sa.JSON(), nullable=True),
+        sa.ForeignKeyConstraint(["artwork_id"], ["artworks.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("uri_hex"),
+    )
+    op.create_index("ix_nfts_id", "nfts", ["id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("nfts")
+    op.drop_table("artworks")
+    op.drop_table("artists")
+    op.drop_table("galleries")
+    op.drop_table("wallet_auth")
+    sa.Enum(name="usertype").drop(op.get_bind(), checkfirst=True)
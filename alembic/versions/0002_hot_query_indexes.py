@@ -0,0 +1,57 @@
+"""indexes for hot query predicates
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, partial predicate)
+INDEXES = [
+    # Keyset pagination: ORDER BY created_at DESC, id DESC
+    ("ix_artworks_created_at_id", "artworks", ["created_at", "id"], None),
+    ("ix_artists_created_at_id", "artists", ["created_at", "id"], None),
+    ("ix_galleries_created_at_id", "galleries", ["created_at", "id"], None),
+    # /artworks/artist/{address} and /artworks/my
+    ("ix_artworks_artist_address_created_at", "artworks", ["artist_address", "created_at", "id"], None),
+    # Gallery rosters; most artists have no gallery, so keep those out of the index
+    ("ix_artists_gallery_id_created_at", "artists", ["gallery_id", "created_at", "id"], "gallery_id IS NOT NULL"),
+    # Artwork detail (all pieces of an artwork)
+    ("ix_nfts_artwork_id", "nfts", ["artwork_id"], None),
+    # Offer pipeline: platform-owned, minted pieces of one artwork
+    ("ix_nfts_artwork_owner_status", "nfts", ["artwork_id", "owner_address", "status"], "nftoken_id IS NOT NULL"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY avoids locking writes on large tables, but can't run in a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
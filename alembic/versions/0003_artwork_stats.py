@@ -0,0 +1,69 @@
+"""artwork_stats availability counters
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 11:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "artwork_stats",
+        sa.Column(
+            "artwork_id",
+            sa.Integer(),
+            sa.ForeignKey("artworks.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("grid_total", sa.Integer(), nullable=False),
+        sa.Column("minted", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("offered", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("sold", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("remaining", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("min_listed_price", sa.Integer(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        "ix_artwork_stats_available",
+        "artwork_stats",
+        ["artwork_id"],
+        postgresql_where=sa.text("remaining > 0"),
+    )
+
+    # Backfill from the current NFT rows
+    op.execute(
+        """
+        INSERT INTO artwork_stats
+            (artwork_id, grid_total, minted, offered, sold, remaining, min_listed_price, updated_at)
+        SELECT a.id,
+               a.grid_n * a.grid_n,
+               count(n.id),
+               count(n.id) FILTER (WHERE n.status = 'offered_to_artist'),
+               count(n.id) FILTER (WHERE n.status = 'sold'),
+               count(n.id) - count(n.id) FILTER (WHERE n.status = 'sold'),
+               min(n.price) FILTER (WHERE n.status = 'offered_to_artist'),
+               now()
+        FROM artworks a
+        LEFT JOIN nfts n ON n.artwork_id = a.id
+        GROUP BY a.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_artwork_stats_available", table_name="artwork_stats")
+    op.drop_table("artwork_stats")
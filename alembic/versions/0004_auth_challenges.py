@@ -0,0 +1,43 @@
+"""auth_challenges for signature-based wallet login
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 13:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "auth_challenges",
+        sa.Column("nonce", sa.String(length=64), primary_key=True),
+        sa.Column("wallet_address", sa.String(length=50), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(
+        op.f("ix_auth_challenges_wallet_address"), "auth_challenges", ["wallet_address"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_auth_challenges_wallet_address"), table_name="auth_challenges")
+    op.drop_table("auth_challenges")
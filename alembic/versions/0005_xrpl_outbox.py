@@ -0,0 +1,80 @@
+"""xrpl_outbox and asynchronous gallery domain creation
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 15:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "xrpl_outbox",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("kind", sa.String(length=50), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(length=20), server_default="pending", nullable=False),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("tx_hash", sa.String(length=128), nullable=True),
+        sa.Column(
+            "available_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_xrpl_outbox_pending",
+        "xrpl_outbox",
+        ["available_at", "id"],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+    op.add_column(
+        "galleries",
+        sa.Column("domain_status", sa.String(length=20), server_default="pending", nullable=False),
+    )
+    op.execute("UPDATE galleries SET domain_status = 'active' WHERE domain_id IS NOT NULL")
+    # Galleries registered while domain creation was failing get queued now
+    op.execute(
+        """
+        INSERT INTO xrpl_outbox (kind, payload)
+        SELECT 'gallery_domain',
+               json_build_object('gallery_id', id, 'wallet_address', wallet_address)
+        FROM galleries
+        WHERE domain_id IS NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("galleries", "domain_status")
+    op.drop_index("ix_xrpl_outbox_pending", table_name="xrpl_outbox")
+    op.drop_table("xrpl_outbox")
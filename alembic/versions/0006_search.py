@@ -0,0 +1,103 @@
+"""full-text and trigram search over artworks, artists and galleries
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 16:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# table -> (weighted columns, trigram-indexed name column)
+# 'simple' config: titles and names are multilingual, so no stemming or stop words
+SEARCH_TABLES = {
+    "artworks": ([("title", "A"), ("description", "B")], "title"),
+    "artists": ([("name", "A")], "name"),
+    "galleries": ([("name", "A"), ("description", "B")], "name"),
+}
+
+
+def _vector_sql(columns, row: str) -> str:
+    return " || ".join(
+        f"setweight(to_tsvector('simple', coalesce({row}{column}, '')), '{weight}')"
+        for column, weight in columns
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for table, (columns, _) in SEARCH_TABLES.items():
+        op.add_column(table, sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True))
+        op.execute(
+            f"""
+            CREATE OR REPLACE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {_vector_sql(columns, "NEW.")};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+            """
+        )
+        watched = ", ".join(column for column, _ in columns)
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_search_vector_trg
+            BEFORE INSERT OR UPDATE OF {watched} ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update()
+            """
+        )
+        op.execute(f"UPDATE {table} SET search_vector = {_vector_sql(columns, '')}")
+
+    # CONCURRENTLY avoids locking writes on large tables, but can't run in a transaction
+    with op.get_context().autocommit_block():
+        for table, (_, name_column) in SEARCH_TABLES.items():
+            op.create_index(
+                f"ix_{table}_search_vector",
+                table,
+                ["search_vector"],
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+            op.create_index(
+                f"ix_{table}_{name_column}_trgm",
+                table,
+                [name_column],
+                postgresql_using="gin",
+                postgresql_ops={name_column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table, (_, name_column) in SEARCH_TABLES.items():
+            op.drop_index(
+                f"ix_{table}_{name_column}_trgm", table_name=table,
+                postgresql_concurrently=True, if_exists=True,
+            )
+            op.drop_index(
+                f"ix_{table}_search_vector", table_name=table,
+                postgresql_concurrently=True, if_exists=True,
+            )
+
+    for table in SEARCH_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector_trg ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_search_vector_update()")
+        op.drop_column(table, "search_vector")
+    # pg_trgm is left installed; other objects may depend on it
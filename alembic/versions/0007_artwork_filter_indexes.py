@@ -0,0 +1,46 @@
+"""indexes for /artworks filters and sorts
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 17:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns); recency and artist + recency are covered by 0002
+INDEXES = [
+    # sort=price_asc / price_desc, and min_price / max_price ranges
+    ("ix_artworks_price_usd_id", "artworks", ["price_usd", "id"]),
+    # grid_n filter under either sort
+    ("ix_artworks_grid_n_created_at", "artworks", ["grid_n", "created_at", "id"]),
+    ("ix_artworks_grid_n_price_usd", "artworks", ["grid_n", "price_usd", "id"]),
+    # artist filter sorted by price
+    ("ix_artworks_artist_address_price_usd", "artworks", ["artist_address", "price_usd", "id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY avoids locking writes on large tables, but can't run in a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns, postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,114 @@
+"""promote grid_index and offer fields out of nfts.extra
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 19:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, Sequence[str], None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, columns, partial predicate, using)
+INDEXES = [
+    # Artwork detail / pieces ordered by grid position; replaces ix_nfts_artwork_id
+    ("ix_nfts_artwork_grid_index", ["artwork_id", "grid_index", "id"], None, None),
+    # Offer lookups; batch offers have no individual offer ID
+    ("ix_nfts_offer_id", ["offer_id"], "offer_id IS NOT NULL", None),
+    ("ix_nfts_extra", ["extra"], None, "gin"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("nfts", sa.Column("grid_index", sa.Integer(), nullable=True))
+    op.add_column("nfts", sa.Column("offer_id", sa.String(length=128), nullable=True))
+    op.add_column("nfts", sa.Column("offer_amount_drops", sa.BigInteger(), nullable=True))
+    op.add_column("nfts", sa.Column("batch_chunk", sa.Integer(), nullable=True))
+    op.alter_column(
+        "nfts",
+        "extra",
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        existing_nullable=True,
+        postgresql_using="extra::jsonb",
+    )
+
+    # Backfill, then drop the promoted keys so there is one source of truth
+    op.execute(
+        """
+        UPDATE nfts SET
+            grid_index = (extra->>'grid_index')::integer,
+            offer_id = extra->>'gift_offer_id',
+            offer_amount_drops = (extra->>'gift_offer_amount')::bigint,
+            batch_chunk = (extra->>'batch_chunk')::integer,
+            extra = extra - ARRAY['grid_index', 'gift_offer_id', 'gift_offer_amount',
+                                  'batch_chunk', 'batch_offer']
+        WHERE extra IS NOT NULL
+        """
+    )
+
+    # CONCURRENTLY avoids locking writes on large tables, but can't run in a transaction
+    with op.get_context().autocommit_block():
+        for name, columns, where, using in INDEXES:
+            op.create_index(
+                name,
+                "nfts",
+                columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_using=using,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        op.drop_index(
+            "ix_nfts_artwork_id", table_name="nfts", postgresql_concurrently=True, if_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_nfts_artwork_id",
+            "nfts",
+            ["artwork_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for name, _, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name="nfts", postgresql_concurrently=True, if_exists=True)
+
+    op.execute(
+        """
+        UPDATE nfts SET extra = coalesce(extra, '{}'::jsonb) || jsonb_strip_nulls(jsonb_build_object(
+            'grid_index', grid_index,
+            'gift_offer_id', offer_id,
+            'gift_offer_amount', offer_amount_drops::text,
+            'batch_chunk', batch_chunk,
+            'batch_offer', CASE WHEN batch_chunk IS NOT NULL THEN true END
+        ))
+        WHERE grid_index IS NOT NULL OR offer_amount_drops IS NOT NULL
+        """
+    )
+    op.alter_column(
+        "nfts",
+        "extra",
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using="extra::json",
+    )
+    op.drop_column("nfts", "batch_chunk")
+    op.drop_column("nfts", "offer_amount_drops")
+    op.drop_column("nfts", "offer_id")
+    op.drop_column("nfts", "grid_index")
@@ -0,0 +1,73 @@
+"""store nft hashes and token IDs as bytea, unique on a URI hash
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 20:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, Sequence[str], None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Upper-case hex columns that become raw bytes
+HEX_COLUMNS = ["nftoken_id", "tx_hash", "offer_tx_hash", "offer_id"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("nfts", sa.Column("uri_hash", sa.LargeBinary(), nullable=True))
+
+    # uri_hex is the UTF-8 URI in hex: keep the URI itself in extra.part_uri
+    # (already there for rows minted by the service) and hash the same bytes
+    op.execute(
+        """
+        UPDATE nfts SET
+            extra = CASE
+                WHEN extra ? 'part_uri' THEN extra
+                ELSE coalesce(extra, '{}'::jsonb)
+                     || jsonb_build_object('part_uri', convert_from(decode(uri_hex, 'hex'), 'UTF8'))
+            END,
+            uri_hash = sha256(decode(uri_hex, 'hex'))
+        """
+    )
+    op.alter_column("nfts", "uri_hash", existing_type=sa.LargeBinary(), nullable=False)
+    op.create_unique_constraint("nfts_uri_hash_key", "nfts", ["uri_hash"])
+    op.drop_column("nfts", "uri_hex")
+
+    # One ALTER TABLE, so the table (and its indexes) is rewritten once
+    op.execute(
+        "ALTER TABLE nfts "
+        + ", ".join(
+            f"ALTER COLUMN {column} TYPE bytea USING decode({column}, 'hex')"
+            for column in HEX_COLUMNS
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "ALTER TABLE nfts "
+        + ", ".join(
+            f"ALTER COLUMN {column} TYPE varchar(128) USING upper(encode({column}, 'hex'))"
+            for column in HEX_COLUMNS
+        )
+    )
+
+    op.add_column("nfts", sa.Column("uri_hex", sa.String(length=512), nullable=True))
+    op.execute(
+        "UPDATE nfts SET uri_hex = encode(convert_to(extra->>'part_uri', 'UTF8'), 'hex')"
+    )
+    op.alter_column("nfts", "uri_hex", existing_type=sa.String(length=512), nullable=False)
+    op.create_unique_constraint("nfts_uri_hex_key", "nfts", ["uri_hex"])
+    op.drop_constraint("nfts_uri_hash_key", "nfts", type_="unique")
+    op.drop_column("nfts", "uri_hash")
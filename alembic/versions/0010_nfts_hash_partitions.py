@@ -0,0 +1,103 @@
+"""optionally hash-partition nfts on artwork_id
+
+Opt-in, for very large catalogs:
+
+    alembic -x nfts_partitions=16 upgrade head
+
+Without the argument this revision leaves nfts as it is. To partition later
+(or change the partition count), go back to 0009 and upgrade again with -x;
+the downgrade turns a partitioned nfts back into a plain table.
+
+The table is rebuilt by copying its rows under an EXCLUSIVE lock (reads keep
+working, writes wait), so run it in a maintenance window on large tables.
+Postgres requires unique constraints to include the partition key, so when
+partitioned the primary key becomes (id, artwork_id) and the URI hash is
+unique per artwork rather than globally.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 21:20:00.000000
+
+"""
+from typing import List, Sequence, Union
+
+from alembic import context, op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, Sequence[str], None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Secondary indexes of nfts (as of 0009), rebuilt on the new table
+INDEXES = [
+    "CREATE INDEX ix_nfts_id ON nfts (id)",
+    "CREATE INDEX ix_nfts_artwork_grid_index ON nfts (artwork_id, grid_index, id)",
+    "CREATE INDEX ix_nfts_artwork_owner_status ON nfts (artwork_id, owner_address, status) "
+    "WHERE nftoken_id IS NOT NULL",
+    "CREATE INDEX ix_nfts_offer_id ON nfts (offer_id) WHERE offer_id IS NOT NULL",
+    "CREATE INDEX ix_nfts_extra ON nfts USING gin (extra)",
+]
+
+
+def _requested_partitions() -> int:
+    return int(context.get_x_argument(as_dictionary=True).get("nfts_partitions", 0))
+
+
+def _is_partitioned(offline_default: bool) -> bool:
+    if context.is_offline_mode():
+        # No database to ask when generating SQL
+        return offline_default
+    return bool(
+        op.get_bind().exec_driver_sql(
+            "SELECT relkind = 'p' FROM pg_class WHERE oid = 'nfts'::regclass"
+        ).scalar()
+    )
+
+
+def _rebuild(partitions: int) -> None:
+    """Copy nfts into a new table: hash-partitioned, or plain when partitions is 0"""
+    statements: List[str] = [
+        "LOCK TABLE nfts IN EXCLUSIVE MODE",
+        # The id sequence would be dropped with the old table
+        "ALTER SEQUENCE nfts_id_seq OWNED BY NONE",
+        "CREATE TABLE nfts_rebuild (LIKE nfts INCLUDING DEFAULTS)"
+        + (" PARTITION BY HASH (artwork_id)" if partitions else ""),
+    ]
+    statements += [
+        f"CREATE TABLE nfts_p{i} PARTITION OF nfts_rebuild "
+        f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {i})"
+        for i in range(partitions)
+    ]
+    statements += [
+        "INSERT INTO nfts_rebuild SELECT * FROM nfts",
+        "DROP TABLE nfts",
+        "ALTER TABLE nfts_rebuild RENAME TO nfts",
+        "ALTER SEQUENCE nfts_id_seq OWNED BY nfts.id",
+        "ALTER TABLE nfts ADD CONSTRAINT nfts_pkey PRIMARY KEY "
+        + ("(id, artwork_id)" if partitions else "(id)"),
+        "ALTER TABLE nfts ADD CONSTRAINT nfts_uri_hash_key UNIQUE "
+        + ("(artwork_id, uri_hash)" if partitions else "(uri_hash)"),
+        "ALTER TABLE nfts ADD CONSTRAINT nfts_artwork_id_fkey "
+        "FOREIGN KEY (artwork_id) REFERENCES artworks (id)",
+        *INDEXES,
+        "ANALYZE nfts",
+    ]
+    for statement in statements:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    partitions = _requested_partitions()
+    if partitions > 0 and not _is_partitioned(offline_default=False):
+        _rebuild(partitions)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Offline, -x nfts_partitions=N says the database is partitioned
+    if _is_partitioned(offline_default=_requested_partitions() > 0):
+        _rebuild(0)
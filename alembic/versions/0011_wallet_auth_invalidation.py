@@ -0,0 +1,55 @@
+"""broadcast wallet_auth changes to the identity caches
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-20 10:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0011"
+down_revision: Union[str, Sequence[str], None] = "0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Same payload as InvalidationBus.publish; origin "db" matches no process,
+    # so every replica (including the writer's) drops the cached WalletAuth.
+    # NOTIFY is delivered on commit, and covers changes made outside the app.
+    # The channel is fixed here: re-create the function if invalidation_channel changes.
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION wallet_auth_invalidate() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify(
+                '{settings.invalidation_channel}',
+                json_build_object(
+                    'o', 'db', 'n', 'identity', 'k', json_build_array(OLD.wallet_address)
+                )::text
+            );
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER wallet_auth_invalidate_trg
+        AFTER UPDATE OF is_active, user_type, wallet_address OR DELETE ON wallet_auth
+        FOR EACH ROW EXECUTE FUNCTION wallet_auth_invalidate()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS wallet_auth_invalidate_trg ON wallet_auth")
+    op.execute("DROP FUNCTION IF EXISTS wallet_auth_invalidate()")
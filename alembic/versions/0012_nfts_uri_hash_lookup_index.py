@@ -0,0 +1,45 @@
+"""nfts uri_hash: lookup index when partitioned
+
+A hash-partitioned nfts (0010) can only enforce (artwork_id, uri_hash), so
+registration checks for a piece URI minted under another artwork before
+creating the artwork. That lookup needs an index on uri_hash alone. The plain
+layout keeps UNIQUE (uri_hash), which already serves it, and is left as is.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-20 10:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0012"
+down_revision: Union[str, Sequence[str], None] = "0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _is_partitioned() -> bool:
+    if context.is_offline_mode():
+        # No database to ask; -x nfts_partitions=N says the table is partitioned
+        return int(context.get_x_argument(as_dictionary=True).get("nfts_partitions", 0)) > 0
+    return bool(
+        op.get_bind().exec_driver_sql(
+            "SELECT relkind = 'p' FROM pg_class WHERE oid = 'nfts'::regclass"
+        ).scalar()
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if _is_partitioned():
+        # CONCURRENTLY is not supported on partitioned tables
+        op.execute("CREATE INDEX IF NOT EXISTS ix_nfts_uri_hash ON nfts (uri_hash)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_nfts_uri_hash")
@@ -0,0 +1,41 @@
+"""xrpl_outbox: record signed hashes before submitting
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-20 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0013"
+down_revision: Union[str, Sequence[str], None] = "0012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("xrpl_outbox", sa.Column("envelope_hash", sa.String(length=128), nullable=True))
+    op.add_column("xrpl_outbox", sa.Column("sequence", sa.Integer(), nullable=True))
+    op.add_column("xrpl_outbox", sa.Column("last_ledger_sequence", sa.Integer(), nullable=True))
+    op.create_index(
+        "ix_xrpl_outbox_submitted",
+        "xrpl_outbox",
+        ["updated_at"],
+        postgresql_where=sa.text("status = 'submitted'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The old worker ignores rows still 'submitted'; check their tx_hash on the
+    # ledger before setting them back to pending, or they may be applied twice
+    op.drop_index("ix_xrpl_outbox_submitted", table_name="xrpl_outbox")
+    op.drop_column("xrpl_outbox", "last_ledger_sequence")
+    op.drop_column("xrpl_outbox", "sequence")
+    op.drop_column("xrpl_outbox", "envelope_hash")
@@ -1,6 +1,8 @@
 # Import all models here for Alembic autodiscovery
 from app.domains.artist.models import Artist
-from app.domains.auth.models import WalletAuth
+from app.domains.auth.models import AuthChallenge, WalletAuth
 from app.domains.gallery.models import Gallery
+from app.domains.nfts.models import NFT, Artwork, ArtworkStats
+from app.shared.outbox import XRPLOutbox
 
-__all__ = ["Artist", "WalletAuth", "Gallery"]
+__all__ = ["Artist", "AuthChallenge", "WalletAuth", "Gallery", "Artwork", "ArtworkStats", "NFT", "XRPLOutbox"]
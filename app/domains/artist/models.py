@@ -1,5 +1,6 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
 from app.shared.database.connection import Base
@@ -24,6 +25,26 @@ class Artist(Base):
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
+    # Full-text search document, maintained by a DB trigger
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+
+    __table_args__ = (
+        Index("ix_artists_created_at_id", "created_at", "id"),
+        Index("ix_artists_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_artists_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_artists_gallery_id_created_at",
+            "gallery_id",
+            "created_at",
+            "id",
+            postgresql_where=text("gallery_id IS NOT NULL"),
+        ),
+    )
 
     # 1:1 relationship with WalletAuth
     wallet_auth = relationship("WalletAuth", back_populates="artist")
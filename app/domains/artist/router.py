@@ -1,32 +1,40 @@
-from typing import List
-
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domains.artist import schemas
 from app.domains.artist.service import ArtistService
 from app.domains.auth.models import WalletAuth
 from app.domains.auth.router import get_current_wallet_auth
+from app.shared.cache import response_cache
 from app.shared.database.connection import get_db
+from app.shared.pagination import Page, PageParams, page_params
 
 router = APIRouter(prefix="/artists", tags=["artist"])
 
 
-@router.get("/", response_model=List[schemas.ArtistListResponse])
-def list_artists(
-    db: Session = Depends(get_db),
+@router.get("/", response_model=Page[schemas.ArtistListResponse])
+async def list_artists(
+    request: Request,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_db),
 ):
     """
-    List all artist profiles
+    List artist profiles, newest first (cursor paginated)
     """
+    cached = await response_cache.lookup(request)
+    if cached:
+        return cached
     service = ArtistService(db)
-    return service.list_artists()
+    artists = await service.list_artists(page)
+    return await response_cache.store(
+        request, Page[schemas.ArtistListResponse], artists, tags=["artists"]
+    )
 
 
 @router.get("/me", response_model=schemas.ArtistResponse)
-def get_my_artist_profile(
+async def get_my_artist_profile(
     current_wallet: WalletAuth = Depends(get_current_wallet_auth),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Get current user's artist profile
@@ -35,7 +43,7 @@ def get_my_artist_profile(
     - 404: Artist profile not found
     """
     service = ArtistService(db)
-    artist = service.get_artist_by_wallet(current_wallet.wallet_address)
+    artist = await service.get_artist_by_wallet(current_wallet.wallet_address)
     if not artist:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Artist profile not found"
@@ -44,9 +52,9 @@ def get_my_artist_profile(
 
 
 @router.get("/{artist_id}", response_model=schemas.ArtistResponse)
-def get_artist(
+async def get_artist(
     artist_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Get artist profile by ID
@@ -55,7 +63,7 @@ def get_artist(
     - 404: Artist not found
     """
     service = ArtistService(db)
-    artist = service.get_artist(artist_id)
+    artist = await service.get_artist(artist_id)
     if not artist:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Artist not found"
@@ -64,11 +72,11 @@ def get_artist(
 
 
 @router.put("/{artist_id}", response_model=schemas.ArtistResponse)
-def update_artist(
+async def update_artist(
     artist_id: int,
     payload: schemas.ArtistUpdate,
     current_wallet: WalletAuth = Depends(get_current_wallet_auth),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Update artist profile (only owner)
@@ -78,7 +86,7 @@ def update_artist(
     - 404: Artist not found
     """
     service = ArtistService(db)
-    artist = service.update_artist(artist_id, payload, current_wallet.wallet_address)
+    artist = await service.update_artist(artist_id, payload, current_wallet.wallet_address)
     if not artist:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Artist not found"
@@ -87,10 +95,10 @@ def update_artist(
 
 
 @router.delete("/{artist_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_artist(
+async def delete_artist(
     artist_id: int,
     current_wallet: WalletAuth = Depends(get_current_wallet_auth),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Delete artist profile (only owner)
@@ -100,7 +108,7 @@ def delete_artist(
     - 404: Artist not found
     """
     service = ArtistService(db)
-    ok = service.delete_artist(artist_id, current_wallet.wallet_address)
+    ok = await service.delete_artist(artist_id, current_wallet.wallet_address)
     if not ok:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Artist not found"
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, EmailStr, Field
 
@@ -45,3 +45,35 @@ class ArtistInviteResponse(BaseModel):
     message: str
     artist_id: int
     gallery_id: int
+
+
+class ArtistBulkInviteRequest(BaseModel):
+    artist_wallet_addresses: List[str] = Field(
+        ..., min_length=1, max_length=500, description="Artists' wallet addresses to invite"
+    )
+
+
+class ArtistBulkItemResult(BaseModel):
+    artist_wallet_address: Optional[str] = None
+    artist_id: Optional[int] = None
+    status: str  # invited / removed / not_found / already_in_gallery / not_in_gallery
+
+
+class ArtistBulkInviteResponse(BaseModel):
+    message: str
+    gallery_id: int
+    invited: int
+    results: List[ArtistBulkItemResult]
+
+
+class ArtistBulkRemoveRequest(BaseModel):
+    artist_ids: List[int] = Field(
+        ..., min_length=1, max_length=500, description="IDs of the artists to remove"
+    )
+
+
+class ArtistBulkRemoveResponse(BaseModel):
+    message: str
+    gallery_id: int
+    removed: int
+    results: List[ArtistBulkItemResult]
@@ -1,25 +1,33 @@
 from typing import List, Optional
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domains.artist import models, schemas
+from app.domains.auth.identity_cache import artist_cache, detached_copy, invalidate_identity
 from app.domains.auth.schemas import BasicProfileRequest
+from app.shared.cache import response_cache
+from app.shared.pagination import PageParams, keyset, make_page
+
+
+def _artist_tags(artist: models.Artist) -> List[str]:
+    """Cached responses that include this artist"""
+    tags = ["artists"]
+    if artist.gallery_id is not None:
+        tags.append(f"gallery:{artist.gallery_id}:artists")
+    return tags
 
 
 class ArtistService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create_artist(
+    async def create_artist(
         self, payload: BasicProfileRequest, wallet_address: str
     ) -> models.Artist:
         # Check if artist profile already exists
-        existing_artist = (
-            self.db.query(models.Artist)
-            .filter(models.Artist.wallet_address == wallet_address)
-            .first()
-        )
+        existing_artist = await self.get_artist_by_wallet(wallet_address)
 
         if existing_artist:
             raise HTTPException(
@@ -34,33 +42,39 @@ class ArtistService:
             profile_image_url=payload.image_url,
         )
         self.db.add(artist)
-        self.db.commit()
-        self.db.refresh(artist)
+        await self.db.commit()
+        await self.db.refresh(artist)
+        await response_cache.invalidate_tags("artists")
         return artist
 
-    def get_artist(self, artist_id: int) -> Optional[models.Artist]:
-        return (
-            self.db.query(models.Artist).filter(models.Artist.id == artist_id).first()
-        )
+    async def get_artist(self, artist_id: int) -> Optional[models.Artist]:
+        return await self.db.get(models.Artist, artist_id)
+
+    async def get_artist_by_wallet(self, wallet_address: str) -> Optional[models.Artist]:
+        """Read-only lookup (cached); the result is detached, don't modify it"""
+        artist = artist_cache.get(wallet_address)
+        if artist is not None:
+            return artist
 
-    def get_artist_by_wallet(self, wallet_address: str) -> Optional[models.Artist]:
-        return (
-            self.db.query(models.Artist)
-            .filter(models.Artist.wallet_address == wallet_address)
-            .first()
+        result = await self.db.execute(
+            select(models.Artist).where(models.Artist.wallet_address == wallet_address)
         )
+        artist = result.scalars().first()
+        if artist is not None:
+            artist = detached_copy(artist)
+            artist_cache.set(wallet_address, artist)
+        return artist
 
-    def list_artists(self) -> List[models.Artist]:
-        return (
-            self.db.query(models.Artist)
-            .order_by(models.Artist.created_at.desc())
-            .all()
+    async def list_artists(self, page: PageParams) -> dict:
+        result = await self.db.execute(
+            keyset(select(models.Artist), models.Artist.created_at, models.Artist.id, page)
         )
+        return make_page(result.scalars().all(), page)
 
-    def update_artist(
+    async def update_artist(
         self, artist_id: int, payload: schemas.ArtistUpdate, current_wallet_address: str
     ) -> Optional[models.Artist]:
-        artist = self.get_artist(artist_id)
+        artist = await self.get_artist(artist_id)
         if not artist:
             return None
 
@@ -77,12 +91,14 @@ class ArtistService:
             setattr(artist, field, value)
 
         self.db.add(artist)
-        self.db.commit()
-        self.db.refresh(artist)
+        await self.db.commit()
+        await self.db.refresh(artist)
+        await response_cache.invalidate_tags(*_artist_tags(artist))
+        await invalidate_identity(artist.wallet_address)
         return artist
 
-    def delete_artist(self, artist_id: int, current_wallet_address: str) -> bool:
-        artist = self.get_artist(artist_id)
+    async def delete_artist(self, artist_id: int, current_wallet_address: str) -> bool:
+        artist = await self.get_artist(artist_id)
         if not artist:
             return False
 
@@ -93,6 +109,8 @@ class ArtistService:
                 detail="Only artist owner can delete this profile",
             )
 
-        self.db.delete(artist)
-        self.db.commit()
+        await self.db.delete(artist)
+        await self.db.commit()
+        await response_cache.invalidate_tags(*_artist_tags(artist))
+        await invalidate_identity(artist.wallet_address)
         return True
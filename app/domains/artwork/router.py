@@ -1,83 +1,153 @@
-from typing import List
+from typing import List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domains.artwork import schemas
-from app.domains.artwork.service import ArtworkService
+from app.domains.artwork.service import ArtworkFilters, ArtworkService
 from app.domains.auth.models import WalletAuth
 from app.domains.auth.router import get_current_wallet_auth
+from app.shared.cache import response_cache
 from app.shared.database.connection import get_db
+from app.shared.pagination import Page, PageParams, page_params
 
 router = APIRouter(prefix="/artworks", tags=["artwork"])
 
 
-@router.get("/", response_model=List[schemas.ArtworkListResponse])
-def list_artworks(
-    db: Session = Depends(get_db),
+def artwork_filters(
+    min_price: Optional[int] = Query(None, ge=0, description="Minimum price_usd"),
+    max_price: Optional[int] = Query(None, ge=0, description="Maximum price_usd"),
+    grid_n: Optional[int] = Query(None, ge=1, description="Grid size (pieces per side)"),
+    artist: Optional[str] = Query(None, description="Artist wallet address"),
+    gallery_id: Optional[int] = Query(None, description="Only artworks by this gallery's artists"),
+    available: Optional[bool] = Query(None, description="Only artworks with (true) or without (false) pieces left"),
+    sort: schemas.ArtworkSort = Query("recent", description="recent, price_asc or price_desc"),
+) -> ArtworkFilters:
+    return ArtworkFilters(
+        min_price=min_price,
+        max_price=max_price,
+        grid_n=grid_n,
+        artist_address=artist,
+        gallery_id=gallery_id,
+        available=available,
+        sort=sort,
+    )
+
+
+@router.get("/", response_model=Page[schemas.ArtworkListResponse])
+async def list_artworks(
+    request: Request,
+    page: PageParams = Depends(page_params),
+    filters: ArtworkFilters = Depends(artwork_filters),
+    db: AsyncSession = Depends(get_db),
 ):
-    """List all artworks"""
+    """
+    List artworks (cursor paginated)
+
+    Filters combine with AND. The cursor is tied to the sort it was issued for.
+
+    **Possible errors:**
+    - 400: Invalid cursor (or a cursor from a different sort)
+    """
+    cached = await response_cache.lookup(request)
+    if cached:
+        return cached
     service = ArtworkService(db)
-    return service.list_artworks()
+    artworks = await service.list_artworks(page, filters)
+    return await response_cache.store(
+        request, Page[schemas.ArtworkListResponse], artworks, tags=["artworks"]
+    )
 
 
 @router.get("/my", response_model=List[schemas.ArtworkResponse])
-def get_my_artworks(
+async def get_my_artworks(
     current_wallet: WalletAuth = Depends(get_current_wallet_auth),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Get current artist's artworks"""
     service = ArtworkService(db)
-    return service.get_artwork_by_artist_full(current_wallet.wallet_address)
+    return await service.get_artwork_by_artist_full(current_wallet.wallet_address)
 
 
-@router.get("/{artwork_id}", response_model=schemas.ArtworkResponse)
-def get_artwork(
+@router.get(
+    "/{artwork_id}",
+    response_model=Union[schemas.ArtworkCompactResponse, schemas.ArtworkResponse],
+)
+async def get_artwork(
+    request: Request,
     artwork_id: int,
-    db: Session = Depends(get_db),
+    compact: bool = Query(False, description="Return pieces as columns plus per-status bitmaps"),
+    db: AsyncSession = Depends(get_db),
 ):
     """Get artwork by ID"""
+    cached = await response_cache.lookup(request)
+    if cached:
+        return cached
     service = ArtworkService(db)
-    artwork = service.get_artwork(artwork_id)
+    if compact:
+        artwork = await service.get_artwork_compact(artwork_id)
+        response_model = schemas.ArtworkCompactResponse
+    else:
+        artwork = await service.get_artwork(artwork_id)
+        response_model = schemas.ArtworkResponse
     if not artwork:
         raise HTTPException(status_code=404, detail="Artwork not found")
-    return artwork
+    return await response_cache.store(
+        request, response_model, artwork, tags=[f"artwork:{artwork_id}"]
+    )
 
 
 @router.put("/{artwork_id}", response_model=schemas.ArtworkResponse)
-def update_artwork(
+async def update_artwork(
     artwork_id: int,
     payload: schemas.ArtworkUpdateRequest,
     current_wallet: WalletAuth = Depends(get_current_wallet_auth),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Update artwork (owner only)"""
     service = ArtworkService(db)
-    artwork = service.update_artwork(artwork_id, payload, current_wallet.wallet_address)
+    artwork = await service.update_artwork(artwork_id, payload, current_wallet.wallet_address)
     if not artwork:
         raise HTTPException(status_code=404, detail="Artwork not found")
     return artwork
 
 
 @router.delete("/{artwork_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_artwork(
+async def delete_artwork(
     artwork_id: int,
     current_wallet: WalletAuth = Depends(get_current_wallet_auth),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Delete artwork (owner only)"""
     service = ArtworkService(db)
-    success = service.delete_artwork(artwork_id, current_wallet.wallet_address)
+    success = await service.delete_artwork(artwork_id, current_wallet.wallet_address)
     if not success:
         raise HTTPException(status_code=404, detail="Artwork not found")
     return None
 
 
-@router.get("/artist/{artist_address}", response_model=List[schemas.ArtworkListResponse])
-def get_artworks_by_artist(
+@router.get("/artist/{artist_address}", response_model=Page[schemas.ArtworkListResponse])
+async def get_artworks_by_artist(
     artist_address: str,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(page_params),
+    available: Optional[bool] = Query(None, description="Only artworks with (true) or without (false) pieces left"),
+    db: AsyncSession = Depends(get_db),
 ):
-    """Get artworks by specific artist"""
+    """Get artworks by specific artist (cursor paginated)"""
     service = ArtworkService(db)
-    return service.get_artwork_by_artist(artist_address)
+    return await service.get_artwork_by_artist(artist_address, page, available)
+
+
+@router.get("/{artwork_id}/pieces", response_model=schemas.ArtworkPiecePage)
+async def get_artwork_pieces(
+    artwork_id: int,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1024),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get full NFT details for an artwork's pieces (offset paginated)"""
+    service = ArtworkService(db)
+    pieces = await service.get_artwork_pieces(artwork_id, offset, limit)
+    if pieces is None:
+        raise HTTPException(status_code=404, detail="Artwork not found")
+    return pieces
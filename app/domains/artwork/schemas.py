@@ -1,10 +1,12 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
 from app.domains.nfts.schemas import NFTResponse
 
+ArtworkSort = Literal["recent", "price_asc", "price_desc"]
+
 
 class ArtworkResponse(BaseModel):
     """Artwork response schema"""
@@ -33,11 +35,53 @@ class ArtworkListResponse(BaseModel):
     image_url: str = Field(..., description="Image URL")
     artist_address: str = Field(..., description="Artist's XRPL wallet address")
     created_at: datetime = Field(..., description="Creation timestamp")
+    pieces_total: Optional[int] = Field(None, description="Number of NFT pieces (grid_n * grid_n)")
+    pieces_sold: Optional[int] = Field(None, description="Pieces already sold")
+    pieces_remaining: Optional[int] = Field(None, description="Minted pieces still available")
+    min_listed_price: Optional[int] = Field(None, description="Lowest listed piece price in USD cents")
 
     class Config:
         from_attributes = True
 
 
+class ArtworkPieceColumns(BaseModel):
+    """Piece state as parallel arrays, ordered by grid index"""
+    grid_index: List[Optional[int]] = Field(..., description="Grid position (row-major, 1-based)")
+    id: List[int] = Field(..., description="NFT IDs")
+    nftoken_id: List[Optional[str]] = Field(..., description="XRPL NFToken IDs")
+    owner_address: List[str] = Field(..., description="Current owner wallet addresses")
+    status: List[str] = Field(..., description="NFT statuses")
+    price: List[int] = Field(..., description="Prices in USD cents")
+
+
+class ArtworkCompactResponse(ArtworkListResponse):
+    """Artwork detail with pieces in compact form (?compact=true)"""
+    description: str = Field(..., description="Artwork description")
+    grid_n: int = Field(..., description="Grid division size for NFT pieces")
+    metadata_uri_base: str = Field(..., description="Base URI for metadata")
+    pieces: ArtworkPieceColumns
+    status_bitmaps: Dict[str, str] = Field(
+        ...,
+        description=(
+            "Base64 bitmap per status over grid_n*grid_n cells; "
+            "piece with grid_index i is set when byte[(i-1) // 8] >> ((i-1) % 8) & 1"
+        ),
+    )
+
+
+class ArtworkPieceResponse(NFTResponse):
+    """NFT piece with its grid position"""
+    grid_index: Optional[int] = Field(None, description="Grid position (row-major, 1-based)")
+
+
+class ArtworkPiecePage(BaseModel):
+    """Offset page of an artwork's pieces"""
+    items: List[ArtworkPieceResponse]
+    total: int = Field(..., description="Total number of pieces")
+    offset: int
+    limit: int
+
+
 class ArtworkUpdateRequest(BaseModel):
     """Artwork update request schema"""
     title: Optional[str] = Field(None, description="Artwork title")
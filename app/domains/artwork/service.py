@@ -1,134 +1,276 @@
-from typing import List, Optional
+import base64
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, Select, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.domains.artist.models import Artist
 from app.domains.artwork import schemas
-from app.domains.nfts.models import Artwork
+from app.domains.nfts.models import NFT, Artwork, ArtworkStats
+from app.shared.cache import response_cache
+from app.shared.pagination import (
+    PageParams,
+    decode_key_cursor,
+    encode_key_cursor,
+    keyset,
+    make_page,
+    seek,
+)
+
+
+# Read paths select plain columns instead of entities: the rows are only
+# serialized, so there is no need for identity-map tracking
+LIST_COLUMNS = (
+    Artwork.id,
+    Artwork.title,
+    Artwork.size,
+    Artwork.price_usd,
+    Artwork.image_url,
+    Artwork.artist_address,
+    Artwork.created_at,
+)
+DETAIL_COLUMNS = LIST_COLUMNS + (
+    Artwork.description,
+    Artwork.grid_n,
+    Artwork.metadata_uri_base,
+)
+STATS_COLUMNS = (
+    ArtworkStats.grid_total.label("pieces_total"),
+    ArtworkStats.sold.label("pieces_sold"),
+    ArtworkStats.remaining.label("pieces_remaining"),
+    ArtworkStats.min_listed_price,
+)
+NFT_COLUMNS = (
+    NFT.id,
+    NFT.artwork_id,
+    NFT.extra["part_uri"].as_string().label("part_uri"),
+    NFT.nftoken_id,
+    NFT.tx_hash,
+    NFT.offer_tx_hash,
+    NFT.owner_address,
+    NFT.status,
+    NFT.price,
+)
+
+
+def _list_query(available: Optional[bool]) -> Select:
+    stmt = select(*LIST_COLUMNS, *STATS_COLUMNS).outerjoin(
+        ArtworkStats, ArtworkStats.artwork_id == Artwork.id
+    )
+    if available is True:
+        stmt = stmt.where(ArtworkStats.remaining > 0)
+    elif available is False:
+        stmt = stmt.where(or_(ArtworkStats.remaining.is_(None), ArtworkStats.remaining == 0))
+    return stmt
+
+
+# sort name -> (column, descending); each has a (column, id) index, alone and
+# behind the grid_n / artist_address equality filters
+ARTWORK_SORTS = {
+    "recent": (Artwork.created_at, True),
+    "price_asc": (Artwork.price_usd, False),
+    "price_desc": (Artwork.price_usd, True),
+}
+
+
+@dataclass
+class ArtworkFilters:
+    min_price: Optional[int] = None
+    max_price: Optional[int] = None
+    grid_n: Optional[int] = None
+    artist_address: Optional[str] = None
+    gallery_id: Optional[int] = None
+    available: Optional[bool] = None
+    sort: str = "recent"
+
+
+def _filtered_query(filters: ArtworkFilters) -> Select:
+    stmt = _list_query(filters.available)
+    if filters.min_price is not None:
+        stmt = stmt.where(Artwork.price_usd >= filters.min_price)
+    if filters.max_price is not None:
+        stmt = stmt.where(Artwork.price_usd <= filters.max_price)
+    if filters.grid_n is not None:
+        stmt = stmt.where(Artwork.grid_n == filters.grid_n)
+    if filters.artist_address is not None:
+        stmt = stmt.where(Artwork.artist_address == filters.artist_address)
+    if filters.gallery_id is not None:
+        # Roster via ix_artists_gallery_id_created_at, then artworks per artist address
+        stmt = stmt.where(
+            Artwork.artist_address.in_(
+                select(Artist.wallet_address).where(Artist.gallery_id == filters.gallery_id)
+            )
+        )
+    return stmt
+
+
+def _nft_label(column) -> str:
+    return f"nft_{column.key}"
+
+
+def _rows_to_dicts(rows: Sequence[Row]) -> List[dict]:
+    return [dict(row._mapping) for row in rows]
+
+
+def status_bitmaps(grid_indexes: Sequence[Optional[int]], statuses: Sequence[str], grid_total: int) -> Dict[str, str]:
+    """
+    Encode which grid cells are in each status as base64 bitmaps (LSB first).
+
+    grid_index is 1-based (as minted), so piece i sets bit i - 1.
+    """
+    n_bytes = (grid_total + 7) // 8
+    bitmaps: Dict[str, bytearray] = {}
+    for idx, status_ in zip(grid_indexes, statuses):
+        if idx is None or not 1 <= idx <= grid_total:
+            continue
+        bit = idx - 1
+        bitmap = bitmaps.setdefault(status_, bytearray(n_bytes))
+        bitmap[bit >> 3] |= 1 << (bit & 7)
+    return {s: base64.b64encode(bytes(b)).decode("ascii") for s, b in bitmaps.items()}
 
 
 class ArtworkService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def get_artwork(self, artwork_id: int) -> Optional[dict]:
-        """Get artwork by ID"""
-        artwork = (
-            self.db.query(Artwork)
-            .filter(Artwork.id == artwork_id)
-            .first()
+    async def get_artwork(self, artwork_id: int) -> Optional[dict]:
+        """Get artwork by ID, with its NFTs in the same round trip"""
+        result = await self.db.execute(
+            select(*DETAIL_COLUMNS, *(col.label(_nft_label(col)) for col in NFT_COLUMNS))
+            .outerjoin(NFT, NFT.artwork_id == Artwork.id)
+            .where(Artwork.id == artwork_id)
+            .order_by(NFT.id)
         )
+        rows = result.all()
+        if not rows:
+            return None
+
+        artwork = {col.key: rows[0]._mapping[col.key] for col in DETAIL_COLUMNS}
+        # Outer join: an artwork without NFTs yields one row of NULL NFT columns
+        artwork["nfts"] = [
+            {col.key: row._mapping[_nft_label(col)] for col in NFT_COLUMNS}
+            for row in rows
+            if row._mapping["nft_id"] is not None
+        ]
+        return artwork
+
+    async def get_artwork_compact(self, artwork_id: int) -> Optional[schemas.ArtworkCompactResponse]:
+        """Get artwork by ID with piece state as columns and per-status bitmaps"""
+        artwork = (
+            await self.db.execute(select(*DETAIL_COLUMNS).where(Artwork.id == artwork_id))
+        ).first()
         if not artwork:
             return None
-        # NFT 리스트 직렬화
-        nft_list = []
-        for nft in artwork.nfts:
-            nft_list.append({
-                "id": nft.id,
-                "artwork_id": nft.artwork_id,
-                "uri_hex": nft.uri_hex,
-                "nftoken_id": nft.nftoken_id,
-                "tx_hash": nft.tx_hash,
-                "offer_tx_hash": nft.offer_tx_hash,  # 별도 컬럼에서 직접 가져오기
-                "owner_address": nft.owner_address,
-                "status": nft.status,
-                "price": nft.price,
-            })
 
-        return {
-            "id": artwork.id,
-            "title": artwork.title,
-            "description": artwork.description,
-            "size": artwork.size,
-            "price_usd": artwork.price_usd,
-            "grid_n": artwork.grid_n,
-            "image_url": artwork.image_url,
-            "metadata_uri_base": artwork.metadata_uri_base,
-            "artist_address": artwork.artist_address,
-            "created_at": artwork.created_at,
-            "nfts": nft_list,
-        }
+        result = await self.db.execute(
+            select(
+                NFT.grid_index,
+                NFT.id,
+                NFT.nftoken_id,
+                NFT.owner_address,
+                NFT.status,
+                NFT.price,
+            )
+            .where(NFT.artwork_id == artwork_id)
+            .order_by(NFT.grid_index, NFT.id)
+        )
+        # Transpose rows into one list per column
+        columns = {key: list(values) for key, values in zip(result.keys(), zip(*result.all()))}
+        if not columns:
+            columns = {key: [] for key in result.keys()}
 
-    def get_artwork_by_artist(self, artist_address: str) -> List[dict]:
-        """Get artworks by artist (list response)"""
-        artworks = (
-            self.db.query(Artwork)
-            .filter(Artwork.artist_address == artist_address)
-            .order_by(Artwork.created_at.desc())
-            .all()
+        return schemas.ArtworkCompactResponse(
+            **artwork._mapping,
+            pieces=schemas.ArtworkPieceColumns(**columns),
+            status_bitmaps=status_bitmaps(
+                columns["grid_index"], columns["status"], artwork.grid_n * artwork.grid_n
+            ),
         )
 
-        return [
-            {
-                "id": artwork.id,
-                "title": artwork.title,
-                "size": artwork.size,
-                "price_usd": artwork.price_usd,
-                "image_url": artwork.image_url,
-                "artist_address": artwork.artist_address,
-                "created_at": artwork.created_at,
-            }
-            for artwork in artworks
-        ]
+    async def get_artwork_pieces(self, artwork_id: int, offset: int, limit: int) -> Optional[dict]:
+        """Get an offset page of an artwork's NFT pieces, ordered by grid index"""
+        exists = await self.db.scalar(select(Artwork.id).where(Artwork.id == artwork_id))
+        if exists is None:
+            return None
 
-    def get_artwork_by_artist_full(self, artist_address: str) -> List[dict]:
-        """Get artworks by artist (full response)"""
-        artworks = (
-            self.db.query(Artwork)
-            .filter(Artwork.artist_address == artist_address)
-            .order_by(Artwork.created_at.desc())
-            .all()
+        total = await self.db.scalar(
+            select(func.count()).select_from(NFT).where(NFT.artwork_id == artwork_id)
+        )
+        result = await self.db.execute(
+            select(*NFT_COLUMNS, NFT.grid_index)
+            .where(NFT.artwork_id == artwork_id)
+            .order_by(NFT.grid_index, NFT.id)
+            .offset(offset)
+            .limit(limit)
         )
+        return {
+            "items": _rows_to_dicts(result.all()),
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+        }
 
-        return [
-            {
-                "id": artwork.id,
-                "title": artwork.title,
-                "description": artwork.description,
-                "size": artwork.size,
-                "price_usd": artwork.price_usd,
-                "grid_n": artwork.grid_n,
-                "image_url": artwork.image_url,
-                "metadata_uri_base": artwork.metadata_uri_base,
-                "artist_address": artwork.artist_address,
-                "created_at": artwork.created_at,
-            }
-            for artwork in artworks
-        ]
+    async def get_artwork_by_artist(
+        self, artist_address: str, page: PageParams, available: Optional[bool] = None
+    ) -> dict:
+        """Get artworks by artist (list response, paginated)"""
+        result = await self.db.execute(
+            keyset(
+                _list_query(available).where(Artwork.artist_address == artist_address),
+                Artwork.created_at,
+                Artwork.id,
+                page,
+            )
+        )
+        artwork_page = make_page(result.all(), page)
+        artwork_page["items"] = _rows_to_dicts(artwork_page["items"])
+        return artwork_page
 
-    def list_artworks(self) -> List[dict]:
-        """List all artworks"""
-        artworks = (
-            self.db.query(Artwork)
-            .order_by(Artwork.created_at.desc())
-            .all()
+    async def get_artwork_by_artist_full(self, artist_address: str) -> List[dict]:
+        """Get artworks by artist (full response)"""
+        result = await self.db.execute(
+            select(*DETAIL_COLUMNS)
+            .where(Artwork.artist_address == artist_address)
+            .order_by(Artwork.created_at.desc(), Artwork.id.desc())
         )
+        return _rows_to_dicts(result.all())
 
-        return [
-            {
-                "id": artwork.id,
-                "title": artwork.title,
-                "size": artwork.size,
-                "price_usd": artwork.price_usd,
-                "image_url": artwork.image_url,
-                "artist_address": artwork.artist_address,
-                "created_at": artwork.created_at,
-            }
-            for artwork in artworks
-        ]
+    async def list_artworks(self, page: PageParams, filters: Optional[ArtworkFilters] = None) -> dict:
+        """List artworks, filtered and sorted in the database (paginated)"""
+        filters = filters or ArtworkFilters()
+        stmt = _filtered_query(filters)
+        if filters.sort == "recent":
+            # Same cursor format as the other created_at-ordered lists
+            result = await self.db.execute(keyset(stmt, Artwork.created_at, Artwork.id, page))
+            artwork_page = make_page(result.all(), page)
+        else:
+            sort_col, descending = ARTWORK_SORTS[filters.sort]
+            after = (
+                decode_key_cursor(page.cursor, filters.sort, sort_col.type.python_type)
+                if page.cursor
+                else None
+            )
+            result = await self.db.execute(
+                seek(stmt, sort_col, Artwork.id, after, page.limit, descending)
+            )
+            artwork_page = make_page(
+                result.all(),
+                page,
+                lambda row: encode_key_cursor(filters.sort, row._mapping[sort_col.key], row.id),
+            )
+        artwork_page["items"] = _rows_to_dicts(artwork_page["items"])
+        return artwork_page
 
-    def update_artwork(
+    async def update_artwork(
         self,
         artwork_id: int,
         payload: schemas.ArtworkUpdateRequest,
         current_artist_address: str,
     ) -> Optional[dict]:
         """Update artwork (only by owner artist)"""
-        artwork = (
-            self.db.query(Artwork)
-            .filter(Artwork.id == artwork_id)
-            .first()
-        )
+        artwork = await self.db.get(Artwork, artwork_id)
         if not artwork:
             return None
 
@@ -146,8 +288,9 @@ class ArtworkService:
                 setattr(artwork, field, value)
 
         self.db.add(artwork)
-        self.db.commit()
-        self.db.refresh(artwork)
+        await self.db.commit()
+        await self.db.refresh(artwork)
+        await response_cache.invalidate_tags("artworks", f"artwork:{artwork_id}")
 
         return {
             "id": artwork.id,
@@ -162,13 +305,9 @@ class ArtworkService:
             "created_at": artwork.created_at,
         }
 
-    def delete_artwork(self, artwork_id: int, current_artist_address: str) -> bool:
+    async def delete_artwork(self, artwork_id: int, current_artist_address: str) -> bool:
         """Delete artwork (only by owner artist)"""
-        artwork = (
-            self.db.query(Artwork)
-            .filter(Artwork.id == artwork_id)
-            .first()
-        )
+        artwork = await self.db.get(Artwork, artwork_id)
         if not artwork:
             return False
 
@@ -179,6 +318,7 @@ class ArtworkService:
                 detail="Only artwork owner can delete this artwork",
             )
 
-        self.db.delete(artwork)
-        self.db.commit()
+        await self.db.delete(artwork)
+        await self.db.commit()
+        await response_cache.invalidate_tags("artworks", f"artwork:{artwork_id}")
         return True
@@ -0,0 +1,59 @@
+from typing import Any, List
+
+from sqlalchemy import inspect
+
+from app.core.config import settings
+from app.shared.cache import TTLCache
+from app.shared.invalidation import ALL, invalidation_bus
+
+# Decoded JWTs, keyed by token digest and kept until the token expires
+token_cache = TTLCache(settings.identity_cache_max_entries, ttl=24 * 60 * 60)
+
+# Records keyed by wallet address. Only hits are cached, so a new profile
+# is visible immediately; updates go through invalidate_identity, and a
+# wallet_auth trigger (alembic 0011) broadcasts is_active / user_type changes
+# made anywhere, including by hand in SQL.
+wallet_cache = TTLCache(settings.identity_cache_max_entries, settings.identity_cache_ttl)
+artist_cache = TTLCache(settings.identity_cache_max_entries, settings.identity_cache_ttl)
+gallery_cache = TTLCache(settings.identity_cache_max_entries, settings.identity_cache_ttl)
+
+# Signatures already checked in the process pool: digest -> signer address
+signature_cache = TTLCache(settings.identity_cache_max_entries, ttl=settings.auth_challenge_ttl)
+
+_RECORD_CACHES = (wallet_cache, artist_cache, gallery_cache)
+
+
+def detached_copy(obj: Any) -> Any:
+    """
+    Transient copy of a loaded row's column attributes.
+
+    Cached objects are shared between requests, so they must never belong to
+    (or be added to) a session.
+    """
+    state = inspect(obj)
+    # Deferred columns (e.g. search_vector) that were never loaded are skipped
+    return state.mapper.class_(
+        **{
+            attr.key: getattr(obj, attr.key)
+            for attr in state.mapper.column_attrs
+            if attr.key not in state.unloaded
+        }
+    )
+
+
+async def invalidate_identity(*wallet_addresses: str) -> None:
+    """Drop cached records for these wallets on every replica"""
+    await invalidation_bus.publish("identity", *wallet_addresses)
+
+
+async def _evict(wallet_addresses: List[str]) -> None:
+    if ALL in wallet_addresses:
+        for cache in _RECORD_CACHES:
+            cache.clear()
+        return
+    for wallet_address in wallet_addresses:
+        for cache in _RECORD_CACHES:
+            cache.delete(wallet_address)
+
+
+invalidation_bus.subscribe("identity", _evict)
@@ -27,3 +27,13 @@ class WalletAuth(Base):
 
     # 1:1 relationship with Gallery (only for GALLERY type)
     gallery = relationship("Gallery", back_populates="wallet_auth", uselist=False)
+
+
+class AuthChallenge(Base):
+    """Single-use login nonce issued by POST /auth/challenge"""
+    __tablename__ = "auth_challenges"
+
+    nonce = Column(String(64), primary_key=True)
+    wallet_address = Column(String(50), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False)
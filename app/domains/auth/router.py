@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domains.artist.service import ArtistService
 from app.domains.auth import schemas
@@ -14,9 +14,9 @@ security = HTTPBearer()
 
 
 @router.post("/register/gallery", response_model=schemas.JwtResponse)
-def register_gallery_wallet(
+async def register_gallery_wallet(
     register_request: schemas.GalleryWalletRegisterRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Register a new XRPL wallet (Gallery)
@@ -29,16 +29,16 @@ def register_gallery_wallet(
     gallery_service = GalleryService(db)
 
     # First register wallet_auth, then create gallery
-    jwt_response = auth_service.register_wallet(register_request, UserType.GALLERY)
-    gallery_service.create_gallery(
+    jwt_response = await auth_service.register_wallet(register_request, UserType.GALLERY)
+    await gallery_service.create_gallery(
         register_request.profile, register_request.wallet_address
     )
     return jwt_response
 
 
 @router.post("/register/artist", response_model=schemas.JwtResponse)
-def register_artist_wallet(
-    register_request: schemas.BasicWalletRegisterRequest, db: Session = Depends(get_db)
+async def register_artist_wallet(
+    register_request: schemas.BasicWalletRegisterRequest, db: AsyncSession = Depends(get_db)
 ):
     """
     Register a new XRPL wallet (Artist)
@@ -51,32 +51,50 @@ def register_artist_wallet(
     artist_service = ArtistService(db)
 
     # First register wallet_auth, then create artist
-    jwt_response = auth_service.register_wallet(register_request, UserType.USER)
-    artist_service.create_artist(
+    jwt_response = await auth_service.register_wallet(register_request, UserType.USER)
+    await artist_service.create_artist(
         register_request.profile, register_request.wallet_address
     )
     return jwt_response
 
 
+@router.post("/challenge", response_model=schemas.ChallengeResponse)
+async def request_login_challenge(
+    challenge_request: schemas.ChallengeRequest, db: AsyncSession = Depends(get_db)
+):
+    """
+    Issue a single-use login challenge
+
+    Sign the returned `message` with the wallet key and send it to `/auth/login`
+    before `expires_at`.
+
+    **Possible errors:**
+    - 403: Wallet not registered (register first)
+    """
+    auth_service = XRPLAuthService(db)
+    return await auth_service.issue_challenge(challenge_request.wallet_address)
+
+
 @router.post("/login", response_model=schemas.JwtResponse)
-def login_with_wallet(
-    login_request: schemas.WalletLoginRequest, db: Session = Depends(get_db)
+async def login_with_wallet(
+    login_request: schemas.WalletLoginRequest, db: AsyncSession = Depends(get_db)
 ):
     """
     Login with XRPL wallet signature
 
     **Possible errors:**
+    - 401: Invalid signature, or challenge expired/already used
     - 403: Wallet not registered (register first)
-    - 422: Missing required fields (wallet_address, signature, message)
+    - 422: Missing required fields (wallet_address, nonce, signature, public_key)
     """
     auth_service = XRPLAuthService(db)
-    return auth_service.authenticate_wallet(login_request)
+    return await auth_service.authenticate_wallet(login_request)
 
 
 @router.get("/me", response_model=schemas.UserInfoResponse)
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Get current authenticated user info
@@ -86,7 +104,7 @@ def get_current_user(
     - 404: Wallet not found (token valid but wallet was deleted)
     """
     auth_service = XRPLAuthService(db)
-    wallet_auth = auth_service.get_current_wallet(credentials.credentials)
+    wallet_auth = await auth_service.get_current_wallet(credentials.credentials)
     return schemas.UserInfoResponse(
         user_type=wallet_auth.user_type,
         last_login=wallet_auth.last_login,
@@ -95,12 +113,12 @@ def get_current_user(
 
 
 # Dependency for protected routes
-def get_current_wallet_auth(
+async def get_current_wallet_auth(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Dependency to get current authenticated wallet for protected routes
     """
     auth_service = XRPLAuthService(db)
-    return auth_service.get_current_wallet(credentials.credentials)
+    return await auth_service.get_current_wallet(credentials.credentials)
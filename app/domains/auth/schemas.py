@@ -6,8 +6,21 @@ from pydantic import BaseModel, EmailStr, Field
 from app.domains.auth.models import UserType
 
 
+class ChallengeRequest(BaseModel):
+    wallet_address: str
+
+
+class ChallengeResponse(BaseModel):
+    nonce: str
+    message: str = Field(..., description="Exact text to sign with the wallet key")
+    expires_at: datetime
+
+
 class WalletLoginRequest(BaseModel):
     wallet_address: str
+    nonce: str = Field(..., description="Nonce from /auth/challenge")
+    signature: str = Field(..., description="Hex signature of the challenge message")
+    public_key: str = Field(..., description="Hex public key (secp256k1 or ed25519) of the wallet")
 
 
 class JwtResponse(BaseModel):
@@ -1,19 +1,38 @@
-from datetime import datetime, timedelta
+import asyncio
+import hashlib
+import secrets
+import time
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from fastapi import HTTPException, status
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.domains.auth import models, schemas
+from app.domains.auth.identity_cache import (
+    detached_copy,
+    invalidate_identity,
+    signature_cache,
+    token_cache,
+    wallet_cache,
+)
+from app.shared.process_pool import get_process_pool
+from app.shared.signatures import verify_wallet_signature
 
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 240
 
 
+def challenge_message(wallet_address: str, nonce: str) -> str:
+    """Text the wallet signs to log in"""
+    return f"Sign in to Roasis\nWallet: {wallet_address}\nNonce: {nonce}"
+
+
 class XRPLAuthService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
     def create_access_token(
@@ -35,6 +54,11 @@ class XRPLAuthService:
         """
         Verify JWT token and return token data
         """
+        key = hashlib.sha256(token.encode("utf-8")).digest()
+        cached = token_cache.get(key)
+        if cached is not None:
+            return cached
+
         credentials_exception = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -52,9 +76,31 @@ class XRPLAuthService:
             )
         except JWTError:
             raise credentials_exception
+        # jwt.decode already rejected expired tokens; reuse until exp
+        exp = payload.get("exp")
+        if exp is not None:
+            token_cache.set(key, token_data, ttl=exp - time.time())
         return token_data
 
-    def register_wallet(
+    async def get_wallet(self, wallet_address: str) -> Optional[models.WalletAuth]:
+        result = await self.db.execute(
+            select(models.WalletAuth).where(
+                models.WalletAuth.wallet_address == wallet_address
+            )
+        )
+        return result.scalars().first()
+
+    async def is_wallet_active(self, wallet_address: str) -> bool:
+        """Uncached is_active check for endpoints that must not trust the identity cache"""
+        return bool(
+            await self.db.scalar(
+                select(models.WalletAuth.is_active).where(
+                    models.WalletAuth.wallet_address == wallet_address
+                )
+            )
+        )
+
+    async def register_wallet(
         self, register_request, user_type: models.UserType
     ) -> schemas.JwtResponse:
         """
@@ -62,11 +108,7 @@ class XRPLAuthService:
         """
 
         # Check if wallet already exists
-        existing_wallet = (
-            self.db.query(models.WalletAuth)
-            .filter(models.WalletAuth.wallet_address == register_request.wallet_address)
-            .first()
-        )
+        existing_wallet = await self.get_wallet(register_request.wallet_address)
 
         if existing_wallet:
             raise HTTPException(
@@ -80,8 +122,8 @@ class XRPLAuthService:
             user_type=user_type,
         )
         self.db.add(wallet_auth)
-        self.db.commit()
-        self.db.refresh(wallet_auth)
+        await self.db.commit()
+        await self.db.refresh(wallet_auth)
 
         # Create access token
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -95,18 +137,60 @@ class XRPLAuthService:
 
         return schemas.JwtResponse(access_token=access_token)
 
-    def authenticate_wallet(
+    async def issue_challenge(self, wallet_address: str) -> schemas.ChallengeResponse:
+        """
+        Issue a single-use nonce for wallet login
+        """
+        wallet_auth = await self.get_wallet(wallet_address)
+        if not wallet_auth:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Wallet not registered. Please register first.",
+            )
+
+        now = datetime.now(timezone.utc)
+        # Expired nonces are never consumed; clear this wallet's leftovers
+        await self.db.execute(
+            delete(models.AuthChallenge)
+            .where(models.AuthChallenge.wallet_address == wallet_address)
+            .where(models.AuthChallenge.expires_at <= now)
+        )
+        challenge = models.AuthChallenge(
+            nonce=secrets.token_hex(32),
+            wallet_address=wallet_address,
+            expires_at=now + timedelta(seconds=settings.auth_challenge_ttl),
+        )
+        self.db.add(challenge)
+        await self.db.commit()
+
+        return schemas.ChallengeResponse(
+            nonce=challenge.nonce,
+            message=challenge_message(wallet_address, challenge.nonce),
+            expires_at=challenge.expires_at,
+        )
+
+    async def _verify_signature(self, message: str, signature: str, public_key: str) -> Optional[str]:
+        """Return the signer's classic address, verifying off the event loop"""
+        key = hashlib.sha256(f"{message}|{signature}|{public_key}".encode("utf-8")).digest()
+        signer = signature_cache.get(key)
+        if signer is not None:
+            return signer
+
+        loop = asyncio.get_running_loop()
+        signer = await loop.run_in_executor(
+            get_process_pool(), verify_wallet_signature, message.encode("utf-8"), signature, public_key
+        )
+        if signer is not None:
+            signature_cache.set(key, signer)
+        return signer
+
+    async def authenticate_wallet(
         self, login_request: schemas.WalletLoginRequest
     ) -> schemas.JwtResponse:
         """
-        Authenticate wallet and return access token
+        Verify the signed challenge and return access token
         """
-        # Get or create wallet auth record
-        wallet_auth = (
-            self.db.query(models.WalletAuth)
-            .filter(models.WalletAuth.wallet_address == login_request.wallet_address)
-            .first()
-        )
+        wallet_auth = await self.get_wallet(login_request.wallet_address)
 
         if not wallet_auth:
             raise HTTPException(
@@ -114,9 +198,37 @@ class XRPLAuthService:
                 detail="Wallet not registered. Please register first.",
             )
 
+        # Consume the nonce before any signature work, so made-up or replayed
+        # nonces never reach the process pool; a failed attempt still burns it
+        consumed = await self.db.scalar(
+            delete(models.AuthChallenge)
+            .where(models.AuthChallenge.nonce == login_request.nonce)
+            .where(models.AuthChallenge.wallet_address == login_request.wallet_address)
+            .where(models.AuthChallenge.expires_at > datetime.now(timezone.utc))
+            .returning(models.AuthChallenge.nonce)
+        )
+        if consumed is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired challenge",
+            )
+        await self.db.commit()
+
+        signer = await self._verify_signature(
+            challenge_message(login_request.wallet_address, login_request.nonce),
+            login_request.signature,
+            login_request.public_key,
+        )
+        if signer != login_request.wallet_address:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid signature",
+            )
+
         wallet_auth.last_login = datetime.utcnow()
 
-        self.db.commit()
+        await self.db.commit()
+        await invalidate_identity(wallet_auth.wallet_address)
 
         # Create access token
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -130,19 +242,21 @@ class XRPLAuthService:
 
         return schemas.JwtResponse(access_token=access_token)
 
-    def get_current_wallet(self, token: str) -> models.WalletAuth:
+    async def get_current_wallet(self, token: str) -> models.WalletAuth:
         """
         Get current authenticated wallet
         """
         token_data = self.verify_token(token)
-        wallet_auth = (
-            self.db.query(models.WalletAuth)
-            .filter(models.WalletAuth.wallet_address == token_data.wallet_address)
-            .first()
-        )
+        wallet_auth = wallet_cache.get(token_data.wallet_address)
+        if wallet_auth is not None:
+            return wallet_auth
+
+        wallet_auth = await self.get_wallet(token_data.wallet_address)
 
         if wallet_auth is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Wallet not found"
             )
+        wallet_auth = detached_copy(wallet_auth)
+        wallet_cache.set(token_data.wallet_address, wallet_auth)
         return wallet_auth
@@ -0,0 +1,113 @@
+from datetime import datetime, timezone
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domains.auth.models import UserType, WalletAuth
+from app.domains.auth.router import get_current_wallet_auth
+from app.domains.exports.service import (
+    EXPORT_MEDIA_TYPES,
+    artwork_export_query,
+    export_slot_available,
+    nft_export_query,
+    stream_export,
+)
+from app.domains.gallery.models import Gallery
+from app.domains.gallery.service import GalleryService
+from app.shared.database.connection import get_db
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+ExportFormat = Literal["ndjson", "csv"]
+NFTStatus = Literal["minted", "offered_to_artist", "sold"]
+
+
+async def get_current_gallery(
+    current_wallet: WalletAuth = Depends(get_current_wallet_auth),
+    db: AsyncSession = Depends(get_db),
+) -> Gallery:
+    """The caller's gallery; exports are only available to gallery accounts"""
+    if current_wallet.user_type != UserType.GALLERY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only gallery accounts can export",
+        )
+    gallery = await GalleryService(db).get_gallery_by_wallet(current_wallet.wallet_address)
+    if not gallery:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Gallery profile not found"
+        )
+    return gallery
+
+
+def _gallery_scope(gallery: Gallery, gallery_id: Optional[int]) -> int:
+    if gallery_id is not None and gallery_id != gallery.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only export your own gallery",
+        )
+    return gallery.id
+
+
+def _export_response(stmt: Select, fmt: str, name: str) -> StreamingResponse:
+    if not export_slot_available():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many exports in progress, try again shortly",
+            headers={"Retry-After": "30"},
+        )
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return StreamingResponse(
+        stream_export(stmt, fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}-{stamp}.{fmt}"',
+            "Cache-Control": "no-store",
+            # Let nginx pass chunks through instead of buffering the whole export
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@router.get("/nfts")
+async def export_nfts(
+    format: ExportFormat = Query("ndjson", description="ndjson or csv"),
+    artist: Optional[str] = Query(None, description="Artist wallet address"),
+    gallery_id: Optional[int] = Query(None, description="Your gallery (the default)"),
+    status: Optional[NFTStatus] = Query(None, description="NFT status"),
+    gallery: Gallery = Depends(get_current_gallery),
+):
+    """
+    Stream every matching NFT piece of the caller's gallery artists, ordered by ID
+
+    **Possible errors:**
+    - 401/403: Not authenticated
+    - 403: Not a gallery account, or another gallery's ID
+    - 404: Gallery profile not found
+    """
+    stmt = nft_export_query(artist, _gallery_scope(gallery, gallery_id), status)
+    return _export_response(stmt, format, "nfts")
+
+
+@router.get("/artworks")
+async def export_artworks(
+    format: ExportFormat = Query("ndjson", description="ndjson or csv"),
+    artist: Optional[str] = Query(None, description="Artist wallet address"),
+    gallery_id: Optional[int] = Query(None, description="Your gallery (the default)"),
+    available: Optional[bool] = Query(None, description="Only artworks with (true) or without (false) pieces left"),
+    gallery: Gallery = Depends(get_current_gallery),
+):
+    """
+    Stream every matching artwork of the caller's gallery artists with its piece counters,
+    ordered by ID
+
+    **Possible errors:**
+    - 401/403: Not authenticated
+    - 403: Not a gallery account, or another gallery's ID
+    - 404: Gallery profile not found
+    """
+    stmt = artwork_export_query(artist, _gallery_scope(gallery, gallery_id), available)
+    return _export_response(stmt, format, "artworks")
@@ -0,0 +1,150 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, or_, select
+from sqlalchemy.pool import QueuePool
+from xrpl.utils import str_to_hex
+
+from app.domains.artist.models import Artist
+from app.core.config import settings
+from app.domains.nfts.models import NFT, Artwork, ArtworkStats
+from app.shared.database.connection import ExportSessionLocal, export_engine
+
+# Rows fetched per round trip from the server-side cursor; one output chunk each
+EXPORT_BATCH_ROWS = 1000
+
+NFT_EXPORT_COLUMNS = (
+    NFT.id,
+    NFT.artwork_id,
+    NFT.grid_index,
+    Artwork.artist_address,
+    NFT.nftoken_id,
+    NFT.owner_address,
+    NFT.status,
+    NFT.price,
+    NFT.tx_hash,
+    NFT.offer_tx_hash,
+    # Only the URI is stored; hex-encoded on the way out (see EXPORT_ENCODERS)
+    NFT.extra["part_uri"].as_string().label("uri_hex"),
+)
+ARTWORK_EXPORT_COLUMNS = (
+    Artwork.id,
+    Artwork.title,
+    Artwork.artist_address,
+    Artwork.size,
+    Artwork.grid_n,
+    Artwork.price_usd,
+    Artwork.image_url,
+    Artwork.metadata_uri_base,
+    Artwork.created_at,
+    ArtworkStats.minted.label("pieces_minted"),
+    ArtworkStats.offered.label("pieces_offered"),
+    ArtworkStats.sold.label("pieces_sold"),
+    ArtworkStats.remaining.label("pieces_remaining"),
+    ArtworkStats.min_listed_price,
+)
+
+
+# Output column -> conversion applied to each value before it is written
+EXPORT_ENCODERS: Dict[str, Callable[[Any], Any]] = {
+    "uri_hex": lambda uri: str_to_hex(uri) if uri is not None else None,
+}
+
+
+def _by_artist(stmt: Select, artist_address: Optional[str], gallery_id: Optional[int]) -> Select:
+    if artist_address is not None:
+        stmt = stmt.where(Artwork.artist_address == artist_address)
+    if gallery_id is not None:
+        stmt = stmt.where(
+            Artwork.artist_address.in_(
+                select(Artist.wallet_address).where(Artist.gallery_id == gallery_id)
+            )
+        )
+    return stmt
+
+
+def nft_export_query(
+    artist_address: Optional[str] = None,
+    gallery_id: Optional[int] = None,
+    status: Optional[str] = None,
+) -> Select:
+    stmt = select(*NFT_EXPORT_COLUMNS).join(Artwork, Artwork.id == NFT.artwork_id)
+    if status is not None:
+        stmt = stmt.where(NFT.status == status)
+    return _by_artist(stmt, artist_address, gallery_id).order_by(NFT.id)
+
+
+def artwork_export_query(
+    artist_address: Optional[str] = None,
+    gallery_id: Optional[int] = None,
+    available: Optional[bool] = None,
+) -> Select:
+    stmt = select(*ARTWORK_EXPORT_COLUMNS).outerjoin(
+        ArtworkStats, ArtworkStats.artwork_id == Artwork.id
+    )
+    if available is True:
+        stmt = stmt.where(ArtworkStats.remaining > 0)
+    elif available is False:
+        stmt = stmt.where(or_(ArtworkStats.remaining.is_(None), ArtworkStats.remaining == 0))
+    return _by_artist(stmt, artist_address, gallery_id).order_by(Artwork.id)
+
+
+def _plain(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _ndjson_chunk(keys: Sequence[str], rows: Sequence[Sequence[Any]]) -> str:
+    return "".join(
+        json.dumps({k: _plain(v) for k, v in zip(keys, row)}, separators=(",", ":")) + "\n"
+        for row in rows
+    )
+
+
+def _csv_chunk(rows: Sequence[Sequence[Any]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([[_plain(v) for v in row] for row in rows])
+    return buffer.getvalue()
+
+
+def _encode_row(row: Sequence[Any], encoders: Sequence[Tuple[int, Callable[[Any], Any]]]) -> List[Any]:
+    values = list(row)
+    for i, encode in encoders:
+        values[i] = encode(values[i])
+    return values
+
+
+def export_slot_available() -> bool:
+    """Whether the export pool has a free connection (checked before streaming starts)"""
+    pool = export_engine.sync_engine.pool
+    return not isinstance(pool, QueuePool) or pool.checkedout() < settings.export_max_concurrent
+
+
+async def stream_export(stmt: Select, fmt: str) -> AsyncIterator[str]:
+    """
+    Stream ``stmt`` as NDJSON or CSV, one chunk per fetched batch.
+
+    The query runs on a server-side cursor in a session from the dedicated
+    export pool (the request's session is closed before the body is sent).
+    The next batch is only fetched after the previous chunk was handed to the
+    client, so memory stays at one batch regardless of the export size and
+    slow clients simply slow the cursor down.
+    """
+    async with ExportSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_ROWS))
+        keys: List[str] = list(result.keys())
+        encoders = [(i, EXPORT_ENCODERS[k]) for i, k in enumerate(keys) if k in EXPORT_ENCODERS]
+        if fmt == "csv":
+            yield _csv_chunk([keys])
+        async for partition in result.partitions():
+            if encoders:
+                partition = [_encode_row(row, encoders) for row in partition]
+            yield _csv_chunk(partition) if fmt == "csv" else _ndjson_chunk(keys, partition)
+
+
+EXPORT_MEDIA_TYPES: Dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
 from app.shared.database.connection import Base
@@ -25,10 +26,26 @@ class Gallery(Base):
     domain_id = Column(
         String(100), nullable=True, unique=True, index=True
     )  # XRPL domain ID
+    domain_status = Column(
+        String(20), nullable=False, default="pending", server_default="pending"
+    )  # pending / active / failed (created asynchronously via the XRPL outbox)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
+    # Full-text search document, maintained by a DB trigger
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+
+    __table_args__ = (
+        Index("ix_galleries_created_at_id", "created_at", "id"),
+        Index("ix_galleries_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_galleries_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
 
     # 1:1 relationship with WalletAuth (only for GALLERY type)
     wallet_auth = relationship("WalletAuth", back_populates="gallery")
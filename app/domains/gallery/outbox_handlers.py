@@ -0,0 +1,81 @@
+from typing import Any, Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from xrpl.asyncio.clients import AsyncJsonRpcClient
+
+from app.domains.auth.identity_cache import invalidate_identity
+from app.domains.gallery import models
+from app.shared.cache import response_cache
+from app.shared.outbox import OutboxHandler, register_handler
+from app.shared.xrpl import (
+    created_ledger_index,
+    gallery_credential_create_tx,
+    gallery_credential_delete_tx,
+    gallery_credential_exists,
+    gallery_domain_tx,
+)
+
+GALLERY_DOMAIN = "gallery_domain"
+GALLERY_CREDENTIAL_CREATE = "gallery_credential_create"
+GALLERY_CREDENTIAL_DELETE = "gallery_credential_delete"
+
+
+async def _domain_created(db: AsyncSession, payload: Dict[str, Any], result: Dict[str, Any]) -> None:
+    gallery = await db.get(models.Gallery, payload["gallery_id"])
+    if gallery is None:
+        return
+    gallery.domain_id = created_ledger_index(result, "PermissionedDomain") or result.get("hash")
+    gallery.domain_status = "active"
+
+
+async def _domain_failed(db: AsyncSession, payload: Dict[str, Any], error: str) -> None:
+    gallery = await db.get(models.Gallery, payload["gallery_id"])
+    if gallery is not None:
+        gallery.domain_status = "failed"
+
+
+async def _domains_committed(payloads: List[Dict[str, Any]]) -> None:
+    await response_cache.invalidate_tags("galleries")
+    await invalidate_identity(*(p["wallet_address"] for p in payloads))
+
+
+async def _credential_issued(client: AsyncJsonRpcClient, account: str, payload: Dict[str, Any]) -> bool:
+    return await gallery_credential_exists(client, account, payload["artist_wallet_address"])
+
+
+async def _credential_deleted(client: AsyncJsonRpcClient, account: str, payload: Dict[str, Any]) -> bool:
+    return not await gallery_credential_exists(client, account, payload["artist_wallet_address"])
+
+
+register_handler(
+    GALLERY_DOMAIN,
+    OutboxHandler(
+        build=lambda account, payload: gallery_domain_tx(account),
+        on_success=_domain_created,
+        on_failure=_domain_failed,
+        after_commit=_domains_committed,
+    ),
+)
+
+# Payload: {"gallery_id": ..., "artist_wallet_address": ...}
+register_handler(
+    GALLERY_CREDENTIAL_CREATE,
+    OutboxHandler(
+        build=lambda account, payload: gallery_credential_create_tx(
+            account, payload["artist_wallet_address"]
+        ),
+        accept=("tecDUPLICATE",),
+        check=_credential_issued,
+    ),
+)
+
+register_handler(
+    GALLERY_CREDENTIAL_DELETE,
+    OutboxHandler(
+        build=lambda account, payload: gallery_credential_delete_tx(
+            account, payload["artist_wallet_address"]
+        ),
+        accept=("tecNO_ENTRY",),
+        check=_credential_deleted,
+    ),
+)
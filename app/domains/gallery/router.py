@@ -1,30 +1,40 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domains.artist import schemas as artist_schemas
 from app.domains.auth.models import WalletAuth
 from app.domains.auth.router import get_current_wallet_auth
 from app.domains.gallery import schemas
 from app.domains.gallery.service import GalleryService
+from app.shared.cache import response_cache
 from app.shared.database.connection import get_db
+from app.shared.pagination import Page, PageParams, page_params
 
 router = APIRouter(prefix="/galleries", tags=["gallery"])
 
 
-@router.get("/", response_model=List[schemas.GalleryResponse])
-def list_galleries(
-    db: Session = Depends(get_db),
+@router.get("/", response_model=Page[schemas.GalleryResponse])
+async def list_galleries(
+    request: Request,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_db),
 ):
+    cached = await response_cache.lookup(request)
+    if cached:
+        return cached
     service = GalleryService(db)
-    return service.list_galleries()
+    galleries = await service.list_galleries(page)
+    return await response_cache.store(
+        request, Page[schemas.GalleryResponse], galleries, tags=["galleries"]
+    )
 
 
 @router.get("/me", response_model=schemas.GalleryResponse)
-def get_my_gallery_profile(
+async def get_my_gallery_profile(
     current_wallet: WalletAuth = Depends(get_current_wallet_auth),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Get current user's gallery profile
@@ -33,7 +43,7 @@ def get_my_gallery_profile(
     - 404: Gallery profile not found
     """
     service = GalleryService(db)
-    gallery = service.get_gallery_by_wallet(current_wallet.wallet_address)
+    gallery = await service.get_gallery_by_wallet(current_wallet.wallet_address)
     if not gallery:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Gallery profile not found"
@@ -42,49 +52,49 @@ def get_my_gallery_profile(
 
 
 @router.get("/{gallery_id}", response_model=schemas.GalleryResponse)
-def get_gallery(
+async def get_gallery(
     gallery_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     service = GalleryService(db)
-    gallery = service.get_gallery(gallery_id)
+    gallery = await service.get_gallery(gallery_id)
     if not gallery:
         raise HTTPException(status_code=404, detail="Gallery not found")
     return gallery
 
 
 @router.put("/{gallery_id}", response_model=schemas.GalleryResponse)
-def update_gallery(
+async def update_gallery(
     gallery_id: int,
     payload: schemas.GalleryUpdate,
     current_wallet: WalletAuth = Depends(get_current_wallet_auth),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     service = GalleryService(db)
-    gallery = service.update_gallery(gallery_id, payload, current_wallet.wallet_address)
+    gallery = await service.update_gallery(gallery_id, payload, current_wallet.wallet_address)
     if not gallery:
         raise HTTPException(status_code=404, detail="Gallery not found")
     return gallery
 
 
 @router.delete("/{gallery_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_gallery(
+async def delete_gallery(
     gallery_id: int,
     current_wallet: WalletAuth = Depends(get_current_wallet_auth),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     service = GalleryService(db)
-    ok = service.delete_gallery(gallery_id, current_wallet.wallet_address)
+    ok = await service.delete_gallery(gallery_id, current_wallet.wallet_address)
     if not ok:
         raise HTTPException(status_code=404, detail="Gallery not found")
     return None
 
 
 @router.post("/invite-artist", response_model=artist_schemas.ArtistInviteResponse)
-def invite_artist(
+async def invite_artist(
     payload: artist_schemas.ArtistInviteRequest,
     current_wallet: WalletAuth = Depends(get_current_wallet_auth),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Invite an artist to the gallery
@@ -99,14 +109,55 @@ def invite_artist(
     - 403: Only gallery owner can invite artists
     """
     service = GalleryService(db)
-    result = service.invite_artist(payload.artist_wallet_address, current_wallet.wallet_address)
+    result = await service.invite_artist(payload.artist_wallet_address, current_wallet.wallet_address)
     return result
 
 
+@router.post("/invite-artists", response_model=artist_schemas.ArtistBulkInviteResponse)
+async def invite_artists(
+    payload: artist_schemas.ArtistBulkInviteRequest,
+    current_wallet: WalletAuth = Depends(get_current_wallet_auth),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Invite several artists to the gallery in one request
+
+    Each address gets its own result (`invited`, `not_found` or
+    `already_in_gallery`); the valid ones are invited together. Their
+    `ROASIS_GALLERY` credentials are issued on-chain in the background, packed
+    into `Batch` transactions.
+
+    **Possible errors:**
+    - 404: Gallery not found
+    """
+    service = GalleryService(db)
+    return await service.invite_artists(
+        payload.artist_wallet_addresses, current_wallet.wallet_address
+    )
+
+
+@router.post("/remove-artists", response_model=artist_schemas.ArtistBulkRemoveResponse)
+async def remove_artists_from_gallery(
+    payload: artist_schemas.ArtistBulkRemoveRequest,
+    current_wallet: WalletAuth = Depends(get_current_wallet_auth),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Remove several artists from the gallery in one request
+
+    Each ID gets its own result (`removed`, `not_found` or `not_in_gallery`).
+
+    **Possible errors:**
+    - 404: Gallery not found
+    """
+    service = GalleryService(db)
+    return await service.remove_artists(payload.artist_ids, current_wallet.wallet_address)
+
+
 @router.get("/my/artists", response_model=List[artist_schemas.ArtistResponse])
-def get_my_gallery_artists(
+async def get_my_gallery_artists(
     current_wallet: WalletAuth = Depends(get_current_wallet_auth),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Get all artists belonging to current gallery
@@ -115,15 +166,15 @@ def get_my_gallery_artists(
     - 404: Gallery not found
     """
     service = GalleryService(db)
-    artists = service.get_gallery_artists(current_wallet.wallet_address)
+    artists = await service.get_gallery_artists(current_wallet.wallet_address)
     return artists
 
 
 @router.delete("/remove-artist/{artist_id}", status_code=status.HTTP_204_NO_CONTENT)
-def remove_artist_from_gallery(
+async def remove_artist_from_gallery(
     artist_id: int,
     current_wallet: WalletAuth = Depends(get_current_wallet_auth),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Remove an artist from the gallery
@@ -134,16 +185,18 @@ def remove_artist_from_gallery(
     - 400: Artist does not belong to this gallery
     """
     service = GalleryService(db)
-    success = service.remove_artist(artist_id, current_wallet.wallet_address)
+    success = await service.remove_artist(artist_id, current_wallet.wallet_address)
     if not success:
         raise HTTPException(status_code=404, detail="Artist not found or not in this gallery")
     return None
 
 
-@router.get("/{gallery_id}/artists", response_model=List[artist_schemas.ArtistListResponse])
-def get_gallery_artists_public(
+@router.get("/{gallery_id}/artists", response_model=Page[artist_schemas.ArtistListResponse])
+async def get_gallery_artists_public(
+    request: Request,
     gallery_id: int,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Get all artists belonging to a specific gallery (public endpoint)
@@ -151,6 +204,41 @@ def get_gallery_artists_public(
     **Possible errors:**
     - 404: Gallery not found
     """
+    cached = await response_cache.lookup(request)
+    if cached:
+        return cached
     service = GalleryService(db)
-    artists = service.get_gallery_artists_by_id(gallery_id)
-    return artists
+    artists = await service.get_gallery_artists_by_id(gallery_id, page)
+    return await response_cache.store(
+        request,
+        Page[artist_schemas.ArtistListResponse],
+        artists,
+        tags=[f"gallery:{gallery_id}:artists"],
+    )
+
+
+@router.get("/{gallery_id}/catalog", response_model=schemas.GalleryCatalogResponse)
+async def get_gallery_catalog(
+    request: Request,
+    gallery_id: int,
+    page: PageParams = Depends(page_params),
+    artworks_per_artist: int = Query(8, ge=1, le=50, description="Latest artworks per artist"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Gallery profile, a page of its artists and their latest artworks in one response
+
+    **Possible errors:**
+    - 404: Gallery not found
+    """
+    cached = await response_cache.lookup(request)
+    if cached:
+        return cached
+    service = GalleryService(db)
+    catalog = await service.get_gallery_catalog(gallery_id, page, artworks_per_artist)
+    return await response_cache.store(
+        request,
+        schemas.GalleryCatalogResponse,
+        catalog,
+        tags=["galleries", f"gallery:{gallery_id}:artists", "artworks"],
+    )
@@ -4,6 +4,10 @@ from typing import List, Optional
 
 from pydantic import BaseModel, EmailStr, Field, field_validator
 
+from app.domains.artist.schemas import ArtistListResponse
+from app.domains.artwork.schemas import ArtworkListResponse
+from app.shared.pagination import Page
+
 
 class GalleryUpdate(BaseModel):
     name: Optional[str] = Field(default=None, min_length=1, max_length=100)
@@ -25,6 +29,8 @@ class GalleryResponse(BaseModel):
     website: Optional[str]
     profile_image_url: Optional[str]
     file_urls: Optional[List[str]]
+    domain_id: Optional[str] = None
+    domain_status: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
@@ -40,3 +46,14 @@ class GalleryResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class GalleryCatalogArtist(ArtistListResponse):
+    artworks: List[ArtworkListResponse] = Field(
+        default_factory=list, description="Most recent artworks, newest first"
+    )
+
+
+class GalleryCatalogResponse(Page[GalleryCatalogArtist]):
+    """One page of a gallery's artists, each with their latest artworks"""
+    gallery: GalleryResponse
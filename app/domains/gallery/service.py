@@ -1,19 +1,39 @@
 import json
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select, true
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domains.artist import models as artist_models, schemas as artist_schemas
+from app.domains.artwork.service import LIST_COLUMNS, STATS_COLUMNS
+from app.domains.auth.identity_cache import detached_copy, gallery_cache, invalidate_identity
 from app.domains.auth.schemas import GalleryProfileRequest
 from app.domains.gallery import models, schemas
-from app.shared.xrpl import XRPLService
+from app.domains.gallery.outbox_handlers import (
+    GALLERY_CREDENTIAL_CREATE,
+    GALLERY_CREDENTIAL_DELETE,
+    GALLERY_DOMAIN,
+)
+from app.domains.nfts.models import Artwork, ArtworkStats
+from app.shared.cache import response_cache
+from app.shared.outbox import enqueue
+from app.shared.pagination import PageParams, keyset, make_page
+
+ARTIST_COLUMNS = (
+    artist_models.Artist.id,
+    artist_models.Artist.wallet_address,
+    artist_models.Artist.name,
+    artist_models.Artist.email,
+    artist_models.Artist.profile_image_url,
+    artist_models.Artist.gallery_id,
+    artist_models.Artist.created_at,
+)
 
 
 class GalleryService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
-        self.xrpl_service = XRPLService()
 
     def _serialize_file_urls(self, file_urls: Optional[List[str]]) -> Optional[str]:
         """Convert list of URLs to JSON string"""
@@ -32,24 +52,18 @@ class GalleryService:
         except (json.JSONDecodeError, TypeError):
             return None
 
-    def _create_xrpl_domain(self, gallery_name: str) -> str | None:
-        """Create XRPL permissioned domain for gallery"""
-        try:
-            domain_name = f"{gallery_name.lower().replace(' ', '-')}.roasis.art"
-            return self.xrpl_service.create_domain(domain_name)
-        except Exception as e:
-            print(f"Failed to create XRPL domain: {e}")
-            return None
+    def _enqueue_credential(self, kind: str, gallery_id: int, artist_wallet_address: str) -> None:
+        enqueue(
+            self.db,
+            kind,
+            {"gallery_id": gallery_id, "artist_wallet_address": artist_wallet_address},
+        )
 
-    def create_gallery(
+    async def create_gallery(
         self, payload: GalleryProfileRequest, wallet_address: str
     ) -> models.Gallery:
         # Check if gallery profile already exists
-        existing_gallery = (
-            self.db.query(models.Gallery)
-            .filter(models.Gallery.wallet_address == wallet_address)
-            .first()
-        )
+        existing_gallery = await self.get_gallery_by_wallet(wallet_address)
 
         if existing_gallery:
             raise HTTPException(
@@ -57,14 +71,6 @@ class GalleryService:
                 detail="Gallery profile already exists",
             )
 
-        # Create XRPL domain for gallery
-        domain_id = self._create_xrpl_domain(payload.name)
-        if domain_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to create XRPL domain for gallery",
-            )
-
         gallery = models.Gallery(
             wallet_address=wallet_address,
             name=payload.name,
@@ -73,41 +79,52 @@ class GalleryService:
             website=payload.website,
             profile_image_url=payload.image_url,
             file_urls=self._serialize_file_urls(payload.file_urls),
-            domain_id=domain_id,
+            domain_status="pending",
         )
         self.db.add(gallery)
-        self.db.commit()
-        self.db.refresh(gallery)
+        await self.db.flush()
+        # The XRPL domain is created by the outbox worker once this commits
+        enqueue(
+            self.db,
+            GALLERY_DOMAIN,
+            {"gallery_id": gallery.id, "wallet_address": wallet_address},
+        )
+        await self.db.commit()
+        await self.db.refresh(gallery)
+        await response_cache.invalidate_tags("galleries")
         return gallery
 
-    def get_gallery(self, gallery_id: int) -> Optional[models.Gallery]:
-        return (
-            self.db.query(models.Gallery)
-            .filter(models.Gallery.id == gallery_id)
-            .first()
-        )
+    async def get_gallery(self, gallery_id: int) -> Optional[models.Gallery]:
+        return await self.db.get(models.Gallery, gallery_id)
 
-    def get_gallery_by_wallet(self, wallet_address: str) -> Optional[models.Gallery]:
-        return (
-            self.db.query(models.Gallery)
-            .filter(models.Gallery.wallet_address == wallet_address)
-            .first()
+    async def get_gallery_by_wallet(self, wallet_address: str) -> Optional[models.Gallery]:
+        """Read-only lookup (cached); the result is detached, don't modify it"""
+        gallery = gallery_cache.get(wallet_address)
+        if gallery is not None:
+            return gallery
+
+        result = await self.db.execute(
+            select(models.Gallery).where(models.Gallery.wallet_address == wallet_address)
         )
+        gallery = result.scalars().first()
+        if gallery is not None:
+            gallery = detached_copy(gallery)
+            gallery_cache.set(wallet_address, gallery)
+        return gallery
 
-    def list_galleries(self) -> List[models.Gallery]:
-        return (
-            self.db.query(models.Gallery)
-            .order_by(models.Gallery.id.desc())
-            .all()
+    async def list_galleries(self, page: PageParams) -> dict:
+        result = await self.db.execute(
+            keyset(select(models.Gallery), models.Gallery.created_at, models.Gallery.id, page)
         )
+        return make_page(result.scalars().all(), page)
 
-    def update_gallery(
+    async def update_gallery(
         self,
         gallery_id: int,
         payload: schemas.GalleryUpdate,
         current_wallet_address: str,
     ) -> Optional[models.Gallery]:
-        gallery = self.get_gallery(gallery_id)
+        gallery = await self.get_gallery(gallery_id)
         if not gallery:
             return None
 
@@ -127,12 +144,14 @@ class GalleryService:
             else:
                 setattr(gallery, field, value)
         self.db.add(gallery)
-        self.db.commit()
-        self.db.refresh(gallery)
+        await self.db.commit()
+        await self.db.refresh(gallery)
+        await response_cache.invalidate_tags("galleries")
+        await invalidate_identity(gallery.wallet_address)
         return gallery
 
-    def delete_gallery(self, gallery_id: int, current_wallet_address: str) -> bool:
-        gallery = self.get_gallery(gallery_id)
+    async def delete_gallery(self, gallery_id: int, current_wallet_address: str) -> bool:
+        gallery = await self.get_gallery(gallery_id)
         if not gallery:
             return False
 
@@ -143,14 +162,18 @@ class GalleryService:
                 detail="Only gallery owner can delete this gallery",
             )
 
-        self.db.delete(gallery)
-        self.db.commit()
+        await self.db.delete(gallery)
+        await self.db.commit()
+        await response_cache.invalidate_tags(
+            "galleries", "artworks", f"gallery:{gallery_id}:artists"
+        )
+        await invalidate_identity(gallery.wallet_address)
         return True
 
-    def invite_artist(self, artist_wallet_address: str, gallery_wallet_address: str) -> artist_schemas.ArtistInviteResponse:
+    async def invite_artist(self, artist_wallet_address: str, gallery_wallet_address: str) -> artist_schemas.ArtistInviteResponse:
         """Invite an artist to the gallery"""
         # Get current gallery
-        gallery = self.get_gallery_by_wallet(gallery_wallet_address)
+        gallery = await self.get_gallery_by_wallet(gallery_wallet_address)
         if not gallery:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -158,11 +181,12 @@ class GalleryService:
             )
 
         # Get artist by wallet address
-        artist = (
-            self.db.query(artist_models.Artist)
-            .filter(artist_models.Artist.wallet_address == artist_wallet_address)
-            .first()
+        result = await self.db.execute(
+            select(artist_models.Artist).where(
+                artist_models.Artist.wallet_address == artist_wallet_address
+            )
         )
+        artist = result.scalars().first()
         if not artist:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -176,11 +200,14 @@ class GalleryService:
                 detail="Artist already belongs to a gallery"
             )
 
-        # Assign artist to gallery
+        # Assign artist to gallery and issue the on-chain credential once this commits
         artist.gallery_id = gallery.id
         self.db.add(artist)
-        self.db.commit()
-        self.db.refresh(artist)
+        self._enqueue_credential(GALLERY_CREDENTIAL_CREATE, gallery.id, artist.wallet_address)
+        await self.db.commit()
+        await self.db.refresh(artist)
+        await response_cache.invalidate_tags("artists", "artworks", f"gallery:{gallery.id}:artists")
+        await invalidate_identity(artist.wallet_address)
 
         return artist_schemas.ArtistInviteResponse(
             message=f"Artist {artist.name} has been successfully invited to {gallery.name}",
@@ -188,49 +215,230 @@ class GalleryService:
             gallery_id=gallery.id
         )
 
-    def get_gallery_artists(self, gallery_wallet_address: str) -> List[artist_models.Artist]:
+    async def invite_artists(
+        self, artist_wallet_addresses: List[str], gallery_wallet_address: str
+    ) -> artist_schemas.ArtistBulkInviteResponse:
+        """Invite several artists in one transaction, reporting a result per address"""
+        gallery = await self.get_gallery_by_wallet(gallery_wallet_address)
+        if not gallery:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Gallery not found"
+            )
+
+        wallets = list(dict.fromkeys(artist_wallet_addresses))
+        # Lock the rows so a concurrent invite from another gallery can't interleave
+        result = await self.db.execute(
+            select(artist_models.Artist)
+            .where(artist_models.Artist.wallet_address.in_(wallets))
+            .with_for_update()
+        )
+        artists = {artist.wallet_address: artist for artist in result.scalars().all()}
+
+        results: List[artist_schemas.ArtistBulkItemResult] = []
+        invited: List[str] = []
+        for wallet in wallets:
+            artist = artists.get(wallet)
+            if artist is None:
+                item_status = "not_found"
+            elif artist.gallery_id is not None:
+                item_status = "already_in_gallery"
+            else:
+                # The outbox worker packs these credentials into Batch envelopes
+                artist.gallery_id = gallery.id
+                self._enqueue_credential(GALLERY_CREDENTIAL_CREATE, gallery.id, wallet)
+                invited.append(wallet)
+                item_status = "invited"
+            results.append(
+                artist_schemas.ArtistBulkItemResult(
+                    artist_wallet_address=wallet,
+                    artist_id=artist.id if artist is not None else None,
+                    status=item_status,
+                )
+            )
+
+        await self.db.commit()
+        if invited:
+            await response_cache.invalidate_tags(
+                "artists", "artworks", f"gallery:{gallery.id}:artists"
+            )
+            await invalidate_identity(*invited)
+
+        return artist_schemas.ArtistBulkInviteResponse(
+            message=f"{len(invited)} of {len(wallets)} artists invited to {gallery.name}",
+            gallery_id=gallery.id,
+            invited=len(invited),
+            results=results,
+        )
+
+    async def remove_artists(
+        self, artist_ids: List[int], gallery_wallet_address: str
+    ) -> artist_schemas.ArtistBulkRemoveResponse:
+        """Remove several artists in one transaction, reporting a result per ID"""
+        gallery = await self.get_gallery_by_wallet(gallery_wallet_address)
+        if not gallery:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Gallery not found"
+            )
+
+        ids = list(dict.fromkeys(artist_ids))
+        result = await self.db.execute(
+            select(artist_models.Artist)
+            .where(artist_models.Artist.id.in_(ids))
+            .with_for_update()
+        )
+        artists = {artist.id: artist for artist in result.scalars().all()}
+
+        results: List[artist_schemas.ArtistBulkItemResult] = []
+        removed: List[str] = []
+        for artist_id in ids:
+            artist = artists.get(artist_id)
+            if artist is None:
+                item_status = "not_found"
+            elif artist.gallery_id != gallery.id:
+                item_status = "not_in_gallery"
+            else:
+                artist.gallery_id = None
+                self._enqueue_credential(GALLERY_CREDENTIAL_DELETE, gallery.id, artist.wallet_address)
+                removed.append(artist.wallet_address)
+                item_status = "removed"
+            results.append(
+                artist_schemas.ArtistBulkItemResult(
+                    artist_wallet_address=artist.wallet_address if artist is not None else None,
+                    artist_id=artist_id,
+                    status=item_status,
+                )
+            )
+
+        await self.db.commit()
+        if removed:
+            await response_cache.invalidate_tags(
+                "artists", "artworks", f"gallery:{gallery.id}:artists"
+            )
+            await invalidate_identity(*removed)
+
+        return artist_schemas.ArtistBulkRemoveResponse(
+            message=f"{len(removed)} of {len(ids)} artists removed from {gallery.name}",
+            gallery_id=gallery.id,
+            removed=len(removed),
+            results=results,
+        )
+
+    async def get_gallery_artists(self, gallery_wallet_address: str) -> List[artist_models.Artist]:
         """Get all artists belonging to the gallery"""
-        gallery = self.get_gallery_by_wallet(gallery_wallet_address)
+        gallery = await self.get_gallery_by_wallet(gallery_wallet_address)
         if not gallery:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Gallery not found"
             )
 
-        return (
-            self.db.query(artist_models.Artist)
-            .filter(artist_models.Artist.gallery_id == gallery.id)
+        result = await self.db.execute(
+            select(artist_models.Artist)
+            .where(artist_models.Artist.gallery_id == gallery.id)
             .order_by(artist_models.Artist.created_at.desc())
-            .all()
         )
+        return list(result.scalars().all())
 
-    def get_gallery_artists_by_id(self, gallery_id: int) -> List[artist_models.Artist]:
-        """Get all artists belonging to a specific gallery by gallery ID (public)"""
-        gallery = self.get_gallery(gallery_id)
+    async def get_gallery_artists_by_id(self, gallery_id: int, page: PageParams) -> dict:
+        """Get artists belonging to a specific gallery by gallery ID (public, paginated)"""
+        gallery = await self.get_gallery(gallery_id)
         if not gallery:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Gallery not found"
             )
 
-        return (
-            self.db.query(artist_models.Artist)
-            .filter(artist_models.Artist.gallery_id == gallery_id)
-            .order_by(artist_models.Artist.created_at.desc())
-            .all()
+        result = await self.db.execute(
+            keyset(
+                select(artist_models.Artist).where(artist_models.Artist.gallery_id == gallery_id),
+                artist_models.Artist.created_at,
+                artist_models.Artist.id,
+                page,
+            )
         )
+        return make_page(result.scalars().all(), page)
+
+    async def get_gallery_catalog(
+        self, gallery_id: int, page: PageParams, artworks_per_artist: int
+    ) -> schemas.GalleryCatalogResponse:
+        """
+        Gallery, a page of its artists and each artist's latest artworks in one query.
+
+        The artist page is a keyset subquery; artworks come from a LATERAL
+        subquery per artist, so each artist costs one bounded index scan on
+        ix_artworks_artist_address_created_at.
+        """
+        Artist = artist_models.Artist
+        page_artists = keyset(
+            select(*ARTIST_COLUMNS).where(Artist.gallery_id == gallery_id),
+            Artist.created_at,
+            Artist.id,
+            page,
+        ).subquery("page_artists")
+        recent_artworks = (
+            select(*LIST_COLUMNS, *STATS_COLUMNS)
+            .outerjoin(ArtworkStats, ArtworkStats.artwork_id == Artwork.id)
+            .where(Artwork.artist_address == page_artists.c.wallet_address)
+            .order_by(Artwork.created_at.desc(), Artwork.id.desc())
+            .limit(artworks_per_artist)
+            .lateral("recent_artworks")
+        )
+        result = await self.db.execute(
+            select(
+                models.Gallery,
+                *(col.label(f"artist_{col.key}") for col in page_artists.c),
+                *(col.label(f"artwork_{col.key}") for col in recent_artworks.c),
+            )
+            .select_from(models.Gallery)
+            .outerjoin(page_artists, true())
+            .outerjoin(recent_artworks, true())
+            .where(models.Gallery.id == gallery_id)
+            .order_by(
+                page_artists.c.created_at.desc(),
+                page_artists.c.id.desc(),
+                recent_artworks.c.created_at.desc(),
+                recent_artworks.c.id.desc(),
+            )
+        )
+        rows = result.all()
+        if not rows:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Gallery not found"
+            )
 
-    def remove_artist(self, artist_id: int, gallery_wallet_address: str) -> bool:
+        artists: Dict[int, schemas.GalleryCatalogArtist] = {}
+        for row in rows:
+            values = row._mapping
+            if values["artist_id"] is None:
+                continue  # gallery without artists (or past the last page)
+            artist = artists.get(values["artist_id"])
+            if artist is None:
+                artist = schemas.GalleryCatalogArtist(
+                    **{col.key: values[f"artist_{col.key}"] for col in page_artists.c}
+                )
+                artists[artist.id] = artist
+            if values["artwork_id"] is not None:
+                artist.artworks.append(
+                    schemas.ArtworkListResponse(
+                        **{col.key: values[f"artwork_{col.key}"] for col in recent_artworks.c}
+                    )
+                )
+
+        return schemas.GalleryCatalogResponse(
+            gallery=schemas.GalleryResponse.model_validate(rows[0][0]),
+            **make_page(list(artists.values()), page)
+        )
+
+    async def remove_artist(self, artist_id: int, gallery_wallet_address: str) -> bool:
         """Remove an artist from the gallery"""
-        gallery = self.get_gallery_by_wallet(gallery_wallet_address)
+        gallery = await self.get_gallery_by_wallet(gallery_wallet_address)
         if not gallery:
             return False
 
-        artist = (
-            self.db.query(artist_models.Artist)
-            .filter(artist_models.Artist.id == artist_id)
-            .first()
-        )
+        artist = await self.db.get(artist_models.Artist, artist_id)
         if not artist:
             return False
 
@@ -241,8 +449,11 @@ class GalleryService:
                 detail="Artist does not belong to this gallery"
             )
 
-        # Remove artist from gallery
+        # Remove artist from gallery and revoke the credential
         artist.gallery_id = None
         self.db.add(artist)
-        self.db.commit()
+        self._enqueue_credential(GALLERY_CREDENTIAL_DELETE, gallery.id, artist.wallet_address)
+        await self.db.commit()
+        await response_cache.invalidate_tags("artists", "artworks", f"gallery:{gallery.id}:artists")
+        await invalidate_identity(artist.wallet_address)
         return True
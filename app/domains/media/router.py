@@ -0,0 +1,99 @@
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.domains.media.service import MEDIA_FORMATS, MediaService, get_derivative, source_digest
+from app.shared.ipfs import check_ipfs_ref, fetch_ipfs, sniff_content_type
+from app.shared.database.connection import get_db
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/media", tags=["media"])
+
+CACHE_CONTROL = "public, max-age=86400, stale-while-revalidate=604800"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get("/ipfs/{cid}")
+@router.get("/ipfs/{cid}/{path:path}")
+async def get_ipfs_content(
+    cid: str, request: Request, path: str = "", db: AsyncSession = Depends(get_db)
+):
+    """
+    IPFS content served from the backend read-through cache
+
+    Only CIDs referenced by an artwork or NFT are served, so the proxy and its
+    cache can't be used for arbitrary content.
+
+    **Possible errors:**
+    - 400: Invalid CID or path
+    - 404: CID not referenced by any artwork or NFT
+    - 502: Content could not be fetched and verified from any gateway
+    """
+    try:
+        check_ipfs_ref(cid, path)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not await MediaService(db).is_known_cid(cid):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown CID")
+
+    etag = f'"{cid}/{path}"'
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    try:
+        data = await fetch_ipfs(cid, path)
+    except Exception as e:
+        logger.error(f"Failed to fetch ipfs://{cid}/{path}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY, detail="IPFS content unavailable"
+        )
+    return Response(content=data, media_type=sniff_content_type(data), headers=headers)
+
+
+@router.get("/{artwork_id}/{size}.{fmt}")
+async def get_artwork_media(
+    artwork_id: int,
+    size: int,
+    fmt: str,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Resized artwork image (e.g. /media/12/512.webp)
+
+    Supports conditional requests (ETag) and byte ranges.
+
+    **Possible errors:**
+    - 404: Artwork not found, or unsupported size/format
+    - 502: Original image could not be fetched from IPFS
+    """
+    if fmt not in MEDIA_FORMATS or size not in settings.media_sizes:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Supported sizes: {settings.media_sizes}, formats: {list(MEDIA_FORMATS)}",
+        )
+
+    service = MediaService(db)
+    image_url = await service.get_image_url(artwork_id)
+    if not image_url:
+        raise HTTPException(status_code=404, detail="Artwork not found")
+
+    etag = f'"{source_digest(image_url)}-{size}.{fmt}"'
+    headers = {"Cache-Control": CACHE_CONTROL, "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    try:
+        path = await get_derivative(image_url, size, fmt)
+    except Exception as e:
+        logger.error(f"Failed to render media for artwork {artwork_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY, detail="Original image unavailable"
+        )
+
+    return FileResponse(path, media_type=f"image/{fmt}", headers=headers)
@@ -0,0 +1,150 @@
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+import httpx
+from PIL import features
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.domains.nfts.models import NFT, Artwork
+from app.shared.disk_cache import DiskLRUCache
+from app.shared.images import FORMAT_OPTIONS, render_derivative
+from app.shared.ipfs import fetch_ipfs_uri
+from app.shared.process_pool import get_process_pool
+
+logger = logging.getLogger(__name__)
+
+# AVIF depends on how Pillow was built, so only advertise what can be encoded
+MEDIA_FORMATS = tuple(fmt for fmt in FORMAT_OPTIONS if features.check(fmt))
+
+_cache: Optional[DiskLRUCache] = None
+# Derivatives currently being rendered, so concurrent misses share one job
+_inflight: Dict[str, "asyncio.Future[Path]"] = {}
+# Strong references to fire-and-forget pre-generation tasks
+_background: Set[asyncio.Task] = set()
+# CIDs already found referenced by an artwork or NFT (references are never rewritten)
+_known_cids: "OrderedDict[str, None]" = OrderedDict()
+_KNOWN_CIDS_MAX = 4096
+
+
+def get_media_cache() -> DiskLRUCache:
+    global _cache
+    if _cache is None:
+        _cache = DiskLRUCache(settings.media_cache_dir, settings.media_cache_max_bytes)
+    return _cache
+
+
+def source_digest(image_url: str) -> str:
+    """Stable short digest of an image URL, used in cache keys and ETags"""
+    return hashlib.sha256(image_url.encode("utf-8")).hexdigest()[:32]
+
+
+def derivative_key(image_url: str, size: int, fmt: str) -> str:
+    return f"{source_digest(image_url)}_{size}.{fmt}"
+
+
+async def _fetch_source(image_url: str) -> bytes:
+    if image_url.startswith("ipfs://"):
+        # Images are pinned as single files, so resolve the bare CID
+        cid = image_url[len("ipfs://"):].split("/", 1)[0]
+        return await fetch_ipfs_uri(f"ipfs://{cid}")
+    async with httpx.AsyncClient(timeout=60, follow_redirects=True) as client:
+        resp = await client.get(image_url)
+        resp.raise_for_status()
+        return resp.content
+
+
+async def _render(key: str, image_url: str, size: int, fmt: str, image_bytes: Optional[bytes]) -> Path:
+    if image_bytes is None:
+        image_bytes = await _fetch_source(image_url)
+    loop = asyncio.get_running_loop()
+    data = await loop.run_in_executor(get_process_pool(), render_derivative, image_bytes, size, fmt)
+    return await asyncio.to_thread(get_media_cache().put, key, data)
+
+
+async def get_derivative(
+    image_url: str, size: int, fmt: str, image_bytes: Optional[bytes] = None
+) -> Path:
+    """
+    Return the cached derivative path, rendering it on a miss.
+
+    Pass ``image_bytes`` when the original is already in memory to skip the
+    gateway fetch.
+    """
+    key = derivative_key(image_url, size, fmt)
+    path = get_media_cache().get(key)
+    if path is not None:
+        return path
+
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(_render(key, image_url, size, fmt, image_bytes))
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(future)
+
+
+async def pregenerate(image_url: str, image_bytes: Optional[bytes] = None) -> None:
+    for size in settings.media_pregenerate_sizes:
+        for fmt in settings.media_pregenerate_formats:
+            try:
+                await get_derivative(image_url, size, fmt, image_bytes)
+            except Exception as e:
+                logger.warning(f"Failed to pre-generate {size}.{fmt} for {image_url}: {e}")
+
+
+def schedule_pregenerate(image_url: str, image_bytes: Optional[bytes] = None) -> None:
+    """Render the common sizes in the background (e.g. right after a mint)"""
+    task = asyncio.get_running_loop().create_task(pregenerate(image_url, image_bytes))
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+
+class MediaService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def is_known_cid(self, cid: str) -> bool:
+        """Whether an artwork or NFT references ipfs://<cid>; the IPFS proxy serves nothing else"""
+        if cid in _known_cids:
+            _known_cids.move_to_end(cid)
+            return True
+        uri = f"ipfs://{cid}"
+
+        def refers(column):
+            # ipfs://<cid>, ipfs://<cid>/meta.json, ipfs://<cid>?p=1&t=4
+            return or_(column == uri, column.startswith(f"{uri}/"), column.startswith(f"{uri}?"))
+
+        found = await self.db.scalar(
+            select(Artwork.id)
+            .where(or_(refers(Artwork.image_url), refers(Artwork.metadata_uri_base)))
+            .limit(1)
+        )
+        if found is None:
+            # Piece metadata and tile images; containment uses the ix_nfts_extra GIN index
+            found = await self.db.scalar(
+                select(NFT.id)
+                .where(
+                    or_(
+                        NFT.extra.contains({"part_uri": uri}),
+                        NFT.extra.contains({"tile_image_uri": uri}),
+                    )
+                )
+                .limit(1)
+            )
+        if found is None:
+            return False
+        _known_cids[cid] = None
+        if len(_known_cids) > _KNOWN_CIDS_MAX:
+            _known_cids.popitem(last=False)
+        return True
+
+    async def get_image_url(self, artwork_id: int) -> Optional[str]:
+        return await self.db.scalar(
+            select(Artwork.image_url).where(Artwork.id == artwork_id)
+        )
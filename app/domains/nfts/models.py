@@ -1,9 +1,19 @@
+import hashlib
 from datetime import datetime
+from typing import Optional
 
-from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, LargeBinary, String, Text, text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
+from xrpl.utils import str_to_hex
 
 from app.shared.database.connection import Base
+from app.shared.database.types import HexBinary
+
+
+def uri_hash(uri: str) -> bytes:
+    """SHA-256 of a piece URI (uniqueness key for nfts)"""
+    return hashlib.sha256(uri.encode("utf-8")).digest()
 
 
 class Artwork(Base):
@@ -19,22 +29,98 @@ class Artwork(Base):
     metadata_uri_base = Column(String(500), nullable=False)  # ex) ipfs://cid/meta.json
     artist_address = Column(String(128), nullable=False)  # 작가 XRPL 주소
     created_at = Column(DateTime, default=datetime.utcnow)
+    # 검색용 (title: A, description: B), DB 트리거가 갱신
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+
+    __table_args__ = (
+        Index("ix_artworks_created_at_id", "created_at", "id"),
+        Index("ix_artworks_artist_address_created_at", "artist_address", "created_at", "id"),
+        # /artworks 필터·정렬 조합 (가격순, grid_n, 작가별 가격순)
+        Index("ix_artworks_price_usd_id", "price_usd", "id"),
+        Index("ix_artworks_grid_n_created_at", "grid_n", "created_at", "id"),
+        Index("ix_artworks_grid_n_price_usd", "grid_n", "price_usd", "id"),
+        Index("ix_artworks_artist_address_price_usd", "artist_address", "price_usd", "id"),
+        Index("ix_artworks_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_artworks_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     nfts = relationship("NFT", back_populates="artwork")
 
 
+class ArtworkStats(Base):
+    """작품별 조각 현황 카운터 (NFT 상태 변경과 같은 트랜잭션에서 갱신)"""
+    __tablename__ = "artwork_stats"
+
+    artwork_id = Column(Integer, ForeignKey("artworks.id", ondelete="CASCADE"), primary_key=True)
+    grid_total = Column(Integer, nullable=False)  # 전체 조각 수 (grid_n * grid_n)
+    minted = Column(Integer, nullable=False, default=0, server_default="0")  # 민팅 완료 조각 수
+    offered = Column(Integer, nullable=False, default=0, server_default="0")  # 판매 오퍼 중인 조각 수
+    sold = Column(Integer, nullable=False, default=0, server_default="0")  # 판매 완료 조각 수
+    remaining = Column(Integer, nullable=False, default=0, server_default="0")  # 구매 가능 조각 수 (minted - sold)
+    min_listed_price = Column(Integer, nullable=True)  # 오퍼 중인 조각 최저가 (USD)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # "판매 중" 필터: remaining > 0 인 작품만
+        Index(
+            "ix_artwork_stats_available",
+            "artwork_id",
+            postgresql_where=text("remaining > 0"),
+        ),
+    )
+
+
 class NFT(Base):
     __tablename__ = "nfts"
 
     id = Column(Integer, primary_key=True, index=True)
     artwork_id = Column(Integer, ForeignKey("artworks.id"), nullable=False)
-    uri_hex = Column(String(512), nullable=False, unique=True)  # XRPL 저장된 hex URI
-    nftoken_id = Column(String(128), nullable=True)  # XRPL 발급된 NFTokenID
-    tx_hash = Column(String(128), nullable=True)  # 민팅 트랜잭션 해시
-    offer_tx_hash = Column(String(128), nullable=True)  # 오퍼 트랜잭션 해시
+    # 일반 테이블은 전역 UNIQUE. 해시 파티션(0010)은 (artwork_id, uri_hash)만 보장하므로
+    # 작품 간 중복은 등록 시 _assert_uris_not_minted가 ix_nfts_uri_hash(0012)로 확인
+    uri_hash = Column(LargeBinary(32), nullable=False, unique=True)  # 조각 URI의 SHA-256 (URI 원문은 extra.part_uri)
+    nftoken_id = Column(HexBinary(32), nullable=True)  # XRPL 발급된 NFTokenID
+    tx_hash = Column(HexBinary(32), nullable=True)  # 민팅 트랜잭션 해시
+    offer_tx_hash = Column(HexBinary(32), nullable=True)  # 오퍼 트랜잭션 해시
     owner_address = Column(String(128), nullable=False)  # 최초 소유자(민팅 계정 or 이후 이전 계정)
     status = Column(String(50), default="minted")  # minted / listed / sold
     price = Column(Integer, nullable=False)  # USD 가격 (조각별 가격)
-    extra = Column(JSON, nullable=True)  # 확장용 (가격, 메타데이터 캐시 등)
+    grid_index = Column(Integer, nullable=True)  # 그리드 위치 (row-major, 1부터)
+    offer_id = Column(HexBinary(32), nullable=True)  # 판매 오퍼 NFTokenOffer ID (Batch 오퍼는 NULL)
+    offer_amount_drops = Column(BigInteger, nullable=True)  # 오퍼 가격 (drops)
+    batch_chunk = Column(Integer, nullable=True)  # Batch 오퍼로 생성된 경우 청크 번호
+    extra = Column(JSONB, nullable=True)  # 확장용 (조각 URI, 타일 이미지 등)
+
+    __table_args__ = (
+        # 작품 상세·조각 목록 (grid 순서), artwork_id 단독 조회도 커버
+        Index("ix_nfts_artwork_grid_index", "artwork_id", "grid_index", "id"),
+        # 오퍼 ID로 조각 찾기
+        Index("ix_nfts_offer_id", "offer_id", postgresql_where=text("offer_id IS NOT NULL")),
+        Index("ix_nfts_extra", "extra", postgresql_using="gin"),
+        # 오퍼 생성 쿼리 (플랫폼 보유 + 민팅 완료 조각)
+        Index(
+            "ix_nfts_artwork_owner_status",
+            "artwork_id",
+            "owner_address",
+            "status",
+            postgresql_where=text("nftoken_id IS NOT NULL"),
+        ),
+    )
+    # artwork_id를 식별자에 포함: UPDATE/DELETE가 artwork_id로도 걸러져
+    # 파티션 테이블(0010, artwork_id 해시 파티션)에서 한 파티션만 탐색
+    __mapper_args__ = {"primary_key": [id, artwork_id]}
 
     artwork = relationship("Artwork", back_populates="nfts")
+
+    @property
+    def part_uri(self) -> Optional[str]:
+        return (self.extra or {}).get("part_uri")
+
+    @property
+    def uri_hex(self) -> Optional[str]:
+        """XRPL에 저장된 hex URI (part_uri에서 계산)"""
+        return str_to_hex(self.part_uri) if self.part_uri is not None else None
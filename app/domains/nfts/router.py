@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
 from app.shared.database.connection import get_db
 from app.domains.auth.models import UserType, WalletAuth
 from app.domains.auth.router import get_current_wallet_auth
+from app.domains.auth.service import XRPLAuthService
 
 from .schemas import RegisterMintOut, VerifyIn, VerifyOut
 from .services import register_to_ipfs_and_mint, verify_tx
@@ -30,7 +31,7 @@ def ping():
 @router.post("/artworks/register-mint", response_model=RegisterMintOut)
 async def register_and_mint(
     current_wallet: WalletAuth = Depends(get_current_wallet_auth),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     # 파일
     image: UploadFile = File(..., description="작품 이미지 파일 (png/jpg)"),
     # 메타데이터 기본
@@ -62,8 +63,8 @@ async def register_and_mint(
                 }
             )
 
-        # 2. 활성 계정 확인
-        if not current_wallet.is_active:
+        # 2. 활성 계정 확인 (캐시된 WalletAuth 대신 DB에서 직접 확인)
+        if not await XRPLAuthService(db).is_wallet_active(current_wallet.wallet_address):
             logger.warning(f"Inactive user {current_wallet.wallet_address} attempted to mint")
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -101,8 +102,8 @@ async def register_and_mint(
 
 
 @router.post("/tx/verify", response_model=VerifyOut)
-def verify(body: VerifyIn):
+async def verify(body: VerifyIn):
     try:
-        return VerifyOut(**verify_tx(body.tx_hash))
+        return VerifyOut(**await verify_tx(body.tx_hash))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
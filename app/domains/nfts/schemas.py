@@ -1,13 +1,14 @@
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
+from xrpl.utils import str_to_hex
 
 
 class NFTResponse(BaseModel):
     """NFT response schema"""
     id: int = Field(..., description="NFT ID")
     artwork_id: int = Field(..., description="Associated artwork ID")
-    uri_hex: str = Field(..., description="XRPL URI in hex format")
+    part_uri: Optional[str] = Field(None, exclude=True)
     nftoken_id: Optional[str] = Field(None, description="XRPL NFToken ID")
     tx_hash: Optional[str] = Field(None, description="Minting transaction hash")
     offer_tx_hash: Optional[str] = Field(None, description="Offer transaction hash")
@@ -15,6 +16,12 @@ class NFTResponse(BaseModel):
     status: str = Field(..., description="NFT status (minted/sold)")
     price: int = Field(..., description="Price in USD cents")
 
+    @computed_field(description="XRPL URI in hex format")
+    @property
+    def uri_hex(self) -> Optional[str]:
+        # Only the URI is stored; the hex form is rebuilt for the response
+        return str_to_hex(self.part_uri) if self.part_uri is not None else None
+
     class Config:
         from_attributes = True
 
@@ -27,6 +34,8 @@ class RegisterMintOut(BaseModel):
     metadata_cid: str
     metadata_uri_base: str  # ipfs://<cid>/meta.json
     metadata_http_url: str  # 게이트웨이 URL
+    tile_image_uris: List[str] = Field(default_factory=list)  # 조각별 타일 이미지
+    piece_metadata_uris: List[str] = Field(default_factory=list)  # 조각별 meta.json
     minted: int
     failed: int
     tx_hashes: List[str]
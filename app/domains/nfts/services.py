@@ -1,43 +1,39 @@
 import asyncio
 import logging
-import time
-from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from xrpl.asyncio.clients import AsyncJsonRpcClient
 from xrpl.asyncio.transaction import XRPLReliableSubmissionException
-from xrpl.clients import JsonRpcClient
 from xrpl.models.requests import AccountInfo, AccountObjects, Tx
 from xrpl.models.transactions import NFTokenMint, TicketCreate, NFTokenCreateOffer
-from xrpl.transaction import autofill, sign, submit_and_wait
 from xrpl.utils import str_to_hex
 from xrpl.wallet import Wallet
-from functools import partial
 
 from app.core.config import settings
+from app.domains.media.service import schedule_pregenerate
+from app.shared.cache import response_cache
 from app.shared.pinata_client import pin_file_to_ipfs, pin_json_to_ipfs
+from app.shared.tiles import pin_tiles_with_metadata, render_tiles
+from app.shared.xrpl import get_xrpl_service, submit_and_wait_locked
 
-from .models import NFT, Artwork
+from .models import NFT, Artwork, uri_hash
+from .stats import init_stats, record_status_change
 
-DEVNET_URL = "https://s.devnet.rippletest.net:51234/"
 
-
-def _xrpl_client() -> JsonRpcClient:
-    rpc = getattr(settings, "xrpl_rpc_url", DEVNET_URL) or DEVNET_URL
-    return JsonRpcClient(rpc)
-
-
-def _assert_funded(client: JsonRpcClient, address: str) -> int:
+async def _assert_funded(client: AsyncJsonRpcClient, address: str) -> int:
     req = AccountInfo(account=address, ledger_index="validated", strict=True)
-    resp = client.request(req)
+    resp = await client.request(req)
     if "account_data" not in resp.result:
         raise RuntimeError(f"account_info failed: {resp.result}")
     return int(resp.result["account_data"]["Sequence"])
 
 
-def _get_ticket_sequences(client: JsonRpcClient, address: str, want: int) -> List[int]:
+async def _get_ticket_sequences(client: AsyncJsonRpcClient, address: str, want: int) -> List[int]:
     req = AccountObjects(account=address, type="ticket")
-    resp = client.request(req)
+    resp = await client.request(req)
     objs = resp.result.get("account_objects", [])
     tickets = [int(o["TicketSequence"]) for o in objs]
     tickets.sort()
@@ -63,6 +59,31 @@ def _build_part_uri(base: str, idx: int, total: int) -> str:
     return f"{base}?p={idx}&t={total}"
 
 
+def _part_uris(
+    metadata_uri_base: str, grid_total: int, piece_uris: Optional[List[str]]
+) -> List[str]:
+    """조각별 NFT URI (piece_uris가 없으면 meta.json 기준으로 생성)"""
+    return piece_uris or [
+        _build_part_uri(metadata_uri_base, i, grid_total) for i in range(1, grid_total + 1)
+    ]
+
+
+async def _assert_uris_not_minted(db: AsyncSession, part_uris: List[str]) -> None:
+    """이미 민팅된 조각 URI면 409 (Artwork 저장 전에 확인)"""
+    # 일반 테이블은 UNIQUE(uri_hash)가 최종 보장, 파티션 테이블(0010)은 이 확인이 유일한 작품 간 검사
+    duplicate = await db.scalar(
+        select(NFT.id).where(NFT.uri_hash.in_([uri_hash(u) for u in part_uris])).limit(1)
+    )
+    if duplicate is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "error": "ALREADY_MINTED",
+                "message": f"Piece URI already minted (nft id={duplicate})",
+            },
+        )
+
+
 def _extract_offer_index(tx_result: Dict[str, Any]) -> Optional[str]:
     meta = tx_result.get("meta") or {}
     nodes = meta.get("AffectedNodes") or []
@@ -78,8 +99,8 @@ def _extract_offer_index(tx_result: Dict[str, Any]) -> Optional[str]:
     return None
 
 
-def _create_nft_offer(
-    client: JsonRpcClient,
+async def _create_nft_offer(
+    client: AsyncJsonRpcClient,
     wallet: Wallet,
     nftoken_id: str,
     price_drops: str,
@@ -97,13 +118,8 @@ def _create_nft_offer(
     logging.info(f"Offer transaction created: {offer_tx}")
 
     try:
-        o_autofilled = autofill(offer_tx, client)
-        logging.info(f"Offer transaction autofilled: {o_autofilled}")
-
-        o_signed = sign(o_autofilled, wallet)
-        logging.info("Offer transaction signed successfully")
-
-        o_resp = submit_and_wait(o_signed, client)
+        # 플랫폼 계정 시퀀스 충돌 방지: autofill~submit은 계정 락 안에서
+        o_resp = await submit_and_wait_locked(client, wallet, offer_tx)
         logging.info(f"Offer submission response: success={o_resp.is_successful()}")
         logging.info(f"FULL OFFER RESPONSE: {o_resp.result}")
 
@@ -116,8 +132,8 @@ def _create_nft_offer(
         raise
 
 
-def _sync_xrpl_batch_mint(
-    db: Session,
+async def _xrpl_batch_mint(
+    db: AsyncSession,
     artwork_id: int,
     metadata_uri_base: str,
     grid_total: int,
@@ -125,29 +141,30 @@ def _sync_xrpl_batch_mint(
     transfer_fee: int,
     taxon: int,
     nft_price_usd: int,
+    piece_uris: Optional[List[str]] = None,
+    tile_uris: Optional[List[str]] = None,
 ) -> Dict[str, Any]:
-    """동기 버전의 XRPL 배치 민팅 함수"""
-    client = _xrpl_client()
-    seed = settings.platform_seed
-    if not seed:
-        raise RuntimeError("platform_seed is not configured")
-    wallet = Wallet.from_seed(seed)
+    """XRPL 배치 민팅 함수 (piece_uris가 있으면 조각별 메타데이터 사용)"""
+    part_uris = _part_uris(metadata_uri_base, grid_total, piece_uris)
+
+    xrpl = get_xrpl_service()
+    client = xrpl.client
+    wallet = xrpl.wallet
     classic = wallet.classic_address
 
-    current_seq = _assert_funded(client, classic)
-    tc = TicketCreate(account=classic, ticket_count=grid_total, sequence=current_seq)
-    tc_autofilled = autofill(tc, client)
-    tc_signed = sign(tc_autofilled, wallet)
-    tc_resp = submit_and_wait(tc_signed, client)
+    await _assert_funded(client, classic)
+    # 시퀀스는 계정 락 안에서 autofill이 채움 (outbox 워커 등 다른 서명자와 충돌 방지)
+    tc = TicketCreate(account=classic, ticket_count=grid_total)
+    tc_resp = await submit_and_wait_locked(client, wallet, tc)
     if not tc_resp.is_successful():
         raise RuntimeError(f"TicketCreate failed: {tc_resp.result}")
 
     # 티켓 조회(지연 보정)
-    time.sleep(0.5)
-    tickets = _get_ticket_sequences(client, classic, grid_total)
+    await asyncio.sleep(0.5)
+    tickets = await _get_ticket_sequences(client, classic, grid_total)
     if len(tickets) < grid_total:
-        time.sleep(1.0)
-        tickets = _get_ticket_sequences(client, classic, grid_total)
+        await asyncio.sleep(1.0)
+        tickets = await _get_ticket_sequences(client, classic, grid_total)
     if len(tickets) < grid_total:
         raise RuntimeError(f"Not enough tickets: want={grid_total}, got={len(tickets)}")
 
@@ -157,7 +174,7 @@ def _sync_xrpl_batch_mint(
     errors: List[Any] = []
 
     for i, tseq in enumerate(tickets[:grid_total], start=1):
-        part_uri = _build_part_uri(metadata_uri_base, i, grid_total)
+        part_uri = part_uris[i - 1]
         uri_hex = str_to_hex(part_uri)
 
         mint_tx = NFTokenMint(
@@ -170,9 +187,7 @@ def _sync_xrpl_batch_mint(
             nftoken_taxon=int(taxon),
         )
         try:
-            m_autofilled = autofill(mint_tx, client)
-            m_signed = sign(m_autofilled, wallet)
-            m_resp = submit_and_wait(m_signed, client)
+            m_resp = await submit_and_wait_locked(client, wallet, mint_tx)
 
             if m_resp.is_successful():
                 minted += 1
@@ -184,20 +199,22 @@ def _sync_xrpl_batch_mint(
                 db.add(
                     NFT(
                         artwork_id=artwork_id,
-                        uri_hex=uri_hex,
+                        uri_hash=uri_hash(part_uri),
                         nftoken_id=nid,
                         tx_hash=txh,
                         owner_address=classic,
                         status="minted",
                         price=nft_price_usd,
+                        grid_index=i,
                         extra={
                             "part_uri": part_uri,
-                            "grid_index": i,
                             "grid_total": grid_total,
+                            "tile_image_uri": tile_uris[i - 1] if tile_uris else None,
                         },
                     )
                 )
-                db.commit()
+                await record_status_change(db, artwork_id, [None], "minted")
+                await db.commit()
             else:
                 errors.append(m_resp.result)
 
@@ -215,30 +232,28 @@ def _sync_xrpl_batch_mint(
     }
 
 
-def _sync_xrpl_single_offer(
-    db: Session,
+async def _xrpl_single_offer(
+    db: AsyncSession,
     *,
     artwork_id: int,
 ) -> Dict[str, Any]:
     """단일 NFT 오퍼 생성 함수"""
     logging.info(f"Starting single offer creation for artwork_id={artwork_id}")
 
-    client = _xrpl_client()
-    seed = settings.platform_seed
-    if not seed:
-        raise RuntimeError("platform_seed is not configured")
-    wallet = Wallet.from_seed(seed)
+    xrpl = get_xrpl_service()
+    client = xrpl.client
+    wallet = xrpl.wallet
     classic = wallet.classic_address
 
     # 단일 NFT 로드
-    nft: Optional[NFT] = (
-        db.query(NFT)
-        .filter(NFT.artwork_id == artwork_id)
-        .filter(NFT.owner_address == classic)
-        .filter(NFT.nftoken_id.isnot(None))
-        .filter(NFT.status.in_(["minted", "offered_to_artist"]))
-        .first()
+    result = await db.execute(
+        select(NFT)
+        .where(NFT.artwork_id == artwork_id)
+        .where(NFT.owner_address == classic)
+        .where(NFT.nftoken_id.isnot(None))
+        .where(NFT.status.in_(["minted", "offered_to_artist"]))
     )
+    nft: Optional[NFT] = result.scalars().first()
 
     if not nft:
         logging.error("No NFT found for single offer creation")
@@ -252,14 +267,13 @@ def _sync_xrpl_single_offer(
         }
 
     # 이미 offer_id 있으면 스킵
-    existing_offer_id = (nft.extra or {}).get("gift_offer_id")
-    if existing_offer_id:
-        logging.info(f"NFT {nft.id} already has offer_id={existing_offer_id}")
+    if nft.offer_id:
+        logging.info(f"NFT {nft.id} already has offer_id={nft.offer_id}")
         return {
             "offers_created": 0,
             "offers_total_considered": 1,
-            "offer_ids": [existing_offer_id],
-            "offer_tx_hashes": [(nft.extra or {}).get("gift_offer_tx_hash")],
+            "offer_ids": [nft.offer_id],
+            "offer_tx_hashes": [nft.offer_tx_hash],
             "failed": 0,
             "errors": [],
         }
@@ -272,7 +286,7 @@ def _sync_xrpl_single_offer(
         price_xrp = nft.price * usd_to_xrp_rate
         price_drops = str(int(price_xrp * 1_000_000))  # Convert to drops
 
-        res = _create_nft_offer(
+        res = await _create_nft_offer(
             client=client,
             wallet=wallet,
             nftoken_id=nft.nftoken_id,
@@ -283,18 +297,18 @@ def _sync_xrpl_single_offer(
         logging.info(f"Single offer created: offer_id={oid}, tx_hash={res.get('hash')}")
 
         # DB 업데이트
-        extra = nft.extra or {}
-        extra.update({
-            "gift_offer_id": oid,
-            "gift_offer_amount": price_drops,
-            "gift_offer_price_usd": nft.price,
-            "gift_offer_type": "public",  # Public offer anyone can accept
-        })
+        await record_status_change(db, artwork_id, [nft.status], "offered_to_artist", [nft.price])
         nft.status = "offered_to_artist"
         nft.offer_tx_hash = res.get("hash")  # 별도 컬럼에 저장
-        nft.extra = extra
+        nft.offer_id = oid
+        nft.offer_amount_drops = int(price_drops)
+        nft.extra = {
+            **(nft.extra or {}),
+            "gift_offer_price_usd": nft.price,
+            "gift_offer_type": "public",  # Public offer anyone can accept
+        }
         db.add(nft)
-        db.commit()
+        await db.commit()
 
         return {
             "offers_created": 1,
@@ -317,8 +331,8 @@ def _sync_xrpl_single_offer(
         }
 
 
-def _sync_xrpl_multi_offer(
-    db: Session,
+async def _xrpl_multi_offer(
+    db: AsyncSession,
     *,
     artwork_id: int,
 ) -> Dict[str, Any]:
@@ -326,24 +340,22 @@ def _sync_xrpl_multi_offer(
     print(f"🚀 MULTI OFFER START: artwork_id={artwork_id}")
     logging.info(f"Starting batch offer creation for artwork_id={artwork_id}")
 
-    client = _xrpl_client()
-    seed = settings.platform_seed
-    if not seed:
-        raise RuntimeError("platform_seed is not configured")
-    wallet = Wallet.from_seed(seed)
+    xrpl = get_xrpl_service()
+    client = xrpl.client
+    wallet = xrpl.wallet
     classic = wallet.classic_address
 
     print(f"💰 PLATFORM WALLET: {classic}")
 
     # 이 작품의 '플랫폼이 보유 중'인 NFT 목록 로드 (오퍼가 없는 것만)
-    rows: List[NFT] = (
-        db.query(NFT)
-        .filter(NFT.artwork_id == artwork_id)
-        .filter(NFT.owner_address == classic)
-        .filter(NFT.nftoken_id.isnot(None))
-        .filter(NFT.status == "minted")  # 아직 오퍼가 없는 것만
-        .all()
+    result = await db.execute(
+        select(NFT)
+        .where(NFT.artwork_id == artwork_id)
+        .where(NFT.owner_address == classic)
+        .where(NFT.nftoken_id.isnot(None))
+        .where(NFT.status == "minted")  # 아직 오퍼가 없는 것만
     )
+    rows: List[NFT] = list(result.scalars().all())
 
     print("📊 MULTI OFFER NFT COUNT: {len(rows)}")
     logging.info(f"Found {len(rows)} NFTs to process for batch offers")
@@ -431,12 +443,8 @@ def _sync_xrpl_multi_offer(
                 print(f"📋 Single TX details: nftoken_id={single_nft_data['nftoken_id']}, price_drops={single_nft_data['price_drops']}")
 
                 # Submit individual transaction
-                print("⚙️ Autofilling single transaction...")
-                tx_autofilled = autofill(single_tx, client)
-                print("✍️ Signing single transaction...")
-                tx_signed = sign(tx_autofilled, wallet)
                 print("📡 Submitting single transaction and waiting...")
-                tx_resp = submit_and_wait(tx_signed, client)
+                tx_resp = await submit_and_wait_locked(client, wallet, single_tx)
 
                 print(f"✅ Single TX response: success={tx_resp.is_successful()}")
                 print(f"📄 FULL SINGLE TX RESPONSE: {tx_resp.result}")
@@ -453,21 +461,22 @@ def _sync_xrpl_multi_offer(
 
                     # Update NFT record
                     nft_record = single_nft_data["nft_record"]
-                    extra = nft_record.extra or {}
-
-                    extra.update({
-                        "gift_offer_id": offer_id,
-                        "gift_offer_amount": single_nft_data["price_drops"],
-                        "gift_offer_price_usd": single_nft_data["price_usd"],
-                        "gift_offer_type": "public",  # Public offer anyone can accept
-                    })
+                    await record_status_change(
+                        db, artwork_id, [nft_record.status], "offered_to_artist", [nft_record.price]
+                    )
                     nft_record.status = "offered_to_artist"
                     nft_record.offer_tx_hash = tx_hash  # 별도 컬럼에 저장
-                    nft_record.extra = extra
+                    nft_record.offer_id = offer_id
+                    nft_record.offer_amount_drops = int(single_nft_data["price_drops"])
+                    nft_record.extra = {
+                        **(nft_record.extra or {}),
+                        "gift_offer_price_usd": single_nft_data["price_usd"],
+                        "gift_offer_type": "public",  # Public offer anyone can accept
+                    }
                     print(nft_record)
                     db.add(nft_record)
                     print("💾 Committing single offer DB update...")
-                    db.commit()
+                    await db.commit()
                     print("✅ Single offer DB update committed!")
 
                     logging.info(f"Single offer successful: offer_id={offer_id}")
@@ -503,12 +512,8 @@ def _sync_xrpl_multi_offer(
                 print(f"📦 Batch TX created: {batch_tx}")
 
                 # Submit batch transaction
-                print("⚙️ Autofilling batch transaction...")
-                batch_autofilled = autofill(batch_tx, client)
-                print("✍️ Signing batch transaction...")
-                batch_signed = sign(batch_autofilled, wallet)
                 print("📡 Submitting batch transaction and waiting...")
-                batch_resp = submit_and_wait(batch_signed, client)
+                batch_resp = await submit_and_wait_locked(client, wallet, batch_tx)
 
                 print(f"✅ Batch response: success={batch_resp.is_successful()}")
                 print(f"📄 FULL BATCH RESPONSE: {batch_resp.result}")
@@ -522,6 +527,13 @@ def _sync_xrpl_multi_offer(
                     # For batch offers, we can't extract individual offer IDs reliably
                     # So we'll store None for offer_id and use batch_hash
                     print(f"💾 Updating {len(chunk_nft_data)} NFT records for batch...")
+                    await record_status_change(
+                        db,
+                        artwork_id,
+                        [nft_info["nft_record"].status for nft_info in chunk_nft_data],
+                        "offered_to_artist",
+                        [nft_info["price_usd"] for nft_info in chunk_nft_data],
+                    )
                     for i, nft_info in enumerate(chunk_nft_data):
                         print(f"  Updating NFT {i+1}/{len(chunk_nft_data)}: id={nft_info['nft_id']}")
                         all_tx_hashes.append(batch_hash)
@@ -530,22 +542,20 @@ def _sync_xrpl_multi_offer(
 
                         # Update NFT record
                         nft_record = nft_info["nft_record"]
-                        extra = nft_record.extra or {}
-                        extra.update({
-                            "gift_offer_id": None,  # Not available in batch response
-                            "gift_offer_amount": nft_info["price_drops"],
-                            "gift_offer_price_usd": nft_info["price_usd"],
-                            "gift_offer_type": "public",  # Public offer anyone can accept
-                            "batch_offer": True,
-                            "batch_chunk": chunk_num,
-                        })
                         nft_record.status = "offered_to_artist"
                         nft_record.offer_tx_hash = batch_hash  # 별도 컬럼에 저장
-                        nft_record.extra = extra
+                        nft_record.offer_id = None  # Not available in batch response
+                        nft_record.offer_amount_drops = int(nft_info["price_drops"])
+                        nft_record.batch_chunk = chunk_num
+                        nft_record.extra = {
+                            **(nft_record.extra or {}),
+                            "gift_offer_price_usd": nft_info["price_usd"],
+                            "gift_offer_type": "public",  # Public offer anyone can accept
+                        }
                         db.add(nft_record)
 
                     print("💾 Committing batch offer DB updates...")
-                    db.commit()
+                    await db.commit()
                     print("✅ Batch offer DB updates committed!")
                     logging.info(f"Successfully processed offer batch chunk {chunk_num}")
                 else:
@@ -596,8 +606,8 @@ def _sync_xrpl_multi_offer(
     return final_result
 
 
-def _sync_xrpl_batch_offer(
-    db: Session,
+async def _xrpl_batch_offer(
+    db: AsyncSession,
     *,
     artwork_id: int,
     artist_address: str,
@@ -607,35 +617,27 @@ def _sync_xrpl_batch_offer(
     logging.info(f"Starting offer creation routing for artwork_id={artwork_id}")
 
     # NFT 개수 확인
-    seed = settings.platform_seed
-    if not seed:
-        raise RuntimeError("platform_seed is not configured")
-    wallet = Wallet.from_seed(seed)
+    wallet = get_xrpl_service().wallet
     classic = wallet.classic_address
 
     print(f"💰 PLATFORM WALLET: {classic}")
 
-    nft_count = (
-        db.query(NFT)
-        .filter(NFT.artwork_id == artwork_id)
-        .filter(NFT.owner_address == classic)
-        .filter(NFT.nftoken_id.isnot(None))
-        .filter(NFT.status.in_(["minted", "offered_to_artist"]))
-        .count()
+    offerable = (
+        select(NFT)
+        .where(NFT.artwork_id == artwork_id)
+        .where(NFT.owner_address == classic)
+        .where(NFT.nftoken_id.isnot(None))
+        .where(NFT.status.in_(["minted", "offered_to_artist"]))
+    )
+    nft_count = await db.scalar(
+        select(func.count()).select_from(offerable.subquery())
     )
 
     print(f"📊 NFT COUNT: {nft_count}")
     logging.info(f"Found {nft_count} NFTs for offer creation")
 
     # Debug: Show all NFTs found
-    nfts_debug = (
-        db.query(NFT)
-        .filter(NFT.artwork_id == artwork_id)
-        .filter(NFT.owner_address == classic)
-        .filter(NFT.nftoken_id.isnot(None))
-        .filter(NFT.status.in_(["minted", "offered_to_artist"]))
-        .all()
-    )
+    nfts_debug = (await db.execute(offerable)).scalars().all()
 
     print(f"🔍 NFTS FOUND: {len(nfts_debug)}")
     for i, nft in enumerate(nfts_debug):
@@ -656,17 +658,16 @@ def _sync_xrpl_batch_offer(
     elif nft_count == 1:
         print("➡️ ROUTING TO SINGLE NFT OFFER")
         logging.info("Routing to single NFT offer")
-        result = _sync_xrpl_single_offer(
+        result = await _xrpl_single_offer(
             db=db,
             artwork_id=artwork_id,
-            artist_address=artist_address,
         )
         print(f"✅ SINGLE OFFER RESULT: {result}")
         return result
     else:
         print(f"➡️ ROUTING TO MULTI NFT OFFER ({nft_count} NFTs)")
         logging.info(f"Routing to multi NFT offer for {nft_count} NFTs")
-        result = _sync_xrpl_multi_offer(
+        result = await _xrpl_multi_offer(
             db=db,
             artwork_id=artwork_id,
         )
@@ -675,7 +676,7 @@ def _sync_xrpl_batch_offer(
 
 
 async def register_to_ipfs_and_mint(
-    db: Session,
+    db: AsyncSession,
     *,
     # 업로드/메타데이터 입력
     image_bytes: bytes,
@@ -696,10 +697,11 @@ async def register_to_ipfs_and_mint(
     """
     1) 이미지 Pinata 업로드
     2) meta.json 생성 후 Pinata 업로드
+    2-1) 이미지를 grid_n x grid_n 타일로 분할 (프로세스 풀) 후 타일/조각 메타데이터 업로드
     3) Artwork 저장
-    4) XRPL TicketCreate + 배치 민팅 (스레드에서 실행)
+    4) XRPL TicketCreate + 배치 민팅 (비동기 XRPL 클라이언트)
     5) 각 NFT를 DB에 저장
-    6) 모든 민팅이 끝나면 한꺼번에 오퍼 생성 (스레드)
+    6) 모든 민팅이 끝나면 한꺼번에 오퍼 생성
     """
     # 1) 이미지 업로드
     img_res = await pin_file_to_ipfs(
@@ -730,8 +732,27 @@ async def register_to_ipfs_and_mint(
     metadata_uri_base = f"ipfs://{metadata_cid}/meta.json"
     metadata_http_url = f"{settings.pinata_gateway}/{metadata_cid}/meta.json"
 
-    # 3) Artwork 저장
+    # 2-1) 조각 타일 렌더링 & 업로드 (1x1 은 원본 그대로 사용)
     grid_total = grid_n * grid_n
+    tile_uris: List[str] = []
+    piece_uris: List[str] = []
+    if grid_n > 1:
+        tiles = await render_tiles(image_bytes, grid_n)
+        pinned = await pin_tiles_with_metadata(
+            tiles,
+            title=title,
+            description=description,
+            attributes=attributes,
+            parent_uri=metadata_uri_base,
+            grid_n=grid_n,
+        )
+        tile_uris = pinned["tile_uris"]
+        piece_uris = pinned["piece_uris"]
+
+    # 이미 민팅된 URI면 Artwork를 만들기 전에 거절
+    await _assert_uris_not_minted(db, _part_uris(metadata_uri_base, grid_total, piece_uris))
+
+    # 3) Artwork 저장
     artwork = Artwork(
         title=title,
         description=description,
@@ -743,39 +764,33 @@ async def register_to_ipfs_and_mint(
         artist_address=artist_address,
     )
     db.add(artwork)
-    db.commit()
-    db.refresh(artwork)
+    await db.flush()
+    init_stats(db, artwork.id, grid_total)
+    await db.commit()
 
     # nft 조각 가격
     nft_price_usd = price_usd // grid_total
 
-    # 4) XRPL 배치 민팅 (스레드에서 실행)
-    loop = asyncio.get_event_loop()
-    with ThreadPoolExecutor() as executor:
-        mint_result = await loop.run_in_executor(
-            executor,
-            _sync_xrpl_batch_mint,
-            db,
-            artwork.id,
-            metadata_uri_base,
-            grid_total,
-            flags,
-            transfer_fee,
-            taxon,
-            nft_price_usd
-        )
+    # 4) XRPL 배치 민팅
+    mint_result = await _xrpl_batch_mint(
+        db,
+        artwork.id,
+        metadata_uri_base,
+        grid_total,
+        flags,
+        transfer_fee,
+        taxon,
+        nft_price_usd,
+        piece_uris,
+        tile_uris,
+    )
 
-    # 4) (신규) 모든 민팅이 끝나면 한꺼번에 오퍼 생성 (스레드)
-    with ThreadPoolExecutor() as executor:
-        offer_result = await loop.run_in_executor(
-            executor,
-            partial(
-                _sync_xrpl_batch_offer,
-                db,
-                artwork_id=artwork.id,
-                artist_address=artist_address,
-            ),
-        )
+    # 4) (신규) 모든 민팅이 끝나면 한꺼번에 오퍼 생성
+    offer_result = await _xrpl_batch_offer(
+        db,
+        artwork_id=artwork.id,
+        artist_address=artist_address,
+    )
 
     status = (
         "ok"
@@ -783,6 +798,12 @@ async def register_to_ipfs_and_mint(
         else ("partial" if mint_result["minted"] > 0 else "failed")
     )
 
+    # 작품 목록/상세 캐시 무효화 (조각 상태·카운터 변경)
+    await response_cache.invalidate_tags("artworks", f"artwork:{artwork.id}")
+
+    # 목록 화면용 썸네일 미리 생성 (백그라운드)
+    schedule_pregenerate(image_uri, image_bytes)
+
     return {
         "artwork_id": artwork.id,
         "artist_address": artist_address,
@@ -791,6 +812,8 @@ async def register_to_ipfs_and_mint(
         "metadata_cid": metadata_cid,
         "metadata_uri_base": metadata_uri_base,
         "metadata_http_url": metadata_http_url,
+        "tile_image_uris": tile_uris,
+        "piece_metadata_uris": piece_uris,
         "minted": mint_result["minted"],
         "failed": mint_result["failed"],
         "tx_hashes": mint_result["tx_hashes"],
@@ -806,10 +829,10 @@ async def register_to_ipfs_and_mint(
     }
 
 
-def verify_tx(tx_hash: str) -> Dict[str, Any]:
+async def verify_tx(tx_hash: str) -> Dict[str, Any]:
     """간단한 트랜잭션 검증 여부 확인 (검증 원하면 확장 가능)."""
-    client = _xrpl_client()
-    resp = client.request(Tx(transaction=tx_hash))
+    client = get_xrpl_service().client
+    resp = await client.request(Tx(transaction=tx_hash))
     r = resp.result
     validated = bool(r.get("validated"))
     return {"validated": validated, "tx_json": r if validated else None}
@@ -0,0 +1,84 @@
+from typing import Optional, Sequence
+
+from sqlalchemy import case, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domains.nfts.models import NFT, ArtworkStats
+
+OFFERED = "offered_to_artist"
+SOLD = "sold"
+
+
+def init_stats(db: AsyncSession, artwork_id: int, grid_total: int) -> None:
+    """Create the zeroed counter row alongside a new artwork"""
+    db.add(ArtworkStats(artwork_id=artwork_id, grid_total=grid_total))
+
+
+async def record_status_change(
+    db: AsyncSession,
+    artwork_id: int,
+    old_statuses: Sequence[Optional[str]],
+    new_status: str,
+    prices: Sequence[int] = (),
+) -> None:
+    """
+    Apply artwork_stats deltas for pieces moving from ``old_statuses`` to ``new_status``.
+
+    Use ``None`` as the old status of a freshly minted piece. Call this before
+    the commit that persists the NFT changes so counters and rows land in the
+    same transaction; counters are incremented in SQL, so concurrent writers
+    don't lose updates. When re-offering listed pieces, set their new prices
+    on the rows first: the minimum is then recomputed from the table.
+    """
+    minted = offered = sold = 0
+    repriced = False
+    for old in old_statuses:
+        if old == new_status:
+            # Only the price of an already listed piece can change
+            repriced = repriced or new_status == OFFERED
+            continue
+        if old is None:
+            minted += 1
+        if old == OFFERED:
+            offered -= 1
+        if old == SOLD:
+            sold -= 1
+        if new_status == OFFERED:
+            offered += 1
+        if new_status == SOLD:
+            sold += 1
+    if not (minted or offered or sold or repriced):
+        return
+
+    values = {
+        "minted": ArtworkStats.minted + minted,
+        "offered": ArtworkStats.offered + offered,
+        "sold": ArtworkStats.sold + sold,
+        "remaining": ArtworkStats.remaining + minted - sold,
+        "updated_at": func.now(),
+    }
+    current = ArtworkStats.min_listed_price
+    if offered < 0 or repriced:
+        # A listing went away or changed price; the new minimum has to come
+        # from the offers in the table
+        await db.flush()
+        current = (
+            select(func.min(NFT.price))
+            .where(NFT.artwork_id == artwork_id)
+            .where(NFT.status == OFFERED)
+            .scalar_subquery()
+        )
+        values["min_listed_price"] = current
+    if offered > 0 and prices:
+        lowest = min(prices)
+        values["min_listed_price"] = case(
+            (or_(current.is_(None), current > lowest), lowest),
+            else_=current,
+        )
+
+    await db.execute(
+        update(ArtworkStats)
+        .where(ArtworkStats.artwork_id == artwork_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,36 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.domains.search import schemas
+from app.domains.search.service import SearchService
+from app.shared.cache import response_cache
+from app.shared.database.connection import get_db
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("/", response_model=schemas.SearchResponse)
+async def search(
+    request: Request,
+    q: str = Query(..., min_length=2, max_length=200, description="Search text; typos in names are tolerated"),
+    kind: Optional[schemas.SearchKind] = Query(None, description="Only return this kind of hit"),
+    offset: int = Query(0, ge=0, le=settings.search_max_offset),
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Search artworks (title, description), artists (name) and galleries (name, description)
+
+    Results are ranked by full-text relevance plus name similarity, best first.
+    """
+    cached = await response_cache.lookup(request)
+    if cached:
+        return cached
+    service = SearchService(db)
+    results = await service.search(q.strip(), kind, offset, limit)
+    return await response_cache.store(
+        request, schemas.SearchResponse, results, tags=["artworks", "artists", "galleries"]
+    )
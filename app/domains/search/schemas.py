@@ -0,0 +1,24 @@
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+SearchKind = Literal["artwork", "artist", "gallery"]
+
+
+class SearchHit(BaseModel):
+    kind: SearchKind = Field(..., description="What the hit is: artwork, artist or gallery")
+    id: int
+    title: str = Field(..., description="Artwork title, or artist/gallery name")
+    subtitle: Optional[str] = Field(None, description="Start of the description, if any")
+    image_url: Optional[str] = None
+    wallet_address: Optional[str] = Field(
+        None, description="Artist address for artworks, own address for artists/galleries"
+    )
+    score: float = Field(..., description="Relevance (text rank + name similarity)")
+
+
+class SearchResponse(BaseModel):
+    items: List[SearchHit]
+    next_offset: Optional[int] = Field(
+        None, description="Offset of the next page (null on the last page)"
+    )
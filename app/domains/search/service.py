@@ -0,0 +1,90 @@
+from typing import Optional
+
+from sqlalchemy import String, cast, func, literal, literal_column, null, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domains.artist.models import Artist
+from app.domains.gallery.models import Gallery
+from app.domains.nfts.models import Artwork
+
+# Must match the text search configuration of the search_vector triggers (alembic 0006)
+TS_CONFIG = literal_column("'simple'::regconfig")
+SUBTITLE_LENGTH = 200
+
+
+def _branch(kind: str, model, title, subtitle, image_url, wallet_address, q: str, depth: int):
+    """
+    One entity's hits: full-text match on search_vector, or a trigram match on
+    the name/title for typos. Both predicates are served by GIN indexes.
+    """
+    query = func.websearch_to_tsquery(TS_CONFIG, q)
+    score = func.ts_rank_cd(model.search_vector, query) + func.similarity(title, q)
+    return (
+        select(
+            literal(kind).label("kind"),
+            model.id.label("id"),
+            title.label("title"),
+            subtitle.label("subtitle"),
+            image_url.label("image_url"),
+            wallet_address.label("wallet_address"),
+            score.label("score"),
+        )
+        .where(or_(model.search_vector.op("@@")(query), title.op("%")(q)))
+        # No branch can contribute more than the page reaches into
+        .order_by(score.desc(), model.id)
+        .limit(depth)
+    )
+
+
+class SearchService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def search(self, q: str, kind: Optional[str], offset: int, limit: int) -> dict:
+        """Ranked hits across artworks, artists and galleries (offset-paginated)"""
+        depth = offset + limit + 1
+        branches = {
+            "artwork": lambda: _branch(
+                "artwork",
+                Artwork,
+                Artwork.title,
+                func.left(Artwork.description, SUBTITLE_LENGTH),
+                Artwork.image_url,
+                Artwork.artist_address,
+                q,
+                depth,
+            ),
+            "artist": lambda: _branch(
+                "artist",
+                Artist,
+                Artist.name,
+                cast(null(), String),
+                Artist.profile_image_url,
+                Artist.wallet_address,
+                q,
+                depth,
+            ),
+            "gallery": lambda: _branch(
+                "gallery",
+                Gallery,
+                Gallery.name,
+                func.left(Gallery.description, SUBTITLE_LENGTH),
+                Gallery.profile_image_url,
+                Gallery.wallet_address,
+                q,
+                depth,
+            ),
+        }
+        selected = [build() for name, build in branches.items() if kind in (None, name)]
+        hits = union_all(*(branch.subquery().select() for branch in selected)).subquery("hits")
+
+        result = await self.db.execute(
+            select(hits)
+            .order_by(hits.c.score.desc(), hits.c.kind, hits.c.id)
+            .offset(offset)
+            .limit(limit + 1)
+        )
+        rows = result.all()
+        items = [dict(row._mapping) for row in rows[:limit]]
+        next_offset = offset + limit if len(rows) > limit else None
+        return {"items": items, "next_offset": next_offset}
@@ -1,19 +1,44 @@
-from fastapi import Depends, FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 
-# Import models for table creation
+# Import models so every mapper is configured before the first request
 from app.core import models  # noqa: F401
 from app.core.config import settings
 from app.domains.artist.router import router as artist_router
 from app.domains.artwork.router import router as artwork_router
 from app.domains.auth.router import router as auth_router
+from app.domains.exports.router import router as exports_router
 from app.domains.gallery.router import router as gallery_router
+from app.domains.media.router import router as media_router
 from app.domains.nfts.router import router as nfts_router
-from app.shared.database.connection import Base, engine, get_db
+from app.domains.search.router import router as search_router
+from app.shared.database.connection import engine, export_engine, get_db, lock_engine
+from app.shared.invalidation import invalidation_bus
+from app.shared.ipfs import close_ipfs_client
+from app.shared.metrics import CONTENT_TYPE_LATEST, generate_latest
+from app.shared.outbox import outbox_worker
+from app.shared.process_pool import shutdown_process_pool
+from app.shared.xrpl import get_xrpl_service
+
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    # Schema is managed by Alembic (`alembic upgrade head`)
+    get_xrpl_service().warm_up()
+    invalidation_bus.start()
+    outbox_worker.start()
+    yield
+    await outbox_worker.stop()
+    await invalidation_bus.stop()
+    await close_ipfs_client()
+    shutdown_process_pool()
+    await export_engine.dispose()
+    await lock_engine.dispose()
+    await engine.dispose()
 
 
 def create_app() -> FastAPI:
@@ -21,6 +46,7 @@ def create_app() -> FastAPI:
         title=settings.app_name,
         description=settings.app_description,
         version=settings.app_version,
+        lifespan=lifespan,
     )
 
     # Add CORS middleware
@@ -42,16 +68,19 @@ def create_app() -> FastAPI:
     application.include_router(artwork_router, prefix="/api/v1")
     application.include_router(gallery_router, prefix="/api/v1")
     application.include_router(nfts_router, prefix="/api/v1")
+    application.include_router(media_router, prefix="/api/v1")
+    application.include_router(search_router, prefix="/api/v1")
+    application.include_router(exports_router, prefix="/api/v1")
 
     @application.get("/")
     async def root() -> dict[str, str]:
         return {"message": "Welcome to Roasis"}
 
     @application.get("/health")
-    async def health_check(db: Session = Depends(get_db)) -> dict[str, str]:
+    async def health_check(db: AsyncSession = Depends(get_db)) -> dict[str, str]:
         try:
             # Test database connection
-            db.execute("SELECT 1")
+            await db.execute(text("SELECT 1"))
             return {
                 "status": "healthy",
                 "database": "connected",
@@ -63,6 +92,10 @@ def create_app() -> FastAPI:
                 "error": str(e),
             }
 
+    @application.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
     return application
 
 
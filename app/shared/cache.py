@@ -0,0 +1,227 @@
+import gzip
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+from app.shared.invalidation import ALL, invalidation_bus
+
+# Clients always revalidate, which is cheap thanks to the ETag
+CACHE_CONTROL = "public, no-cache"
+
+
+@dataclass
+class CachedBody:
+    """A serialized response body, stored once and served to every client"""
+    body: bytes
+    gzipped: Optional[bytes]
+    etag: str
+    media_type: str = "application/json"
+
+
+class CacheBackend(ABC):
+    """
+    Storage for cached bodies.
+
+    The in-process MemoryBackend is the default; a shared store (e.g. Redis)
+    can be plugged in by implementing these methods.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[CachedBody]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: CachedBody, ttl: float, tags: Iterable[str]) -> None:
+        ...
+
+    @abstractmethod
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        ...
+
+    @abstractmethod
+    async def clear(self) -> None:
+        ...
+
+
+class MemoryBackend(CacheBackend):
+    """Bounded LRU with per-entry TTL and a tag -> keys index"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, CachedBody, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    async def get(self, key: str) -> Optional[CachedBody]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    async def set(self, key: str, value: CachedBody, ttl: float, tags: Iterable[str]) -> None:
+        self._drop(key)
+        tags = tuple(tags)
+        self._entries[key] = (time.monotonic() + ttl, value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            for key in list(self._tags.get(tag, ())):
+                self._drop(key)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+
+
+class TTLCache:
+    """Small in-process LRU with per-entry expiry, for hot lookups"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Any) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: Any) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class ResponseCache:
+    """
+    Cache for public GET responses, keyed by path and query parameters.
+
+    Routes call ``lookup`` first and ``store`` on a miss; write paths call
+    ``invalidate_tags`` after they commit.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self._adapters: Dict[Any, TypeAdapter] = {}
+        # Bumped on every invalidation so a response built from data read
+        # before a concurrent write is not cached after that write
+        self._generation = 0
+
+    @staticmethod
+    def key_for(request: Request) -> str:
+        query = urlencode(sorted(request.query_params.multi_items()))
+        return f"{request.url.path}?{query}"
+
+    def _adapter(self, response_model: Any) -> TypeAdapter:
+        adapter = self._adapters.get(response_model)
+        if adapter is None:
+            adapter = self._adapters[response_model] = TypeAdapter(response_model)
+        return adapter
+
+    @staticmethod
+    def _respond(request: Request, entry: CachedBody, hit: bool) -> Response:
+        headers = {
+            "ETag": entry.etag,
+            "Cache-Control": CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+            "X-Cache": "HIT" if hit else "MISS",
+        }
+        if_none_match = request.headers.get("if-none-match", "")
+        if entry.etag in (tag.strip() for tag in if_none_match.split(",")):
+            return Response(status_code=304, headers=headers)
+
+        accepts_gzip = "gzip" in request.headers.get("accept-encoding", "").lower()
+        if entry.gzipped is not None and accepts_gzip:
+            headers["Content-Encoding"] = "gzip"
+            return Response(content=entry.gzipped, media_type=entry.media_type, headers=headers)
+        return Response(content=entry.body, media_type=entry.media_type, headers=headers)
+
+    async def lookup(self, request: Request) -> Optional[Response]:
+        if not self.enabled:
+            return None
+        request.state.cache_generation = self._generation
+        entry = await self.backend.get(self.key_for(request))
+        if entry is None:
+            return None
+        return self._respond(request, entry, hit=True)
+
+    async def store(
+        self, request: Request, response_model: Any, content: Any, tags: Iterable[str]
+    ) -> Response:
+        """Serialize ``content`` as ``response_model``, cache it and return the response"""
+        adapter = self._adapter(response_model)
+        body = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+        gzipped = None
+        if len(body) >= settings.response_cache_gzip_min_bytes:
+            gzipped = gzip.compress(body, compresslevel=6)
+        entry = CachedBody(
+            body=body,
+            gzipped=gzipped,
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        )
+        if self.enabled and getattr(request.state, "cache_generation", None) == self._generation:
+            await self.backend.set(self.key_for(request), entry, self.ttl, tags)
+        return self._respond(request, entry, hit=False)
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        """Evict tagged entries here and on every other replica"""
+        await invalidation_bus.publish("response", *tags)
+
+    async def evict(self, tags: List[str]) -> None:
+        """Invalidation bus handler"""
+        self._generation += 1
+        if ALL in tags:
+            await self.backend.clear()
+        else:
+            await self.backend.invalidate_tags(tags)
+
+
+response_cache = ResponseCache(
+    MemoryBackend(settings.response_cache_max_entries),
+    ttl=settings.response_cache_ttl,
+    enabled=settings.response_cache_enabled,
+)
+invalidation_bus.subscribe("response", response_cache.evict)
@@ -0,0 +1,52 @@
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.shared.metrics import (
+    DB_POOL_CHECKOUT_TIMEOUTS,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_IDLE,
+    DB_POOL_IN_USE,
+    DB_POOL_OVERFLOW_EVENTS,
+    DB_POOL_SIZE,
+)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+def instrument_pool(engine: AsyncEngine) -> None:
+    """Publish pool occupancy gauges and overflow events for ``engine``"""
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        pool = engine.sync_engine.pool
+        if isinstance(pool, AsyncAdaptedQueuePool) and pool.overflow() > 0:
+            DB_POOL_OVERFLOW_EVENTS.inc()
+
+    # Gauges read the live pool at scrape time (engine.pool changes on dispose)
+    def pool_stat(name: str):
+        def read() -> int:
+            pool = engine.sync_engine.pool
+            if isinstance(pool, AsyncAdaptedQueuePool):
+                return getattr(pool, name)()
+            return 0
+
+        return read
+
+    DB_POOL_IN_USE.set_function(pool_stat("checkedout"))
+    DB_POOL_IDLE.set_function(pool_stat("checkedin"))
+    DB_POOL_SIZE.set_function(pool_stat("size"))
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+
+class DiskLRUCache:
+    """
+    Size-bounded on-disk cache with least-recently-used eviction.
+
+    Keys are flat file names. The LRU index lives in memory and is rebuilt from
+    file mtimes on startup, so the cache survives restarts.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self) -> None:
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.startswith(".tmp"):
+                st = entry.stat()
+                entries.append((st.st_mtime, entry.name, st.st_size))
+        for _, name, size in sorted(entries):
+            self._index[name] = size
+            self._total += size
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / key
+
+    def get(self, key: str) -> Optional[Path]:
+        with self._lock:
+            if key not in self._index:
+                return None
+            self._index.move_to_end(key)
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._total -= self._index.pop(key, 0)
+            return None
+        return path
+
+    def put(self, key: str, data: bytes) -> Path:
+        path = self.path_for(key)
+        # Write to a temp file and rename so readers never see partial files
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+        with self._lock:
+            self._total -= self._index.pop(key, 0)
+            self._index[key] = len(data)
+            self._total += len(data)
+            evicted = self._evict()
+        for name in evicted:
+            try:
+                os.remove(self.path_for(name))
+            except FileNotFoundError:
+                pass
+        return path
+
+    def _evict(self) -> list[str]:
+        evicted = []
+        while self._total > self.max_bytes and len(self._index) > 1:
+            name, size = self._index.popitem(last=False)
+            self._total -= size
+            evicted.append(name)
+        return evicted
+
+    @property
+    def size_bytes(self) -> int:
+        return self._total
@@ -0,0 +1,25 @@
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+# Pillow save options per derivative format
+FORMAT_OPTIONS = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 4},
+    "avif": {"format": "AVIF", "quality": 60},
+}
+
+
+def render_derivative(image_bytes: bytes, size: int, fmt: str) -> bytes:
+    """
+    Process pool worker: resize an image so its longest side is ``size`` pixels.
+
+    Images smaller than ``size`` are re-encoded but never upscaled.
+    """
+    with Image.open(BytesIO(image_bytes)) as img:
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail((size, size), Image.Resampling.LANCZOS)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+        buf = BytesIO()
+        img.save(buf, **FORMAT_OPTIONS[fmt])
+        return buf.getvalue()
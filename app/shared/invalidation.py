@@ -0,0 +1,131 @@
+import asyncio
+import json
+import logging
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+import psycopg
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.shared.database.connection import engine, psycopg_url
+
+logger = logging.getLogger(__name__)
+
+# Handlers receive the invalidated keys; ALL means "drop everything"
+# (sent after the listener reconnects, since notifications may have been missed)
+ALL = "*"
+Handler = Callable[[List[str]], Awaitable[None]]
+
+# NOTIFY payloads are limited to 8000 bytes
+_MAX_PAYLOAD = 7500
+
+
+class InvalidationBus:
+    """
+    Keeps per-process caches coherent across replicas.
+
+    Writers call ``publish`` after committing: local subscribers are evicted
+    immediately and the keys are broadcast with NOTIFY. Every process runs
+    ``run`` (a LISTEN loop) and evicts matching entries published elsewhere.
+    """
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        # Identifies this process so it can skip its own notifications
+        self.origin = uuid.uuid4().hex
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return engine.dialect.name == "postgresql"
+
+    def subscribe(self, namespace: str, handler: Handler) -> None:
+        self._handlers.setdefault(namespace, []).append(handler)
+
+    async def _dispatch(self, namespace: str, keys: List[str]) -> None:
+        for handler in self._handlers.get(namespace, ()):
+            try:
+                await handler(keys)
+            except Exception:
+                logger.exception(f"Invalidation handler failed for {namespace}")
+
+    def _payloads(self, namespace: str, keys: Sequence[str]) -> List[str]:
+        payloads: List[str] = []
+        batch: List[str] = []
+        for key in keys:
+            candidate = json.dumps({"o": self.origin, "n": namespace, "k": batch + [key]})
+            if batch and len(candidate) > _MAX_PAYLOAD:
+                payloads.append(json.dumps({"o": self.origin, "n": namespace, "k": batch}))
+                batch = []
+            batch.append(key)
+        if batch:
+            payloads.append(json.dumps({"o": self.origin, "n": namespace, "k": batch}))
+        return payloads
+
+    async def publish(self, namespace: str, *keys: str) -> None:
+        if not keys:
+            return
+        await self._dispatch(namespace, list(keys))
+        if not self.enabled:
+            return
+        try:
+            async with engine.begin() as conn:
+                for payload in self._payloads(namespace, keys):
+                    await conn.execute(select(func.pg_notify(self.channel, payload)))
+        except Exception as e:
+            # Local entries are already gone; other replicas fall back to their TTLs
+            logger.warning(f"Failed to broadcast invalidation for {namespace}: {e}")
+
+    async def _handle(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed invalidation payload: {payload[:200]}")
+            return
+        if message.get("o") == self.origin:
+            return
+        await self._dispatch(message.get("n", ""), list(message.get("k", [])))
+
+    async def run(self) -> None:
+        """LISTEN on a dedicated connection, reconnecting with backoff"""
+        conninfo = psycopg_url(settings.database_url).set(drivername="postgresql")
+        conninfo = conninfo.render_as_string(hide_password=False)
+        delay = 1.0
+        connected_before = False
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(conninfo, autocommit=True) as conn:
+                    await conn.execute(f'LISTEN "{self.channel}"')
+                    if connected_before:
+                        # Anything published while we were disconnected was lost
+                        for namespace in list(self._handlers):
+                            await self._dispatch(namespace, [ALL])
+                    connected_before = True
+                    delay = 1.0
+                    logger.info(f"Listening for cache invalidations on {self.channel}")
+                    async for notify in conn.notifies():
+                        await self._handle(notify.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Invalidation listener disconnected: {e}; retrying in {delay:.0f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, settings.invalidation_reconnect_max_delay)
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+invalidation_bus = InvalidationBus(settings.invalidation_channel)
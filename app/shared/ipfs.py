@@ -0,0 +1,209 @@
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote
+
+import httpx
+
+from app.core.config import settings
+from app.shared.disk_cache import DiskLRUCache
+from app.shared.ipld import CID, IPLDError, parse_cid, verified_file
+
+logger = logging.getLogger(__name__)
+
+
+class IPFSFetchError(Exception):
+    pass
+
+
+class _MemoryLRU:
+    """Byte-bounded in-memory LRU for small, hot IPFS objects (metadata JSON)"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[str, bytes]" = OrderedDict()
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._total -= len(old)
+            self._items[key] = data
+            self._total += len(data)
+            while self._total > self.max_bytes and len(self._items) > 1:
+                _, evicted = self._items.popitem(last=False)
+                self._total -= len(evicted)
+
+
+_memory = _MemoryLRU(settings.ipfs_memory_cache_max_bytes)
+_disk: Optional[DiskLRUCache] = None
+_client: Optional[httpx.AsyncClient] = None
+_inflight: Dict[str, "asyncio.Future[bytes]"] = {}
+
+
+def _get_disk() -> DiskLRUCache:
+    global _disk
+    if _disk is None:
+        _disk = DiskLRUCache(settings.ipfs_cache_dir, settings.ipfs_cache_max_bytes)
+    return _disk
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=settings.ipfs_gateway_timeout, follow_redirects=True
+        )
+    return _client
+
+
+async def close_ipfs_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def parse_ipfs_uri(uri: str) -> Tuple[str, str]:
+    """Split ipfs://<cid>/<path> into (cid, path)"""
+    if not uri.startswith("ipfs://"):
+        raise ValueError(f"Not an ipfs:// URI: {uri}")
+    cid, _, path = uri[len("ipfs://"):].partition("/")
+    return cid, path
+
+
+def check_ipfs_ref(cid: str, path: str = "") -> CID:
+    """Validate a CID and path before they reach a gateway URL; raises ValueError"""
+    root = parse_cid(cid)
+    if path and any(part in ("", ".", "..") for part in path.split("/")):
+        raise ValueError(f"Invalid IPFS path: {path!r}")
+    return root
+
+
+def _cache_key(cid: str, path: str) -> str:
+    if not path:
+        return cid
+    # Paths may contain characters that aren't valid in file names
+    return f"{cid}_{hashlib.sha256(path.encode('utf-8')).hexdigest()[:16]}"
+
+
+async def _fetch_from_gateway(
+    gateway: str, root: CID, cid: str, path: str, delay: float
+) -> bytes:
+    if delay:
+        await asyncio.sleep(delay)
+    # Ask for a CAR (trustless gateway response) so every block can be checked
+    # against its hash; a gateway that can't serve one is treated as failed
+    url = f"{gateway.rstrip('/')}/{cid}" + (f"/{quote(path)}" if path else "")
+    limit = settings.ipfs_max_object_bytes
+    async with _get_client().stream(
+        "GET",
+        url,
+        params={"format": "car"},
+        headers={"Accept": "application/vnd.ipld.car"},
+    ) as resp:
+        resp.raise_for_status()
+        if int(resp.headers.get("content-length") or 0) > limit:
+            raise IPFSFetchError(f"Response from {gateway} exceeds {limit} bytes")
+        chunks = []
+        size = 0
+        async for chunk in resp.aiter_bytes():
+            size += len(chunk)
+            if size > limit:
+                raise IPFSFetchError(f"Response from {gateway} exceeds {limit} bytes")
+            chunks.append(chunk)
+    try:
+        data = await asyncio.to_thread(verified_file, root, path, b"".join(chunks), limit)
+    except IPLDError as e:
+        raise IPFSFetchError(f"Unverifiable response from {gateway}: {e}")
+    return data
+
+
+async def _race_gateways(root: CID, cid: str, path: str) -> bytes:
+    """Query every configured gateway and keep the first verified response"""
+    gateways = settings.ipfs_gateways or [settings.pinata_gateway]
+    tasks = [
+        asyncio.ensure_future(
+            _fetch_from_gateway(gw, root, cid, path, i * settings.ipfs_gateway_hedge_delay)
+        )
+        for i, gw in enumerate(gateways)
+    ]
+    errors = []
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                return await next_done
+            except Exception as e:
+                errors.append(str(e))
+    finally:
+        for task in tasks:
+            task.cancel()
+    raise IPFSFetchError(f"All gateways failed for {cid}/{path}: {errors}")
+
+
+async def _load(key: str, root: CID, cid: str, path: str) -> bytes:
+    disk = _get_disk()
+    cached_path = disk.get(key)
+    if cached_path is not None:
+        data = await asyncio.to_thread(cached_path.read_bytes)
+    else:
+        data = await _race_gateways(root, cid, path)
+        await asyncio.to_thread(disk.put, key, data)
+    if len(data) <= settings.ipfs_memory_item_max_bytes:
+        _memory.put(key, data)
+    return data
+
+
+async def fetch_ipfs(cid: str, path: str = "") -> bytes:
+    """
+    Read-through fetch of IPFS content.
+
+    CIDs are content-addressed, so cached entries never need revalidation:
+    memory -> disk -> first gateway response that verifies against the CID.
+    Raises ValueError for an invalid CID or path.
+    """
+    root = check_ipfs_ref(cid, path)
+    key = _cache_key(cid, path)
+    data = _memory.get(key)
+    if data is not None:
+        return data
+
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(_load(key, root, cid, path))
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(future)
+
+
+async def fetch_ipfs_uri(uri: str) -> bytes:
+    cid, path = parse_ipfs_uri(uri)
+    return await fetch_ipfs(cid, path)
+
+
+def sniff_content_type(data: bytes) -> str:
+    if data.startswith(b"\x89PNG"):
+        return "image/png"
+    if data.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if data.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if data[4:12] in (b"ftypavif", b"ftypavis"):
+        return "image/avif"
+    if data.lstrip()[:1] in (b"{", b"["):
+        return "application/json"
+    return "application/octet-stream"
@@ -0,0 +1,228 @@
+"""
+Just enough IPLD to verify gateway responses without trusting the gateway.
+
+Supports what our uploads produce: CIDv0 / CIDv1 (dag-pb or raw codec,
+sha2-256 or identity multihash), CARv1 streams and UnixFS files and plain
+directories. Anything else (HAMT-sharded directories, other hashes) is
+rejected rather than served unverified.
+"""
+import base64
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+DAG_PB = 0x70
+RAW = 0x55
+SHA2_256 = 0x12
+IDENTITY = 0x00
+
+# UnixFS Data.Type
+_UNIXFS_RAW = 0
+_UNIXFS_DIRECTORY = 1
+_UNIXFS_FILE = 2
+
+# CIDv0 (base58btc "Qm...") or CIDv1 in base32 ("b..."), the two forms gateways and Pinata use
+CID_RE = re.compile(r"^(Qm[1-9A-HJ-NP-Za-km-z]{44}|b[a-z2-7]{20,})$")
+
+_B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_B58_INDEX = {c: i for i, c in enumerate(_B58_ALPHABET)}
+
+# {"version": 2} in dag-cbor: the CARv2 pragma, read as a CARv1 header
+_CARV2_PRAGMA = bytes.fromhex("a16776657273696f6e02")
+
+
+class IPLDError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class CID:
+    version: int
+    codec: int
+    hash_code: int
+    digest: bytes
+
+    def verify(self, data: bytes) -> bool:
+        if self.hash_code == SHA2_256:
+            return hashlib.sha256(data).digest() == self.digest
+        if self.hash_code == IDENTITY:
+            return data == self.digest
+        return False
+
+
+def _varint(buf: bytes, pos: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        if pos >= len(buf) or shift > 63:
+            raise IPLDError("Truncated varint")
+        byte = buf[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+def _b58decode(text: str) -> bytes:
+    num = 0
+    for char in text:
+        num = num * 58 + _B58_INDEX[char]
+    body = num.to_bytes((num.bit_length() + 7) // 8, "big")
+    return b"\x00" * (len(text) - len(text.lstrip("1"))) + body
+
+
+def _decode_cid(buf: bytes, pos: int = 0) -> Tuple[CID, int]:
+    """Binary CID at buf[pos:] -> (cid, end position)"""
+    if buf[pos:pos + 2] == b"\x12\x20":
+        version, codec = 0, DAG_PB
+    else:
+        version, pos = _varint(buf, pos)
+        if version != 1:
+            raise IPLDError(f"Unsupported CID version {version}")
+        codec, pos = _varint(buf, pos)
+    hash_code, pos = _varint(buf, pos)
+    length, pos = _varint(buf, pos)
+    if pos + length > len(buf):
+        raise IPLDError("Truncated CID")
+    return CID(version, codec, hash_code, buf[pos:pos + length]), pos + length
+
+
+def parse_cid(text: str) -> CID:
+    """Validate and decode a CID string; raises IPLDError (a ValueError)"""
+    if not CID_RE.match(text):
+        raise IPLDError(f"Invalid CID: {text!r}")
+    if text.startswith("Qm"):
+        raw = _b58decode(text)
+    else:
+        body = text[1:].upper()
+        try:
+            raw = base64.b32decode(body + "=" * (-len(body) % 8))
+        except ValueError:
+            raise IPLDError(f"Invalid CID: {text!r}")
+    cid, end = _decode_cid(raw)
+    if end != len(raw) or cid.codec not in (DAG_PB, RAW):
+        raise IPLDError(f"Invalid CID: {text!r}")
+    return cid
+
+
+def read_car(data: bytes) -> Dict[CID, bytes]:
+    """Blocks of a CARv1 stream, each checked against its CID"""
+    header_len, pos = _varint(data, 0)
+    if data[pos:pos + header_len] == _CARV2_PRAGMA:
+        raise IPLDError("CARv2 is not supported")
+    pos += header_len
+    blocks: Dict[CID, bytes] = {}
+    while pos < len(data):
+        length, pos = _varint(data, pos)
+        end = pos + length
+        if end > len(data):
+            raise IPLDError("Truncated CAR block")
+        cid, pos = _decode_cid(data, pos)
+        block = data[pos:end]
+        if not cid.verify(block):
+            raise IPLDError("CAR block does not match its CID")
+        blocks[cid] = block
+        pos = end
+    return blocks
+
+
+def _protobuf_fields(buf: bytes) -> List[Tuple[int, object]]:
+    fields: List[Tuple[int, object]] = []
+    pos = 0
+    while pos < len(buf):
+        key, pos = _varint(buf, pos)
+        number, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, pos = _varint(buf, pos)
+        elif wire_type == 2:
+            length, pos = _varint(buf, pos)
+            value, pos = buf[pos:pos + length], pos + length
+        elif wire_type in (1, 5):
+            size = 8 if wire_type == 1 else 4
+            value, pos = buf[pos:pos + size], pos + size
+        else:
+            raise IPLDError(f"Unsupported protobuf wire type {wire_type}")
+        if pos > len(buf):
+            raise IPLDError("Truncated protobuf")
+        fields.append((number, value))
+    return fields
+
+
+@dataclass
+class _Node:
+    kind: int
+    data: bytes
+    links: List[Tuple[str, CID]]
+
+
+def _decode_node(block: bytes) -> _Node:
+    """dag-pb PBNode with its UnixFS Data"""
+    unixfs = b""
+    links: List[Tuple[str, CID]] = []
+    for number, value in _protobuf_fields(block):
+        if number == 1:
+            unixfs = value
+        elif number == 2:
+            link = dict(_protobuf_fields(value))
+            cid, _ = _decode_cid(link.get(1, b""))
+            links.append((link.get(2, b"").decode("utf-8"), cid))
+    fields = _protobuf_fields(unixfs)
+    kind = dict(fields).get(1)
+    data = next((value for number, value in fields if number == 2), b"")
+    return _Node(kind, data, links)
+
+
+class DAG:
+    """Verified blocks of one response, read as UnixFS"""
+
+    def __init__(self, blocks: Dict[CID, bytes], max_bytes: int):
+        self.blocks = blocks
+        self.max_bytes = max_bytes
+
+    def _block(self, cid: CID) -> bytes:
+        if cid.hash_code == IDENTITY:
+            return cid.digest
+        block = self.blocks.get(cid)
+        if block is None:
+            raise IPLDError("Block missing from response")
+        return block
+
+    def resolve(self, root: CID, path: str) -> CID:
+        cid = root
+        for name in filter(None, path.split("/")):
+            node = _decode_node(self._block(cid)) if cid.codec == DAG_PB else None
+            if node is None or node.kind != _UNIXFS_DIRECTORY:
+                raise IPLDError(f"Cannot resolve {name!r}: not a plain directory")
+            cid = next((link for link_name, link in node.links if link_name == name), None)
+            if cid is None:
+                raise IPLDError(f"No such path: {path}")
+        return cid
+
+    def read_file(self, cid: CID) -> bytes:
+        parts: List[bytes] = []
+        self._read_into(cid, parts, [0])
+        return b"".join(parts)
+
+    def _read_into(self, cid: CID, parts: List[bytes], total: List[int]) -> None:
+        block = self._block(cid)
+        if cid.codec == RAW:
+            chunk, links = block, []
+        else:
+            node = _decode_node(block)
+            if node.kind not in (_UNIXFS_RAW, _UNIXFS_FILE):
+                raise IPLDError("Not a UnixFS file")
+            chunk, links = node.data, node.links
+        total[0] += len(chunk)
+        if total[0] > self.max_bytes:
+            raise IPLDError("File exceeds size limit")
+        parts.append(chunk)
+        for _, child in links:
+            self._read_into(child, parts, total)
+
+
+def verified_file(root: CID, path: str, car: bytes, max_bytes: int) -> bytes:
+    """File at root/path from a CAR response, every block checked against its hash"""
+    dag = DAG(read_car(car), max_bytes)
+    return dag.read_file(dag.resolve(root, path))
+
@@ -0,0 +1,21 @@
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+__all__ = ["CONTENT_TYPE_LATEST", "generate_latest"]
+
+# Database connection pool
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after pool_timeout",
+)
+DB_POOL_OVERFLOW_EVENTS = Counter(
+    "db_pool_overflow_total",
+    "Connections opened beyond pool_size (max_overflow headroom used)",
+)
+DB_POOL_IN_USE = Gauge("db_pool_connections_in_use", "Connections currently checked out")
+DB_POOL_IDLE = Gauge("db_pool_connections_idle", "Connections idle in the pool")
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured pool_size")
@@ -0,0 +1,437 @@
+import asyncio
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, Text, event, func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from xrpl.asyncio.clients import AsyncJsonRpcClient
+from xrpl.models.transactions import Transaction
+
+from app.core.config import settings
+from app.shared.database.connection import AsyncSessionLocal, Base
+from app.shared.xrpl import (
+    Envelope,
+    SubmitResult,
+    XRPLService,
+    account_lock,
+    envelope_results,
+    get_xrpl_service,
+    sign_envelopes,
+    submit_envelope,
+)
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+SUBMITTED = "submitted"  # signed, tx_hash recorded, possibly on the network
+DONE = "done"
+FAILED = "failed"
+
+
+class XRPLOutbox(Base):
+    """XRPL transactions queued in the same DB transaction as the rows they belong to"""
+    __tablename__ = "xrpl_outbox"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(50), nullable=False)  # registered handler name
+    payload = Column(JSON, nullable=False)
+    status = Column(String(20), nullable=False, default=PENDING, server_default=PENDING)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(Text, nullable=True)
+    result = Column(JSON, nullable=True)  # validated tx result on success
+    tx_hash = Column(String(128), nullable=True)  # this transaction (inner hash when batched)
+    envelope_hash = Column(String(128), nullable=True)  # submitted envelope (Batch or tx_hash)
+    sequence = Column(Integer, nullable=True)
+    last_ledger_sequence = Column(Integer, nullable=True)  # envelope can't validate after this
+    available_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index(
+            "ix_xrpl_outbox_pending",
+            "available_at",
+            "id",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        Index(
+            "ix_xrpl_outbox_submitted",
+            "updated_at",
+            postgresql_where=text("status = 'submitted'"),
+        ),
+    )
+
+
+@dataclass
+class OutboxHandler:
+    """
+    How to turn one outbox payload into a transaction and apply its outcome.
+
+    ``on_success``/``on_failure`` run in the worker's session and commit with
+    the outbox row; ``after_commit`` gets every finished payload of the pass.
+    Engine results in ``accept`` mean the ledger already is in the wanted state
+    (e.g. tecDUPLICATE) and count as success. A failed inner transaction of a
+    Batch never reaches the ledger, so there is no engine result to match;
+    ``check(client, account, payload)`` looks at the ledger instead and is
+    asked whenever a transaction fails.
+    """
+    build: Callable[[str, Dict[str, Any]], Transaction]
+    on_success: Optional[Callable[[AsyncSession, Dict[str, Any], Dict[str, Any]], Awaitable[None]]] = None
+    on_failure: Optional[Callable[[AsyncSession, Dict[str, Any], str], Awaitable[None]]] = None
+    after_commit: Optional[Callable[[List[Dict[str, Any]]], Awaitable[None]]] = None
+    accept: Tuple[str, ...] = ()
+    check: Optional[Callable[[AsyncJsonRpcClient, str, Dict[str, Any]], Awaitable[bool]]] = None
+
+
+_handlers: Dict[str, OutboxHandler] = {}
+
+
+def register_handler(kind: str, handler: OutboxHandler) -> None:
+    _handlers[kind] = handler
+
+
+def enqueue(db: AsyncSession, kind: str, payload: Dict[str, Any]) -> XRPLOutbox:
+    """Queue a transaction; it is submitted only if the caller's transaction commits"""
+    if kind not in _handlers:
+        raise ValueError(f"No outbox handler registered for {kind!r}")
+    entry = XRPLOutbox(kind=kind, payload=payload)
+    db.add(entry)
+    event.listen(db.sync_session, "after_commit", lambda _session: outbox_worker.wake(), once=True)
+    return entry
+
+
+class OutboxWorker:
+    """
+    Submits pending outbox rows from the platform wallet.
+
+    A pass claims due rows with FOR UPDATE SKIP LOCKED, signs them (packed into
+    Batch envelopes) and commits them as submitted together with their tx
+    hashes; only then are the envelopes submitted and awaited, outside any DB
+    transaction, and the results recorded in a new one. Submitted rows whose
+    pass never recorded a result (crash, restart) are reconciled by looking up
+    their hash, never by signing them again while they could still validate.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+        self._batch = True  # cleared when the network rejects a Batch envelope
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def _retry_at(self, attempts: int) -> datetime:
+        delay = settings.outbox_retry_base_delay * (2 ** (attempts - 1))
+        return datetime.now(timezone.utc) + timedelta(seconds=delay)
+
+    async def _record_failure(
+        self, db: AsyncSession, row: XRPLOutbox, handler: Optional[OutboxHandler], error: str
+    ) -> bool:
+        """Schedule a retry, or mark the row failed; returns True when it is final"""
+        row.last_error = error[:2000]
+        if handler is not None and row.attempts < settings.outbox_max_attempts:
+            row.status = PENDING
+            row.available_at = self._retry_at(row.attempts)
+            logger.warning(f"Outbox #{row.id} ({row.kind}) attempt {row.attempts} failed: {error}")
+            return False
+        row.status = FAILED
+        logger.error(f"Outbox #{row.id} ({row.kind}) failed permanently: {error}")
+        if handler is not None and handler.on_failure is not None:
+            await handler.on_failure(db, row.payload, error)
+        return True
+
+    async def _record_success(
+        self,
+        db: AsyncSession,
+        row: XRPLOutbox,
+        handler: OutboxHandler,
+        tx_result: Dict[str, Any],
+        error: Optional[str],
+    ) -> None:
+        row.status = DONE
+        row.result = tx_result or None
+        row.last_error = error
+        try:
+            if handler.on_success is not None:
+                await handler.on_success(db, row.payload, tx_result)
+        except Exception as e:
+            # The transaction is on-ledger; never resubmit it
+            logger.exception(f"Outbox #{row.id} ({row.kind}) success handler failed")
+            row.last_error = f"on_success: {e}"[:2000]
+
+    async def _record(
+        self,
+        outcomes: Dict[Tuple[int, str], SubmitResult],
+        requeue: Sequence[Tuple[int, str]] = (),
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Apply results to submitted rows, keyed by (row id, tx hash).
+
+        Rows another pass already settled (or re-signed) are skipped, so a
+        late result is never applied twice. ``requeue`` rows were never
+        submitted and go back to pending without using up an attempt.
+        """
+        finished: List[Tuple[str, Dict[str, Any]]] = []
+        keys = set(outcomes) | set(requeue)
+        if not keys:
+            return finished
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(XRPLOutbox)
+                .where(
+                    XRPLOutbox.id.in_([row_id for row_id, _ in keys]),
+                    XRPLOutbox.status == SUBMITTED,
+                )
+                .with_for_update()
+            )
+            for row in result.scalars().all():
+                key = (row.id, row.tx_hash)
+                if key in requeue:
+                    row.status = PENDING
+                    row.attempts -= 1
+                    continue
+                if key not in outcomes:
+                    continue
+                handler = _handlers.get(row.kind)
+                tx_result, error = outcomes[key]
+                if handler is not None and (error is None or error in handler.accept):
+                    await self._record_success(db, row, handler, tx_result or {}, error)
+                    finished.append((row.kind, row.payload))
+                elif await self._record_failure(db, row, handler, error or "Unknown error"):
+                    finished.append((row.kind, row.payload))
+            await db.commit()
+        return finished
+
+    async def _after_commit(self, finished: List[Tuple[str, Dict[str, Any]]]) -> None:
+        grouped: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for kind, payload in finished:
+            grouped[kind].append(payload)
+        for kind, payloads in grouped.items():
+            handler = _handlers.get(kind)
+            if handler is not None and handler.after_commit is not None:
+                try:
+                    await handler.after_commit(payloads)
+                except Exception:
+                    logger.exception(f"Outbox after_commit hook failed for {kind}")
+
+    async def _check_state(
+        self,
+        xrpl: XRPLService,
+        rows: Sequence[XRPLOutbox],
+        outcomes: Dict[Tuple[int, str], SubmitResult],
+    ) -> None:
+        """Turn failures into successes where the ledger already is in the wanted state"""
+        for row in rows:
+            key = (row.id, row.tx_hash)
+            handler = _handlers.get(row.kind)
+            if key not in outcomes or handler is None or handler.check is None:
+                continue
+            _, error = outcomes[key]
+            if error is None or error in handler.accept:
+                continue
+            try:
+                applied = await handler.check(xrpl.client, xrpl.wallet.address, row.payload)
+            except Exception as e:
+                logger.warning(f"Outbox #{row.id} ({row.kind}) state check failed: {e}")
+                continue
+            if applied:
+                logger.info(f"Outbox #{row.id} ({row.kind}) already applied on-ledger ({error})")
+                outcomes[key] = ({}, None)
+
+    async def reconcile(self) -> int:
+        """Settle submitted rows left behind by an earlier pass; returns how many were settled"""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.outbox_reconcile_after)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(XRPLOutbox)
+                .where(XRPLOutbox.status == SUBMITTED, XRPLOutbox.updated_at <= cutoff)
+                .order_by(XRPLOutbox.envelope_hash, XRPLOutbox.sequence)
+                .limit(settings.outbox_batch_size)
+            )
+            rows = list(result.scalars().all())
+        if not rows:
+            return 0
+
+        xrpl = get_xrpl_service()
+        envelopes: Dict[str, List[XRPLOutbox]] = defaultdict(list)
+        for row in rows:
+            envelopes[row.envelope_hash].append(row)
+        outcomes: Dict[Tuple[int, str], SubmitResult] = {}
+        for envelope_hash, packed in envelopes.items():
+            results = await envelope_results(
+                xrpl.client,
+                envelope_hash,
+                [row.tx_hash for row in packed],
+                packed[0].last_ledger_sequence,
+                wait=False,
+            )
+            if results is None:
+                continue  # may still validate
+            for row, outcome in zip(packed, results):
+                outcomes[(row.id, row.tx_hash)] = outcome
+
+        await self._check_state(xrpl, rows, outcomes)
+        await self._after_commit(await self._record(outcomes))
+        return len(outcomes)
+
+    async def _claim(
+        self, xrpl: XRPLService, conn: AsyncConnection
+    ) -> Tuple[int, List[Tuple[Envelope, List[XRPLOutbox]]], List[Tuple[str, Dict[str, Any]]]]:
+        """Claim due rows, sign them and commit them as submitted (on the lock's connection)"""
+        finished: List[Tuple[str, Dict[str, Any]]] = []
+        async with AsyncSessionLocal(bind=conn) as db:
+            result = await db.execute(
+                select(XRPLOutbox)
+                .where(XRPLOutbox.status == PENDING, XRPLOutbox.available_at <= func.now())
+                .order_by(XRPLOutbox.available_at, XRPLOutbox.id)
+                .limit(settings.outbox_batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            rows = list(result.scalars().all())
+            if not rows:
+                return 0, [], finished
+
+            claimed: List[Tuple[XRPLOutbox, OutboxHandler]] = []
+            txs: List[Transaction] = []
+            for row in rows:
+                row.attempts += 1
+                handler = _handlers.get(row.kind)
+                if handler is None:
+                    await self._record_failure(db, row, None, f"No handler for {row.kind!r}")
+                    continue
+                try:
+                    txs.append(handler.build(xrpl.wallet.address, row.payload))
+                except Exception as e:
+                    # A payload that cannot be built will never succeed
+                    row.attempts = settings.outbox_max_attempts
+                    if await self._record_failure(db, row, handler, f"Invalid payload: {e}"):
+                        finished.append((row.kind, row.payload))
+                    continue
+                claimed.append((row, handler))
+
+            signed: List[Tuple[Envelope, List[XRPLOutbox]]] = []
+            if txs:
+                try:
+                    envelopes = await sign_envelopes(
+                        xrpl.client, xrpl.wallet, txs, batch=self._batch
+                    )
+                except Exception as e:
+                    # Nothing was submitted
+                    envelopes = []
+                    for row, handler in claimed:
+                        if await self._record_failure(db, row, handler, f"Signing failed: {e}"):
+                            finished.append((row.kind, row.payload))
+                packed = iter(claimed)
+                for envelope in envelopes:
+                    members = []
+                    for tx_hash, sequence in zip(envelope.tx_hashes, envelope.sequences):
+                        row, _ = next(packed)
+                        row.status = SUBMITTED
+                        row.tx_hash = tx_hash
+                        row.envelope_hash = envelope.hash
+                        row.sequence = sequence
+                        row.last_ledger_sequence = envelope.last_ledger_sequence
+                        members.append(row)
+                    signed.append((envelope, members))
+
+            await db.commit()
+        return len(rows), signed, finished
+
+    async def process_once(self) -> int:
+        """Claim, submit and settle one batch of due rows; returns how many rows were handled"""
+        settled = await self.reconcile()
+
+        xrpl = get_xrpl_service()
+        waiting: List[Tuple[Envelope, List[XRPLOutbox]]] = []
+        outcomes: Dict[Tuple[int, str], SubmitResult] = {}
+        requeue: List[Tuple[int, str]] = []
+        # Sequences are allocated in _claim: hold the account lock until the
+        # envelopes are submitted, so no other signer reuses them
+        async with account_lock(xrpl.wallet.address) as conn:
+            claimed, signed, finished = await self._claim(xrpl, conn)
+
+            # The hashes are committed and the row locks released: from here on
+            # a crash leaves submitted rows that reconcile() settles by hash
+            for n, (envelope, rows) in enumerate(signed):
+                rejected = await submit_envelope(xrpl.client, envelope)
+                if rejected is None:
+                    waiting.append((envelope, rows))
+                    continue
+                # Nothing in this envelope applied, and the ones after it can't
+                # validate without its sequence: sign those again next pass
+                logger.warning(f"Envelope {envelope.hash} rejected ({rejected})")
+                if len(rows) > 1:
+                    self._batch = False
+                    logger.warning(
+                        "Batch envelopes rejected; submitting transactions one at a time"
+                    )
+                    requeue += [(row.id, row.tx_hash) for row in rows]
+                else:
+                    outcomes[(rows[0].id, rows[0].tx_hash)] = (None, rejected)
+                requeue += [(row.id, row.tx_hash) for _, later in signed[n + 1:] for row in later]
+                break
+
+        await self._after_commit(finished)
+        if not signed:
+            return settled + claimed
+
+        results = await asyncio.gather(
+            *(
+                envelope_results(
+                    xrpl.client, envelope.hash, envelope.tx_hashes, envelope.last_ledger_sequence
+                )
+                for envelope, _ in waiting
+            ),
+            return_exceptions=True,
+        )
+        for (envelope, rows), envelope_outcome in zip(waiting, results):
+            if isinstance(envelope_outcome, BaseException):
+                # Left submitted; reconcile() looks it up later
+                logger.warning(f"Waiting for {envelope.hash} failed: {envelope_outcome}")
+                continue
+            for row, outcome in zip(rows, envelope_outcome):
+                outcomes[(row.id, row.tx_hash)] = outcome
+
+        await self._check_state(xrpl, [row for _, rows in signed for row in rows], outcomes)
+        await self._after_commit(await self._record(outcomes, requeue))
+        return settled + claimed
+
+    async def run(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                claimed = await self.process_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("XRPL outbox pass failed")
+                claimed = 0
+            if claimed:
+                # Keep draining while there is a backlog
+                continue
+            try:
+                await asyncio.wait_for(self._wake.wait(), settings.outbox_poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        if not get_xrpl_service().configured:
+            logger.warning("PLATFORM_SEED not set; XRPL outbox worker disabled")
+            return
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+outbox_worker = OutboxWorker()
@@ -0,0 +1,131 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel, Field
+from sqlalchemy import Select, tuple_
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """One page of a keyset-paginated list"""
+    items: List[T]
+    next_cursor: Optional[str] = Field(
+        None, description="Opaque cursor for the next page (null on the last page)"
+    )
+
+
+@dataclass
+class PageParams:
+    cursor: Optional[str]
+    limit: int
+
+
+def page_params(
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(
+        settings.default_page_size, ge=1, le=settings.max_page_size, description="Page size"
+    ),
+) -> PageParams:
+    return PageParams(cursor=cursor, limit=limit)
+
+
+def _encode(values: Sequence[Any]) -> str:
+    raw = json.dumps(list(values)).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode(cursor: str) -> Any:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded))
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _key_value(value: Any, value_type: type) -> Any:
+    """Check a decoded key value against its column's Python type"""
+    if value_type is datetime:
+        if not isinstance(value, str):
+            raise TypeError("expected an ISO datetime")
+        return datetime.fromisoformat(value)
+    # bool is an int subclass, but never a valid key
+    if not isinstance(value, value_type) or isinstance(value, bool):
+        raise TypeError(f"expected {value_type.__name__}")
+    return value
+
+
+def encode_cursor(created_at: datetime, id_: int) -> str:
+    return _encode([created_at.isoformat(), id_])
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, id_ = _decode(cursor)
+        return _key_value(created_at, datetime), _key_value(id_, int)
+    except (ValueError, TypeError):
+        raise _invalid_cursor()
+
+
+def encode_key_cursor(sort: str, value: Any, id_: int) -> str:
+    """Cursor for a non-default sort; the sort name is embedded so it can't be replayed under another"""
+    return _encode([sort, value.isoformat() if isinstance(value, datetime) else value, id_])
+
+
+def decode_key_cursor(cursor: str, sort: str, value_type: type) -> Tuple[Any, int]:
+    """Decode a cursor from encode_key_cursor; ``value_type`` is the sort column's Python type"""
+    try:
+        cursor_sort, value, id_ = _decode(cursor)
+        if cursor_sort != sort:
+            raise ValueError("cursor belongs to another sort")
+        return _key_value(value, value_type), _key_value(id_, int)
+    except (ValueError, TypeError):
+        raise _invalid_cursor()
+
+
+def seek(
+    stmt: Select,
+    sort_col: Any,
+    id_col: Any,
+    after: Optional[Tuple[Any, int]],
+    limit: int,
+    descending: bool = True,
+) -> Select:
+    """
+    Order by (sort_col, id) and continue after the ``after`` key.
+
+    Fetches one extra row so ``make_page`` can tell whether another page exists.
+    """
+    if after is not None:
+        key = tuple_(sort_col, id_col)
+        stmt = stmt.where(key < tuple_(*after) if descending else key > tuple_(*after))
+    if descending:
+        return stmt.order_by(sort_col.desc(), id_col.desc()).limit(limit + 1)
+    return stmt.order_by(sort_col.asc(), id_col.asc()).limit(limit + 1)
+
+
+def keyset(stmt: Select, created_col: Any, id_col: Any, params: PageParams) -> Select:
+    """Order newest first by (created_at, id) and seek past the cursor"""
+    after = decode_cursor(params.cursor) if params.cursor else None
+    return seek(stmt, created_col, id_col, after, params.limit)
+
+
+def make_page(
+    rows: Sequence[Any],
+    params: PageParams,
+    cursor_for: Optional[Callable[[Any], str]] = None,
+) -> dict:
+    """Trim the look-ahead row and build the cursor from the last item"""
+    items = list(rows[: params.limit])
+    next_cursor = None
+    if len(rows) > params.limit and items:
+        last = items[-1]
+        next_cursor = cursor_for(last) if cursor_for else encode_cursor(last.created_at, last.id)
+    return {"items": items, "next_cursor": next_cursor}
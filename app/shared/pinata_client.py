@@ -1,5 +1,6 @@
 # app/shared/pinata_client.py
 import json
+import logging
 from typing import Any, Dict, Optional
 
 import httpx
@@ -8,6 +9,8 @@ from app.core.config import settings
 
 PINATA_BASE = "https://api.pinata.cloud/pinning"
 
+logger = logging.getLogger(__name__)
+
 
 def _auth_headers() -> Dict[str, str]:
     # JWT 사용
@@ -16,30 +19,43 @@ def _auth_headers() -> Dict[str, str]:
     }
 
 
+async def _post(url: str, client: Optional[httpx.AsyncClient], **kwargs) -> Dict[str, Any]:
+    if client is not None:
+        resp = await client.post(url, **kwargs)
+        resp.raise_for_status()
+        return resp.json()
+    async with httpx.AsyncClient(timeout=60) as own_client:
+        resp = await own_client.post(url, **kwargs)
+        resp.raise_for_status()
+        return resp.json()
+
+
 async def pin_file_to_ipfs(
-    file_bytes: bytes, filename: str, metadata: Optional[Dict[str, Any]] = None
+    file_bytes: bytes,
+    filename: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    client: Optional[httpx.AsyncClient] = None,
 ) -> Dict[str, Any]:
     """
     Pinata pinFileToIPFS (비동기 버전)
+
+    Pass a shared ``client`` when pinning many files to reuse its connections.
     """
     url = f"{PINATA_BASE}/pinFileToIPFS"
     files = {"file": (filename, file_bytes)}
     if metadata:
         files["pinataMetadata"] = (None, json.dumps(metadata), "application/json")
 
-    print(
-        f"Pinning file to IPFS: {filename}, metadata: {metadata}, headers: {_auth_headers()}",
-        flush=True,
-    )
+    logger.debug(f"Pinning file to IPFS: {filename}, metadata: {metadata}")
 
-    async with httpx.AsyncClient(timeout=60) as client:
-        resp = await client.post(url, headers=_auth_headers(), files=files)
-        resp.raise_for_status()
-        return resp.json()  # { IpfsHash, PinSize, Timestamp }
+    # { IpfsHash, PinSize, Timestamp }
+    return await _post(url, client, headers=_auth_headers(), files=files)
 
 
 async def pin_json_to_ipfs(
-    json_obj: Dict[str, Any], name: Optional[str] = None
+    json_obj: Dict[str, Any],
+    name: Optional[str] = None,
+    client: Optional[httpx.AsyncClient] = None,
 ) -> Dict[str, Any]:
     """
     Pinata pinJSONToIPFS (비동기 버전)
@@ -53,10 +69,8 @@ async def pin_json_to_ipfs(
 
     headers = {**_auth_headers(), "Content-Type": "application/json"}
 
-    async with httpx.AsyncClient(timeout=60) as client:
-        resp = await client.post(url, headers=headers, json=payload)
-        resp.raise_for_status()
-        return resp.json()  # { IpfsHash, PinSize, Timestamp }
+    # { IpfsHash, PinSize, Timestamp }
+    return await _post(url, client, headers=headers, json=payload)
 
 
 # async def pin_file_to_ipfs(file_bytes: bytes, filename: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -0,0 +1,35 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app.core.config import settings
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def pool_size() -> int:
+    return settings.process_pool_workers or os.cpu_count() or 1
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Process-wide pool for CPU-bound work such as image encoding.
+
+    Workers are spawned rather than forked so they never inherit the event loop,
+    DB connections or XRPL clients of the parent process.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=pool_size(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def shutdown_process_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
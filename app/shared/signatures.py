@@ -0,0 +1,18 @@
+from typing import Optional
+
+from xrpl.core.keypairs import derive_classic_address, is_valid_message
+
+
+def verify_wallet_signature(message: bytes, signature_hex: str, public_key_hex: str) -> Optional[str]:
+    """
+    Process pool worker: check a secp256k1/ed25519 signature over ``message``.
+
+    Returns the classic address of the signing key, or None if the signature
+    (or key) is invalid.
+    """
+    try:
+        if not is_valid_message(message, bytes.fromhex(signature_hex), public_key_hex):
+            return None
+        return derive_classic_address(public_key_hex)
+    except Exception:
+        return None
@@ -0,0 +1,122 @@
+import asyncio
+from io import BytesIO
+from typing import Any, Dict, List, Optional
+
+import httpx
+import numpy as np
+from PIL import Image, ImageOps
+
+from app.core.config import settings
+from app.shared.pinata_client import pin_file_to_ipfs, pin_json_to_ipfs
+from app.shared.process_pool import get_process_pool, pool_size
+
+
+def decode_image(image_bytes: bytes) -> np.ndarray:
+    """Decode the artwork once into an (H, W, C) uint8 array"""
+    with Image.open(BytesIO(image_bytes)) as img:
+        img = ImageOps.exif_transpose(img)
+        mode = "RGBA" if "A" in img.getbands() else "RGB"
+        return np.asarray(img.convert(mode))
+
+
+def slice_grid(pixels: np.ndarray, grid_n: int) -> np.ndarray:
+    """
+    Split an (H, W, C) array into a (grid_n, grid_n, th, tw, C) view.
+
+    Trailing pixels that don't divide evenly are cropped so every piece has the
+    same size; no data is copied.
+    """
+    height, width, channels = pixels.shape
+    th, tw = height // grid_n, width // grid_n
+    if th == 0 or tw == 0:
+        raise ValueError(f"Image {width}x{height} is too small for a {grid_n}x{grid_n} grid")
+    cropped = pixels[: th * grid_n, : tw * grid_n]
+    return cropped.reshape(grid_n, th, grid_n, tw, channels).swapaxes(1, 2)
+
+
+def _encode_tiles(tiles: List[np.ndarray], fmt: str) -> List[bytes]:
+    """Process pool worker: encode a chunk of tiles"""
+    out = []
+    for tile in tiles:
+        buf = BytesIO()
+        Image.fromarray(tile).save(buf, format=fmt)
+        out.append(buf.getvalue())
+    return out
+
+
+async def render_tiles(image_bytes: bytes, grid_n: int) -> List[bytes]:
+    """
+    Decode, slice and encode an artwork into grid_n * grid_n tiles.
+
+    Tiles are returned in row-major order, so tile ``i`` belongs to grid index ``i + 1``.
+    """
+    pixels = await asyncio.to_thread(decode_image, image_bytes)
+    grid = slice_grid(pixels, grid_n)
+    tiles = [np.ascontiguousarray(grid[r, c]) for r in range(grid_n) for c in range(grid_n)]
+
+    # Ship tiles in a few chunks per worker to amortize pickling overhead
+    pool = get_process_pool()
+    chunk = max(1, len(tiles) // (pool_size() * 4))
+    loop = asyncio.get_running_loop()
+    futures = [
+        loop.run_in_executor(pool, _encode_tiles, tiles[i:i + chunk], settings.tile_format)
+        for i in range(0, len(tiles), chunk)
+    ]
+    encoded: List[bytes] = []
+    for part in await asyncio.gather(*futures):
+        encoded.extend(part)
+    return encoded
+
+
+async def pin_tiles_with_metadata(
+    tiles: List[bytes],
+    *,
+    title: str,
+    description: str,
+    attributes: List[Dict[str, Any]],
+    parent_uri: str,
+    grid_n: int,
+    concurrency: Optional[int] = None,
+) -> Dict[str, List[str]]:
+    """
+    Pin every tile and its per-piece meta.json with bounded concurrency.
+
+    Returns the tile image URIs and piece metadata URIs in grid order.
+    """
+    sem = asyncio.Semaphore(concurrency or settings.tile_upload_concurrency)
+    ext = settings.tile_format.lower()
+    total = len(tiles)
+
+    async def pin_piece(idx: int, data: bytes, client: httpx.AsyncClient) -> tuple[str, str]:
+        row, col = divmod(idx - 1, grid_n)
+        async with sem:
+            img_res = await pin_file_to_ipfs(
+                file_bytes=data,
+                filename=f"tile_{idx}.{ext}",
+                metadata={"name": f"tile_{title}_{idx}"},
+                client=client,
+            )
+        tile_uri = f"ipfs://{img_res['IpfsHash']}"
+        piece_meta = {
+            "name": f"{title} #{idx}/{total}",
+            "description": description or "",
+            "image": tile_uri,
+            "parent": parent_uri,
+            "attributes": attributes + [
+                {"trait_type": "grid_index", "value": idx},
+                {"trait_type": "grid_position", "value": f"{row},{col}"},
+            ],
+        }
+        async with sem:
+            meta_res = await pin_json_to_ipfs(piece_meta, name=f"meta_{title}_{idx}", client=client)
+        return tile_uri, f"ipfs://{meta_res['IpfsHash']}"
+
+    async with httpx.AsyncClient(timeout=60) as client:
+        results = await asyncio.gather(
+            *(pin_piece(i, data, client) for i, data in enumerate(tiles, start=1))
+        )
+
+    return {
+        "tile_uris": [tile_uri for tile_uri, _ in results],
+        "piece_uris": [piece_uri for _, piece_uri in results],
+    }
@@ -1,135 +1,354 @@
-from typing import Optional
+import asyncio
+import dataclasses
+import hashlib
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
-import xrpl
-from fastapi import HTTPException
-from starlette import status
-from xrpl.clients import JsonRpcClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from xrpl.asyncio.account import get_next_valid_seq_number
+from xrpl.asyncio.clients import AsyncJsonRpcClient
+from xrpl.asyncio.ledger import get_latest_validated_ledger_sequence
+from xrpl.asyncio.transaction import XRPLReliableSubmissionException, autofill, sign, submit
 from xrpl.models import PermissionedDomainSet
+from xrpl.models.requests import LedgerEntry, Tx
+from xrpl.models.requests.ledger_entry import Credential as CredentialEntry
+from xrpl.models.response import Response
+from xrpl.models.transactions import (
+    Batch,
+    BatchFlag,
+    CredentialCreate,
+    CredentialDelete,
+    Transaction,
+)
 from xrpl.models.transactions.deposit_preauth import Credential
 from xrpl.wallet import Wallet
 
 from app.core.config import settings
+from app.shared.database.connection import lock_engine
+
+logger = logging.getLogger(__name__)
+
+# Credential type accepted by every gallery's permissioned domain
+ROASIS_GALLERY_CREDENTIAL = "ROASIS_GALLERY".encode("utf-8").hex().upper()
+
+# Maximum inner transactions per Batch envelope
+BATCH_LIMIT = 8
+
+# Preliminary results that mean the envelope will be applied (or was queued)
+_ACCEPTED_PRELIMINARY = ("tes", "ter", "tec")
+
+# (validated tx result, error) for each submitted transaction
+SubmitResult = Tuple[Optional[Dict[str, Any]], Optional[str]]
 
 
 class XRPLService:
-    def __init__(self):
-        self.client = JsonRpcClient(settings.xrpl_rpc_url)
-        self.service_wallet = self._get_admin_wallet()
-
-    def _get_admin_wallet(self) -> Wallet:
-        """Get or create service wallet for domain management"""
-        seed = settings.platform_seed
-        if seed:
-            return Wallet.from_seed(seed)
+    """
+    Process-wide XRPL state: the platform wallet and the RPC client.
+
+    Both are built on first use, so processes (and requests) that never touch
+    the ledger pay no key derivation and work without PLATFORM_SEED.
+    """
+
+    def __init__(self, rpc_url: str, seed: str):
+        self.rpc_url = rpc_url
+        self._seed = seed
+        self._wallet: Optional[Wallet] = None
+        self._client: Optional[AsyncJsonRpcClient] = None
+
+    @property
+    def configured(self) -> bool:
+        return bool(self._seed)
+
+    @property
+    def wallet(self) -> Wallet:
+        """Platform (service) wallet used for minting, offers and domains"""
+        if self._wallet is None:
+            if not self._seed:
+                raise RuntimeError("platform_seed is not configured")
+            self._wallet = Wallet.from_seed(self._seed)
+        return self._wallet
+
+    @property
+    def client(self) -> AsyncJsonRpcClient:
+        if self._client is None:
+            self._client = AsyncJsonRpcClient(self.rpc_url)
+        return self._client
+
+    def warm_up(self) -> None:
+        """Derive the wallet at startup instead of on the first XRPL request"""
+        self.client
+        if self.configured:
+            self.wallet
         else:
-            print("XRPL_SERVICE_WALLET_SEED not set")
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-    def create_domain(self, domain_name: str) -> str | None:
-        """
-        Create XRPL permissioned domain
-
-        Args:
-            domain_name: Domain name (e.g., "gallery1.roasis.art")
-
-        Returns:
-            bool: True if domain creation successful
-        """
-        try:
-            credential = Credential(
-                credential_type="ROASIS_GALLERY".encode('utf-8').hex().upper(),
-                issuer=self.service_wallet.address,
-            )
+            logger.warning("PLATFORM_SEED not set; XRPL operations are disabled")
+
+
+_service: Optional[XRPLService] = None
 
-            domain_tx = PermissionedDomainSet(
-                account=self.service_wallet.address,
-                accepted_credentials=[credential]
+
+def get_xrpl_service() -> XRPLService:
+    global _service
+    if _service is None:
+        _service = XRPLService(settings.xrpl_rpc_url, settings.platform_seed)
+    return _service
+
+
+_account_locks: Dict[str, asyncio.Lock] = {}
+
+
+@asynccontextmanager
+async def account_lock(address: str) -> AsyncIterator[AsyncConnection]:
+    """
+    Serialize everything that signs from ``address``, from autofill (which
+    reads the next sequence) until the transaction is submitted.
+
+    An asyncio lock orders callers in this process; a session-level Postgres
+    advisory lock orders outbox workers and request handlers across replicas.
+    The lock lives on the dedicated lock_engine connection, which has no
+    transaction open while the XRPL calls run. It is yielded so callers can
+    run their own short transactions on it (the outbox claim).
+
+    Acquiring plus holding is bounded by xrpl_account_lock_timeout. On any
+    error or timeout the connection is invalidated: closing the server
+    session is the one sure way to release the lock.
+    """
+    key = int.from_bytes(hashlib.sha256(address.encode("utf-8")).digest()[:8], "big", signed=True)
+    async with _account_locks.setdefault(address, asyncio.Lock()):
+        async with asyncio.timeout(settings.xrpl_account_lock_timeout):
+            async with lock_engine.connect() as conn:
+                advisory = conn.dialect.name == "postgresql"
+                try:
+                    if advisory:
+                        await conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": key})
+                    # Session-level: the lock outlives the transaction that took it
+                    await conn.commit()
+                    yield conn
+                    await conn.rollback()
+                    if advisory:
+                        await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+                        await conn.commit()
+                except BaseException:
+                    await conn.invalidate()
+                    raise
+
+
+async def submit_and_wait_locked(
+    client: AsyncJsonRpcClient, wallet: Wallet, tx: Transaction
+) -> Response:
+    """
+    Like xrpl's submit_and_wait, but autofill, sign and submit hold the
+    account lock; waiting for validation doesn't.
+
+    Raises XRPLReliableSubmissionException unless the transaction validates
+    with tesSUCCESS.
+    """
+    async with account_lock(wallet.address):
+        signed = sign(await autofill(tx, client), wallet)
+        resp = await submit(signed, client)
+    preliminary = resp.result.get("engine_result", "")
+    if not preliminary.startswith(_ACCEPTED_PRELIMINARY):
+        raise XRPLReliableSubmissionException(
+            f"{preliminary}: {resp.result.get('engine_result_message', resp.result)}"
+        )
+    tx_hash = signed.get_hash()
+    while True:
+        await asyncio.sleep(1)
+        latest = await get_latest_validated_ledger_sequence(client)
+        resp = await client.request(Tx(transaction=tx_hash))
+        if resp.is_successful() and resp.result.get("validated"):
+            engine_result = _transaction_result(resp.result)
+            if engine_result != "tesSUCCESS":
+                raise XRPLReliableSubmissionException(f"Transaction failed: {engine_result}")
+            return resp
+        if latest > signed.last_ledger_sequence:
+            raise XRPLReliableSubmissionException(
+                f"Transaction {tx_hash} expired without validating (preliminary {preliminary})"
             )
-            print(f"🔍 Transaction created: {domain_tx}")
 
-            # Submit transaction
-            print("🔍 Submitting transaction to XRPL...")
-            response = xrpl.transaction.submit_and_wait(
-                domain_tx, self.client, self.service_wallet
+
+def gallery_domain_tx(account: str) -> PermissionedDomainSet:
+    """PermissionedDomainSet accepting ROASIS_GALLERY credentials issued by ``account``"""
+    return PermissionedDomainSet(
+        account=account,
+        accepted_credentials=[
+            Credential(credential_type=ROASIS_GALLERY_CREDENTIAL, issuer=account)
+        ],
+    )
+
+
+def gallery_credential_create_tx(account: str, subject: str) -> CredentialCreate:
+    """Issue the ROASIS_GALLERY credential to an artist (they accept it from their wallet)"""
+    return CredentialCreate(
+        account=account, subject=subject, credential_type=ROASIS_GALLERY_CREDENTIAL
+    )
+
+
+def gallery_credential_delete_tx(account: str, subject: str) -> CredentialDelete:
+    """Revoke a ROASIS_GALLERY credential issued by ``account``"""
+    return CredentialDelete(
+        account=account,
+        subject=subject,
+        issuer=account,
+        credential_type=ROASIS_GALLERY_CREDENTIAL,
+    )
+
+
+async def gallery_credential_exists(
+    client: AsyncJsonRpcClient, issuer: str, subject: str
+) -> bool:
+    """Whether the validated ledger has a ROASIS_GALLERY credential issuer -> subject"""
+    resp = await client.request(
+        LedgerEntry(
+            credential=CredentialEntry(
+                subject=subject, issuer=issuer, credential_type=ROASIS_GALLERY_CREDENTIAL
+            ),
+            ledger_index="validated",
+        )
+    )
+    if resp.is_successful():
+        return True
+    if resp.result.get("error") == "entryNotFound":
+        return False
+    raise RuntimeError(f"ledger_entry failed: {resp.result}")
+
+
+def created_ledger_index(tx_result: Dict[str, Any], entry_type: str) -> Optional[str]:
+    """LedgerIndex of the first ``entry_type`` object a validated transaction created"""
+    meta = tx_result.get("meta") or tx_result.get("metaData") or {}
+    for node in meta.get("AffectedNodes", []):
+        created = node.get("CreatedNode", {})
+        if created.get("LedgerEntryType") == entry_type:
+            return created.get("LedgerIndex")
+    return None
+
+
+def _transaction_result(tx_result: Dict[str, Any]) -> Optional[str]:
+    meta = tx_result.get("meta") or tx_result.get("metaData") or {}
+    return meta.get("TransactionResult") if isinstance(meta, dict) else None
+
+
+@dataclass
+class Envelope:
+    """One signed submission: a single transaction, or a tfIndependent Batch of several"""
+    signed: Transaction
+    tx_hashes: List[str]  # hash of each packed transaction, in order
+    sequences: List[int]
+
+    @property
+    def hash(self) -> str:
+        return self.signed.get_hash()
+
+    @property
+    def last_ledger_sequence(self) -> int:
+        return self.signed.last_ledger_sequence
+
+
+async def sign_envelopes(
+    client: AsyncJsonRpcClient, wallet: Wallet, txs: Sequence[Transaction], batch: bool = True
+) -> List[Envelope]:
+    """
+    Autofill and sign ``txs`` from ``wallet``, packed into Batch envelopes of up
+    to BATCH_LIMIT (or one per envelope when ``batch`` is False).
+
+    Envelopes get consecutive sequence numbers, so they can all be submitted
+    before waiting and validate together in the next ledger or two.
+    """
+    chunk_size = BATCH_LIMIT if batch else 1
+    chunks = [list(txs[i:i + chunk_size]) for i in range(0, len(txs), chunk_size)]
+    envelopes: List[Envelope] = []
+    sequence = await get_next_valid_seq_number(wallet.address, client)
+    for chunk in chunks:
+        if len(chunk) == 1:
+            envelope: Transaction = chunk[0]
+        else:
+            envelope = Batch(
+                account=wallet.address,
+                raw_transactions=chunk,
+                flags=BatchFlag.TF_INDEPENDENT,
             )
-            print(f"🔍 Response received: {type(response)}")
-            print(f"🔍 Response: {response}")
-
-            print("🔍 Checking if response is successful...")
-            if response.is_successful():
-                print("✅ Permissioned domain created successfully")
-
-                # Get transaction hash
-                print("🔍 Extracting transaction hash...")
-                tx_hash = None
-                if hasattr(response, 'result') and isinstance(response.result, dict):
-                    tx_hash = response.result.get('hash')
-                    print(f"🔍 Hash from response.result: {tx_hash}")
-                elif hasattr(response, 'hash'):
-                    tx_hash = response.hash
-                    print(f"🔍 Hash from response.hash: {tx_hash}")
-
-                if tx_hash:
-                    print(f"✅ Transaction hash: {tx_hash}")
-
-                # Extract domain ID from transaction result
-                print("🔍 Extracting domain ID...")
-                domain_id = self._extract_domain_id(response)
-                print(f"🔍 Extracted domain_id: {domain_id}")
-                result = domain_id or tx_hash
-                print(f"✅ Returning: {result}")
-                return result
-            else:
-                print(f"❌ Domain creation failed: {response}")
-                return None
-
-        except Exception as e:
-            print(f"❌ Error creating domain {domain_name}: {e}")
-            print(f"❌ Error type: {type(e)}")
-            import traceback
-            print(f"❌ Traceback: {traceback.format_exc()}")
-            return None
+        signed = sign(
+            await autofill(dataclasses.replace(envelope, sequence=sequence), client), wallet
+        )
+        if isinstance(signed, Batch):
+            inner = signed.raw_transactions
+            envelopes.append(
+                Envelope(signed, [tx.get_hash() for tx in inner], [tx.sequence for tx in inner])
+            )
+            # A Batch consumes its own sequence plus one per inner transaction
+            sequence += 1 + len(inner)
+        else:
+            envelopes.append(Envelope(signed, [signed.get_hash()], [sequence]))
+            sequence += 1
+    return envelopes
+
+
+async def submit_envelope(client: AsyncJsonRpcClient, envelope: Envelope) -> Optional[str]:
+    """
+    Submit a signed envelope; returns the engine result if the server rejected it.
+
+    A rejected envelope (tem/tef/tel) applies nothing. Network errors return None:
+    the envelope may have reached the server, so only its hash can tell.
+    """
+    try:
+        resp = await submit(envelope.signed, client)
+    except Exception as e:
+        logger.warning(f"Submitting {envelope.hash} failed, will look it up: {e}")
+        return None
+    preliminary = resp.result.get("engine_result", "")
+    if preliminary.startswith(_ACCEPTED_PRELIMINARY):
+        return None
+    return preliminary or str(resp.result)
 
-    def _extract_domain_id(self, result) -> Optional[str]:
-        """Extract domain ID from transaction result"""
-        try:
-            print(f"🔍 _extract_domain_id called with: {type(result)}")
-            print(f"🔍 Result value: {result}")
-
-            # Handle different result formats
-            if hasattr(result, 'result'):
-                result_data = result.result
-                print(f"🔍 Using result.result: {result_data}")
-            elif isinstance(result, dict):
-                result_data = result
-                print(f"🔍 Using result as dict: {result_data}")
-            else:
-                result_data = result.__dict__ if hasattr(result, '__dict__') else {}
-                print(f"🔍 Using result.__dict__: {result_data}")
-
-            meta = result_data.get("meta", {}) if isinstance(result_data, dict) else {}
-            print(f"🔍 Meta: {meta}")
-
-            affected_nodes = meta.get("AffectedNodes", []) if isinstance(meta, dict) else []
-            print(f"🔍 AffectedNodes: {affected_nodes}")
-
-            for i, node in enumerate(affected_nodes):
-                print(f"🔍 Processing node {i}: {node}")
-                if isinstance(node, dict):
-                    created_node = node.get("CreatedNode", {})
-                    print(f"🔍 CreatedNode: {created_node}")
-                    if isinstance(created_node, dict) and created_node.get("LedgerEntryType") == "PermissionedDomain":
-                        domain_id = (created_node.get("LedgerIndex") or created_node.get("NewFields", {}).get("DomainID"))
-                        print(f"🔍 Found PermissionedDomain, returning: {domain_id}")
-                        return domain_id
-
-            # Fallback: use transaction hash as domain ID
-            tx_hash = result_data.get("hash") if isinstance(result_data, dict) else None
-            print(f"🔍 Fallback to tx_hash: {tx_hash}")
-            return tx_hash
-
-        except Exception as e:
-            print(f"❌ Error extracting domain ID: {e}")
-            import traceback
-            print(f"❌ Traceback: {traceback.format_exc()}")
+
+async def _validated_tx(client: AsyncJsonRpcClient, tx_hash: str) -> Optional[Dict[str, Any]]:
+    resp = await client.request(Tx(transaction=tx_hash))
+    if resp.is_successful() and resp.result.get("validated"):
+        return resp.result
+    return None
+
+
+async def envelope_results(
+    client: AsyncJsonRpcClient,
+    envelope_hash: str,
+    tx_hashes: Sequence[str],
+    last_ledger_sequence: int,
+    wait: bool = True,
+) -> Optional[List[SubmitResult]]:
+    """
+    Per-transaction results of a submitted envelope, looked up by hash.
+
+    Waits until the envelope is validated or expired; with ``wait=False``
+    returns None instead while it could still validate. An expired envelope
+    applied nothing, so its transactions can safely be signed again.
+    """
+    while True:
+        # Read the ledger first: if the envelope isn't in a ledger past its
+        # LastLedgerSequence, it never will be
+        latest = await get_latest_validated_ledger_sequence(client)
+        tx_result = await _validated_tx(client, envelope_hash)
+        if tx_result is not None:
+            break
+        if latest > last_ledger_sequence:
+            return [(None, "Envelope expired without validating") for _ in tx_hashes]
+        if not wait:
             return None
+        await asyncio.sleep(1)
+
+    if list(tx_hashes) == [envelope_hash]:
+        if _transaction_result(tx_result) == "tesSUCCESS":
+            return [(tx_result, None)]
+        return [(None, _transaction_result(tx_result))]
+
+    results: List[SubmitResult] = []
+    for inner_hash in tx_hashes:
+        inner_result = await _validated_tx(client, inner_hash)
+        engine_result = _transaction_result(inner_result) if inner_result else None
+        if engine_result == "tesSUCCESS":
+            results.append((inner_result, None))
+        else:
+            results.append((None, engine_result or f"Inner transaction {inner_hash} not applied"))
+    return results
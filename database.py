@@ -1,18 +1,4 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+# Legacy database.py - redirect to new structure (single engine per process)
+from app.shared.database.connection import AsyncSessionLocal, Base, engine, get_db
 
-from app.core.config import settings
-
-engine = create_engine(settings.database_url)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-Base = declarative_base()
-
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+__all__ = ["AsyncSessionLocal", "Base", "engine", "get_db"]
@@ -0,0 +1,151 @@
+"""
+Gateway response verification (app/shared/ipld.py) on hand-built CARs.
+"""
+import base64
+import hashlib
+from typing import List, Optional, Tuple
+
+import pytest
+
+from app.shared.ipld import DAG_PB, RAW, IPLDError, parse_cid, read_car, verified_file
+
+_B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _field(number: int, value) -> bytes:
+    if isinstance(value, int):
+        return _varint(number << 3) + _varint(value)
+    return _varint(number << 3 | 2) + _varint(len(value)) + value
+
+
+def _cid_bytes(block: bytes, codec: int = DAG_PB, version: int = 1) -> bytes:
+    digest = hashlib.sha256(block).digest()
+    if version == 0:
+        return b"\x12\x20" + digest
+    return _varint(1) + _varint(codec) + b"\x12\x20" + digest
+
+
+def _cid_str(cid: bytes) -> str:
+    if cid[:2] == b"\x12\x20":
+        num = int.from_bytes(cid, "big")
+        text = ""
+        while num:
+            num, rem = divmod(num, 58)
+            text = _B58_ALPHABET[rem] + text
+        return text
+    return "b" + base64.b32encode(cid).decode().lower().rstrip("=")
+
+
+def _node(
+    kind: int, data: bytes = b"", links: Optional[List[Tuple[str, bytes]]] = None
+) -> bytes:
+    """dag-pb block with UnixFS Data; links are (name, binary CID)"""
+    out = b"".join(
+        _field(2, _field(1, cid) + _field(2, name.encode())) for name, cid in links or []
+    )
+    return out + _field(1, _field(1, kind) + (_field(2, data) if data else b""))
+
+
+def _car(*blocks: Tuple[bytes, bytes]) -> bytes:
+    header = bytes.fromhex("a16776657273696f6e01")  # {"version": 1}
+    out = _varint(len(header)) + header
+    for cid, block in blocks:
+        out += _varint(len(cid) + len(block)) + cid + block
+    return out
+
+
+FILE, DIRECTORY = 2, 1
+
+
+def _chunked_file(raw_leaves: bool) -> Tuple[bytes, List[Tuple[bytes, bytes]]]:
+    leaves = []
+    for chunk in (b"hello ", b"ipld ", b"world"):
+        if raw_leaves:
+            leaves.append((_cid_bytes(chunk, RAW), chunk))
+        else:
+            block = _node(FILE, chunk)
+            leaves.append((_cid_bytes(block), block))
+    root = _node(FILE, links=[("", cid) for cid, _ in leaves])
+    return _cid_bytes(root), [(_cid_bytes(root), root)] + leaves
+
+
+def test_single_block_file_cidv0():
+    block = _node(FILE, b"single block")
+    cid = _cid_bytes(block, version=0)
+    text = _cid_str(cid)
+    assert text.startswith("Qm")
+
+    root = parse_cid(text)
+    assert (root.version, root.codec) == (0, DAG_PB)
+    assert verified_file(root, "", _car((cid, block)), max_bytes=1024) == b"single block"
+
+
+@pytest.mark.parametrize("raw_leaves", [False, True])
+def test_multi_chunk_file(raw_leaves):
+    root, blocks = _chunked_file(raw_leaves)
+    car = _car(*blocks)
+    assert verified_file(parse_cid(_cid_str(root)), "", car, max_bytes=1024) == b"hello ipld world"
+
+
+def test_raw_root():
+    data = b"\x89PNG raw"
+    cid = _cid_bytes(data, RAW)
+    assert verified_file(parse_cid(_cid_str(cid)), "", _car((cid, data)), 1024) == data
+
+
+def test_path_in_directory():
+    image = _node(FILE, b"image bytes")
+    meta = _node(FILE, b"{}")
+    directory = _node(
+        DIRECTORY, links=[("image.png", _cid_bytes(image)), ("meta.json", _cid_bytes(meta))]
+    )
+    car = _car(*[(_cid_bytes(block), block) for block in (directory, image, meta)])
+    root = parse_cid(_cid_str(_cid_bytes(directory)))
+
+    assert verified_file(root, "meta.json", car, 1024) == b"{}"
+    with pytest.raises(IPLDError, match="No such path"):
+        verified_file(root, "other.png", car, 1024)
+    with pytest.raises(IPLDError, match="not a plain directory"):
+        verified_file(root, "meta.json/deeper", car, 1024)
+
+
+def test_missing_block():
+    root, blocks = _chunked_file(raw_leaves=True)
+    car = _car(*blocks[:-1])
+    with pytest.raises(IPLDError, match="Block missing"):
+        verified_file(parse_cid(_cid_str(root)), "", car, 1024)
+
+
+def test_block_with_wrong_digest():
+    root, blocks = _chunked_file(raw_leaves=True)
+    cid, _ = blocks[1]
+    blocks[1] = (cid, b"tampered")
+    with pytest.raises(IPLDError, match="does not match its CID"):
+        read_car(_car(*blocks))
+
+
+def test_size_limit():
+    root, blocks = _chunked_file(raw_leaves=False)
+    car = _car(*blocks)
+    with pytest.raises(IPLDError, match="exceeds size limit"):
+        verified_file(parse_cid(_cid_str(root)), "", car, max_bytes=10)
+
+
+@pytest.mark.parametrize(
+    "text", ["", "Qm123", "not-a-cid", "bafy" + "1" * 40, "https://example.com/ipfs/x"]
+)
+def test_invalid_cid(text):
+    with pytest.raises(ValueError):
+        parse_cid(text)
@@ -0,0 +1,378 @@
+"""
+XRPL outbox state machine against a stubbed ledger.
+
+Signing is real (so Batch inner hashes and sequences are the ones the worker
+stores); sequence lookup, autofill, submit and Tx lookups go to FakeLedger.
+The database is a throwaway SQLite file.
+"""
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+import pytest_asyncio  # noqa: E402
+from sqlalchemy import select, update  # noqa: E402
+from sqlalchemy.ext.asyncio import (  # noqa: E402
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from xrpl.models.requests import Tx  # noqa: E402
+from xrpl.models.response import Response, ResponseStatus  # noqa: E402
+from xrpl.models.transactions import AccountSet, Batch, Transaction  # noqa: E402
+from xrpl.wallet import Wallet  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.shared import outbox, xrpl  # noqa: E402
+from app.shared.outbox import (  # noqa: E402
+    DONE,
+    FAILED,
+    PENDING,
+    SUBMITTED,
+    OutboxHandler,
+    XRPLOutbox,
+)
+
+KIND = "test_account_set"
+
+
+class Crash(BaseException):
+    """Stands in for the process dying mid-pass"""
+
+
+def _response(result: Dict[str, Any], ok: bool = True) -> Response:
+    return Response(status=ResponseStatus.SUCCESS if ok else ResponseStatus.ERROR, result=result)
+
+
+class FakeLedger:
+    """Just enough of rippled for sign_envelopes, submit_envelope and envelope_results"""
+
+    def __init__(self):
+        self.sequence = 100
+        self.validated = 1000
+        self.txs: Dict[str, Dict[str, Any]] = {}
+        self.submitted: List[Transaction] = []
+        self.reject_batches = False
+        self.drop = False  # accept submissions but never validate them
+        self.crash_before_apply = False
+        self.crash_after_apply = False
+        self.failing: set = set()  # payload names whose transaction fails
+        self.on_submit = None
+
+    async def next_sequence(self, address: str, client: Any) -> int:
+        return self.sequence
+
+    async def autofill(self, tx: Transaction, client: Any) -> Transaction:
+        data = tx.to_dict()
+        data.update(fee="12", last_ledger_sequence=self.validated + 20)
+        if data["transaction_type"] == "Batch":
+            for i, inner in enumerate(data["raw_transactions"]):
+                inner["raw_transaction"].update(
+                    sequence=data["sequence"] + 1 + i, fee="0", signing_pub_key=""
+                )
+        return Transaction.from_dict(data)
+
+    async def submit(self, signed: Transaction, client: Any) -> Response:
+        self.submitted.append(signed)
+        if self.on_submit is not None:
+            await self.on_submit(signed)
+        if self.crash_before_apply:
+            raise Crash()
+        if isinstance(signed, Batch) and self.reject_batches:
+            return _response({"engine_result": "temDISABLED"})
+        if self.drop:
+            self.validated += 100
+            return _response({"engine_result": "tesSUCCESS"})
+        self._apply(signed)
+        if self.crash_after_apply:
+            raise Crash()
+        return _response({"engine_result": "tesSUCCESS"})
+
+    def _apply(self, signed: Transaction) -> None:
+        inner = signed.raw_transactions if isinstance(signed, Batch) else []
+        self.sequence = signed.sequence + 1 + len(inner)
+        for tx in inner or [signed]:
+            if bytes.fromhex(tx.domain).decode() in self.failing:
+                if tx is signed:
+                    self._record(tx, "tecNO_PERMISSION")
+                continue  # a failed inner transaction never reaches the ledger
+            self._record(tx, "tesSUCCESS")
+        if inner:
+            self._record(signed, "tesSUCCESS")
+
+    def _record(self, tx: Transaction, engine_result: str) -> None:
+        tx_hash = tx.get_hash()
+        self.txs[tx_hash] = {
+            "hash": tx_hash,
+            "validated": True,
+            "meta": {"TransactionResult": engine_result},
+        }
+
+    async def latest(self, client: Any) -> int:
+        return self.validated
+
+    async def request(self, req: Any) -> Response:
+        assert isinstance(req, Tx)
+        if req.transaction in self.txs:
+            return _response(self.txs[req.transaction])
+        return _response({"error": "txnNotFound"}, ok=False)
+
+
+@pytest_asyncio.fixture
+async def sessions(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'outbox.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(XRPLOutbox.__table__.create)
+    maker = async_sessionmaker(
+        bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+    @asynccontextmanager
+    async def account_lock(address):
+        async with engine.connect() as conn:
+            yield conn
+
+    monkeypatch.setattr(outbox, "AsyncSessionLocal", maker)
+    monkeypatch.setattr(outbox, "account_lock", account_lock)
+    yield maker
+    await engine.dispose()
+
+
+@pytest.fixture
+def ledger(monkeypatch):
+    fake = FakeLedger()
+    wallet = Wallet.create()
+    monkeypatch.setattr(xrpl, "get_next_valid_seq_number", fake.next_sequence)
+    monkeypatch.setattr(xrpl, "autofill", fake.autofill)
+    monkeypatch.setattr(xrpl, "submit", fake.submit)
+    monkeypatch.setattr(xrpl, "get_latest_validated_ledger_sequence", fake.latest)
+    monkeypatch.setattr(
+        outbox, "get_xrpl_service", lambda: SimpleNamespace(client=fake, wallet=wallet)
+    )
+    monkeypatch.setattr(settings, "outbox_max_attempts", 3)
+    monkeypatch.setattr(settings, "outbox_retry_base_delay", 10.0)
+    monkeypatch.setattr(settings, "outbox_reconcile_after", 300.0)
+    return fake
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    calls: Dict[str, List[Any]] = {"success": [], "failure": [], "after_commit": [], "check": []}
+
+    async def on_success(db, payload, result):
+        calls["success"].append((payload["name"], result.get("hash")))
+
+    async def on_failure(db, payload, error):
+        calls["failure"].append((payload["name"], error))
+
+    async def after_commit(payloads):
+        calls["after_commit"].append(sorted(p["name"] for p in payloads))
+
+    entry = OutboxHandler(
+        build=lambda account, payload: AccountSet(
+            account=account, domain=payload["name"].encode().hex()
+        ),
+        on_success=on_success,
+        on_failure=on_failure,
+        after_commit=after_commit,
+    )
+    monkeypatch.setitem(outbox._handlers, KIND, entry)
+    return SimpleNamespace(entry=entry, calls=calls)
+
+
+async def _enqueue(sessions, *names: str) -> None:
+    async with sessions() as db:
+        for name in names:
+            outbox.enqueue(db, KIND, {"name": name})
+        await db.commit()
+
+
+async def _rows(sessions) -> Dict[str, XRPLOutbox]:
+    async with sessions() as db:
+        rows = (await db.execute(select(XRPLOutbox).order_by(XRPLOutbox.id))).scalars().all()
+        return {row.payload["name"]: row for row in rows}
+
+
+async def _make_due(sessions) -> None:
+    async with sessions() as db:
+        await db.execute(
+            update(XRPLOutbox).values(available_at=datetime(2000, 1, 1, tzinfo=timezone.utc))
+        )
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_pending_rows_are_submitted_then_done(sessions, ledger, handler):
+    await _enqueue(sessions, "a", "b", "c")
+    seen_at_submit = {}
+
+    async def on_submit(signed):
+        seen_at_submit.update(await _rows(sessions))
+
+    ledger.on_submit = on_submit
+
+    assert await outbox.OutboxWorker().process_once() == 3
+
+    # Committed as submitted, with their hashes, before anything went out
+    assert {row.status for row in seen_at_submit.values()} == {SUBMITTED}
+    batch = ledger.submitted[0]
+    assert len(ledger.submitted) == 1 and isinstance(batch, Batch)
+    inner_hashes = [tx.get_hash() for tx in batch.raw_transactions]
+    assert [row.tx_hash for row in seen_at_submit.values()] == inner_hashes
+    assert {row.envelope_hash for row in seen_at_submit.values()} == {batch.get_hash()}
+
+    rows = await _rows(sessions)
+    assert {row.status for row in rows.values()} == {DONE}
+    assert [row.attempts for row in rows.values()] == [1, 1, 1]
+    assert [row.sequence for row in rows.values()] == [101, 102, 103]
+    assert sorted(handler.calls["success"]) == sorted(zip("abc", inner_hashes))
+    assert handler.calls["after_commit"] == [["a", "b", "c"]]
+
+
+@pytest.mark.asyncio
+async def test_failed_transaction_backs_off_then_fails(sessions, ledger, handler, monkeypatch):
+    monkeypatch.setattr(settings, "outbox_max_attempts", 2)
+    ledger.failing = {"bad"}
+    await _enqueue(sessions, "good", "bad")
+    worker = outbox.OutboxWorker()
+
+    await worker.process_once()
+    rows = await _rows(sessions)
+    assert rows["good"].status == DONE
+    bad = rows["bad"]
+    assert (bad.status, bad.attempts) == (PENDING, 1)
+    assert "not applied" in bad.last_error
+    assert bad.available_at.replace(tzinfo=None) > datetime.now(timezone.utc).replace(tzinfo=None)
+
+    # Not due yet
+    assert await worker.process_once() == 0
+
+    await _make_due(sessions)
+    await worker.process_once()
+    bad = (await _rows(sessions))["bad"]
+    assert (bad.status, bad.attempts) == (FAILED, 2)
+    assert [name for name, _ in handler.calls["failure"]] == ["bad"]
+
+
+@pytest.mark.asyncio
+async def test_state_check_settles_a_missing_inner_result(sessions, ledger, handler):
+    ledger.failing = {"already"}
+
+    async def check(client, account, payload):
+        handler.calls["check"].append(payload["name"])
+        return payload["name"] == "already"
+
+    handler.entry.check = check
+    await _enqueue(sessions, "fresh", "already")
+
+    await outbox.OutboxWorker().process_once()
+
+    rows = await _rows(sessions)
+    assert handler.calls["check"] == ["already"]
+    assert (rows["already"].status, rows["already"].last_error) == (DONE, None)
+    assert rows["fresh"].status == DONE
+
+
+@pytest.mark.asyncio
+async def test_rejected_batch_requeues_and_switches_to_single(sessions, ledger, handler):
+    ledger.reject_batches = True
+    names = [f"n{i}" for i in range(10)]
+    await _enqueue(sessions, *names)
+    worker = outbox.OutboxWorker()
+
+    await worker.process_once()
+
+    assert worker._batch is False
+    # Only the first envelope went out; nothing was applied
+    assert len(ledger.submitted) == 1
+    rows = await _rows(sessions)
+    assert {(row.status, row.attempts) for row in rows.values()} == {(PENDING, 0)}
+
+    ledger.submitted.clear()
+    await worker.process_once()
+
+    assert len(ledger.submitted) == 10
+    assert not any(isinstance(tx, Batch) for tx in ledger.submitted)
+    rows = await _rows(sessions)
+    assert {(row.status, row.attempts) for row in rows.values()} == {(DONE, 1)}
+
+
+@pytest.mark.asyncio
+async def test_expired_envelope_is_signed_again(sessions, ledger, handler):
+    ledger.drop = True
+    await _enqueue(sessions, "a", "b")
+    worker = outbox.OutboxWorker()
+
+    await worker.process_once()
+    rows = await _rows(sessions)
+    first_envelopes = {row.envelope_hash for row in rows.values()}
+    assert {(row.status, row.attempts) for row in rows.values()} == {(PENDING, 1)}
+    assert all("expired" in row.last_error for row in rows.values())
+
+    ledger.drop = False
+    await _make_due(sessions)
+    await worker.process_once()
+
+    rows = await _rows(sessions)
+    assert {(row.status, row.attempts) for row in rows.values()} == {(DONE, 2)}
+    # Inner transactions carry no LastLedgerSequence; the outer envelope is new
+    assert len(ledger.submitted) == 2
+    assert not first_envelopes & {row.envelope_hash for row in rows.values()}
+
+
+@pytest.mark.asyncio
+async def test_crash_before_submit_is_reconciled_and_retried(
+    sessions, ledger, handler, monkeypatch
+):
+    ledger.crash_before_apply = True
+    await _enqueue(sessions, "a", "b")
+    worker = outbox.OutboxWorker()
+
+    with pytest.raises(Crash):
+        await worker.process_once()
+    assert {row.status for row in (await _rows(sessions)).values()} == {SUBMITTED}
+
+    # A later pass never signs submitted rows again
+    ledger.crash_before_apply = False
+    ledger.submitted.clear()
+    assert await worker.process_once() == 0
+    assert ledger.submitted == []
+
+    # Still inside LastLedgerSequence: could validate, so left alone
+    monkeypatch.setattr(settings, "outbox_reconcile_after", -1.0)
+    assert await worker.reconcile() == 0
+
+    ledger.validated += 100
+    assert await worker.reconcile() == 2
+    rows = await _rows(sessions)
+    assert {(row.status, row.attempts) for row in rows.values()} == {(PENDING, 1)}
+
+    await _make_due(sessions)
+    await worker.process_once()
+    assert {row.status for row in (await _rows(sessions)).values()} == {DONE}
+
+
+@pytest.mark.asyncio
+async def test_crash_after_submit_is_settled_by_hash(sessions, ledger, handler, monkeypatch):
+    ledger.crash_after_apply = True
+    await _enqueue(sessions, "a", "b")
+    worker = outbox.OutboxWorker()
+
+    with pytest.raises(Crash):
+        await worker.process_once()
+    submitted_hashes = {row.tx_hash for row in (await _rows(sessions)).values()}
+
+    ledger.crash_after_apply = False
+    ledger.submitted.clear()
+    monkeypatch.setattr(settings, "outbox_reconcile_after", -1.0)
+    assert await worker.reconcile() == 2
+
+    rows = await _rows(sessions)
+    assert {(row.status, row.attempts) for row in rows.values()} == {(DONE, 1)}
+    assert {row.tx_hash for row in rows.values()} == submitted_hashes
+    assert ledger.submitted == []
+    assert sorted(name for name, _ in handler.calls["success"]) == ["a", "b"]
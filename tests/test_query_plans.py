@@ -0,0 +1,216 @@
+"""
+Query plan regression test.
+
+Seeds a realistic catalog inside a transaction that is rolled back, runs the
+read-path service queries, then EXPLAINs every captured SELECT and fails if
+Postgres plans a sequential scan over one of the hot tables, or (when nfts is
+hash-partitioned, see alembic revision 0010) reads more than one partition.
+
+Needs a migrated (`alembic upgrade head`) scratch Postgres database:
+
+    DATABASE_URL=postgresql://... pytest tests/test_query_plans.py
+
+Skipped when DATABASE_URL is not set.
+"""
+import os
+import re
+from typing import Any, Dict, List, Set, Tuple
+
+import pytest
+
+if not os.getenv("DATABASE_URL", "").startswith("postgres"):
+    pytest.skip("DATABASE_URL does not point at Postgres", allow_module_level=True)
+
+from sqlalchemy import event, select, text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession  # noqa: E402
+
+from app.core import models  # noqa: E402,F401
+from app.core.config import settings  # noqa: E402
+from app.domains.artist.service import ArtistService  # noqa: E402
+from app.domains.artwork.service import ArtworkFilters, ArtworkService  # noqa: E402
+from app.domains.gallery.service import GalleryService  # noqa: E402
+from app.domains.nfts.models import NFT  # noqa: E402
+from app.shared.database.connection import engine  # noqa: E402
+from app.shared.pagination import PageParams  # noqa: E402
+
+HOT_TABLES = {"artworks", "artists", "galleries", "nfts", "wallet_auth", "artwork_stats"}
+
+# Partitions created by alembic revision 0010
+NFT_PARTITION = re.compile(r"^nfts_p\d+$")
+
+SEED = {"galleries": 500, "artists": 5000, "artworks": 20000, "pieces": 9}
+PLATFORM = "rPlanPlatform"
+
+SEED_SQL = [
+    """
+    INSERT INTO wallet_auth (wallet_address, user_type, is_active)
+    SELECT 'rPlanGallery' || g, 'GALLERY', true FROM generate_series(1, :galleries) g
+    """,
+    """
+    INSERT INTO wallet_auth (wallet_address, user_type, is_active)
+    SELECT 'rPlanArtist' || a, 'USER', true FROM generate_series(1, :artists) a
+    """,
+    """
+    INSERT INTO galleries (wallet_address, name, created_at, updated_at)
+    SELECT 'rPlanGallery' || g, 'Plan Gallery ' || g,
+           now() - g * interval '1 minute', now()
+    FROM generate_series(1, :galleries) g
+    """,
+    """
+    INSERT INTO artists (wallet_address, name, gallery_id, created_at, updated_at)
+    SELECT 'rPlanArtist' || a, 'Plan Artist ' || a,
+           CASE WHEN a % 2 = 0 THEN
+               (SELECT id FROM galleries WHERE wallet_address = 'rPlanGallery' || (a % :galleries + 1))
+           END,
+           now() - a * interval '1 second', now()
+    FROM generate_series(1, :artists) a
+    """,
+    """
+    INSERT INTO artworks (title, description, size, price_usd, grid_n, image_url,
+                          metadata_uri_base, artist_address, created_at)
+    SELECT 'Plan Artwork ' || w, 'seeded', '3x3', 900 + w % 1000, 3,
+           'ipfs://plan' || w, 'ipfs://plan' || w || '/meta.json',
+           'rPlanArtist' || (w % :artists + 1), now() - w * interval '1 second'
+    FROM generate_series(1, :artworks) w
+    """,
+    """
+    INSERT INTO nfts (artwork_id, uri_hash, nftoken_id, owner_address, status, price, grid_index, extra)
+    SELECT w.id, sha256(convert_to(w.metadata_uri_base || '#' || p, 'UTF8')),
+           sha256(convert_to('tok' || w.id || '-' || p, 'UTF8')),
+           CASE WHEN p % 3 = 0 THEN 'rPlanBuyer' ELSE :platform END,
+           CASE WHEN p % 3 = 0 THEN 'sold' WHEN p % 3 = 1 THEN 'minted' ELSE 'offered_to_artist' END,
+           100, p, jsonb_build_object('part_uri', w.metadata_uri_base || '#' || p)
+    FROM artworks w CROSS JOIN generate_series(1, :pieces) p
+    WHERE w.title LIKE 'Plan Artwork %'
+    """,
+    """
+    INSERT INTO artwork_stats (artwork_id, grid_total, minted, offered, sold, remaining, min_listed_price)
+    SELECT n.artwork_id, 9, count(*),
+           count(*) FILTER (WHERE n.status = 'offered_to_artist'),
+           count(*) FILTER (WHERE n.status = 'sold'),
+           count(*) FILTER (WHERE n.status <> 'sold'),
+           min(n.price) FILTER (WHERE n.status = 'offered_to_artist')
+    FROM nfts n JOIN artworks w ON w.id = n.artwork_id
+    WHERE w.title LIKE 'Plan Artwork %'
+    GROUP BY n.artwork_id
+    """,
+    "ANALYZE wallet_auth, galleries, artists, artworks, nfts, artwork_stats",
+]
+
+
+def _seq_scans(plan: Dict[str, Any]) -> List[str]:
+    found = []
+    relation = plan.get("Relation Name") or ""
+    if plan.get("Node Type") == "Seq Scan" and (
+        relation in HOT_TABLES or NFT_PARTITION.match(relation)
+    ):
+        found.append(relation)
+    for child in plan.get("Plans", []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+def _nft_partitions(plan: Dict[str, Any]) -> Set[str]:
+    found = set()
+    if NFT_PARTITION.match(plan.get("Relation Name") or ""):
+        found.add(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found |= _nft_partitions(child)
+    return found
+
+
+async def _run_service_queries(session: AsyncSession) -> None:
+    first = PageParams(cursor=None, limit=settings.default_page_size)
+
+    artworks = ArtworkService(session)
+    page = await artworks.list_artworks(first)
+    await artworks.list_artworks(PageParams(page["next_cursor"], first.limit))
+    await artworks.list_artworks(first, ArtworkFilters(available=True))
+    for sort in ("price_asc", "price_desc"):
+        sorted_page = await artworks.list_artworks(first, ArtworkFilters(sort=sort))
+        await artworks.list_artworks(
+            PageParams(sorted_page["next_cursor"], first.limit), ArtworkFilters(sort=sort)
+        )
+        await artworks.list_artworks(first, ArtworkFilters(grid_n=4, sort=sort))
+        await artworks.list_artworks(first, ArtworkFilters(artist_address="rPlanArtist42", sort=sort))
+    await artworks.list_artworks(first, ArtworkFilters(grid_n=4))
+    await artworks.list_artworks(first, ArtworkFilters(min_price=1890, max_price=1899))
+    await artworks.list_artworks(first, ArtworkFilters(gallery_id=1))
+    await artworks.get_artwork_by_artist("rPlanArtist42", first)
+    await artworks.get_artwork_by_artist_full("rPlanArtist42")
+    await artworks.get_artwork(page["items"][0]["id"])
+
+    artists = ArtistService(session)
+    artist_page = await artists.list_artists(first)
+    await artists.list_artists(PageParams(artist_page["next_cursor"], first.limit))
+    await artists.get_artist_by_wallet("rPlanArtist42")
+
+    galleries = GalleryService(session)
+    gallery_page = await galleries.list_galleries(first)
+    await galleries.list_galleries(PageParams(gallery_page["next_cursor"], first.limit))
+    await galleries.get_gallery_by_wallet("rPlanGallery7")
+    gallery_id = gallery_page["items"][0].id
+    await galleries.get_gallery_artists_by_id(gallery_id, first)
+    await galleries.get_gallery_catalog(gallery_id, first, 8)
+
+    # Offer pipeline candidate lookup (app.domains.nfts.services)
+    await session.execute(
+        select(NFT)
+        .where(NFT.artwork_id == page["items"][0]["id"])
+        .where(NFT.owner_address == PLATFORM)
+        .where(NFT.nftoken_id.isnot(None))
+        .where(NFT.status.in_(["minted", "offered_to_artist"]))
+    )
+
+
+async def check_plans() -> List[Tuple[str, List[str]]]:
+    failures: List[Tuple[str, List[str]]] = []
+    conn: AsyncConnection
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            params = {**SEED, "platform": PLATFORM}
+            for sql in SEED_SQL:
+                await conn.execute(text(sql), params)
+
+            captured: List[Tuple[str, Any]] = []
+
+            def capture(conn_, cursor, statement, parameters, context, executemany):
+                if statement.lstrip().upper().startswith("SELECT"):
+                    captured.append((statement, parameters))
+
+            event.listen(conn.sync_connection, "before_cursor_execute", capture)
+            session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint")
+            try:
+                await _run_service_queries(session)
+            finally:
+                event.remove(conn.sync_connection, "before_cursor_execute", capture)
+                await session.close()
+
+            for statement, parameters in captured:
+                result = await conn.exec_driver_sql(
+                    "EXPLAIN (FORMAT JSON) " + statement, parameters
+                )
+                plan = result.scalar()[0]["Plan"]
+                scans = _seq_scans(plan)
+                # Every nfts query here filters by artwork_id, so it should prune
+                partitions = _nft_partitions(plan)
+                if len(partitions) > 1:
+                    scans.append(f"{len(partitions)} nfts partitions")
+                if scans:
+                    failures.append((statement, scans))
+        finally:
+            await trans.rollback()
+    return failures
+
+
+@pytest.mark.asyncio
+async def test_service_queries_use_indexes():
+    try:
+        failures = await check_plans()
+    finally:
+        await engine.dispose()
+    report = "\n\n".join(
+        f"Sequential scan on {', '.join(scans)}:\n{statement}" for statement, scans in failures
+    )
+    assert not failures, f"{len(failures)} query plan(s) use sequential scans\n\n{report}"